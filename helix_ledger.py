@@ -0,0 +1,212 @@
+# helix_ledger.py
+import json, hashlib, os, struct, time
+from pathlib import Path
+from math import sin, pi, floor
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple
+
+# ---- Signed 64-bit spiral value encoding used in every helix hash ----
+_pack_q = struct.Struct(">q").pack
+
+GENESIS_HASH = b"\x00" * 32
+
+# ---- Record layouts found in lane files ----
+# helix:  {"n","data","helices":k,"a_helix_i","h_helix_i"}           (HelixLedger)
+# chiral: {"n","ts","data","a_plus","a_minus","h_plus","h_minus",
+#          "prev_h_plus","prev_h_minus"}                             (e.g. the meta lane)
+# init:   {"lane","n":0,"h"}                                          (hashhelix_tools init)
+LAYOUT_HELIX = "helix"
+LAYOUT_CHIRAL = "chiral"
+
+_CHIRAL_STRANDS = (("plus", +1), ("minus", -1))
+
+def record_layout(rec: Dict[str, Any]) -> Optional[str]:
+    """LAYOUT_CHIRAL, LAYOUT_HELIX, or None for a lane init record."""
+    if "h_plus" in rec:
+        return LAYOUT_CHIRAL
+    if "helices" in rec:
+        return LAYOUT_HELIX
+    return None
+
+def record_heads(rec: Dict[str, Any]) -> List[str]:
+    """Strand head hashes of a lane record: h_plus/h_minus, every h_helix_i, or an init record's h."""
+    layout = record_layout(rec)
+    if layout == LAYOUT_CHIRAL:
+        return [rec["h_plus"], rec["h_minus"]]
+    if layout == LAYOUT_HELIX:
+        return [rec[f"h_helix_{i}"] for i in range(rec["helices"])]
+    return [rec["h"]]
+
+# ---- Phase table: helix i is offset by 2*pi*i/k (computed once per ledger) ----
+def phase_table(helices: int) -> Tuple[float, ...]:
+    if helices < 1:
+        raise ValueError("helices must be >= 1")
+    return tuple(i * 2 * pi / helices for i in range(helices))
+
+# ---- Tail read: last JSONL record without scanning the file ----
+def read_last_record(path: Path, window: int = 8192) -> Optional[Dict[str, Any]]:
+    """Last record of a JSONL file; the window grows until the record is complete. None if empty."""
+    with Path(path).open("rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        while True:
+            off = max(0, size - window)
+            f.seek(off)
+            tail = f.read().rstrip()
+            cut = tail.rfind(b"\n")
+            if cut >= 0 or off == 0:
+                return json.loads(tail[cut + 1:]) if tail else None
+            window *= 4
+
+def _genesis(layout: str) -> Tuple[int, Tuple[int, ...], Tuple[bytes, ...]]:
+    if layout == LAYOUT_CHIRAL:
+        return 0, (1, 1), (b"", b"")
+    return 0, (1,), (GENESIS_HASH,)
+
+def _record_state(rec: Optional[Dict[str, Any]]) -> Tuple[int, Tuple[int, ...], Tuple[bytes, ...]]:
+    """
+    (n, a, h) to chain from, one a/h per strand: the (plus, minus) strands
+    of a chiral record, the last helix of a helix record, or a lane init
+    record's a/h.
+    """
+    if rec is None:
+        return _genesis(LAYOUT_HELIX)
+    layout = record_layout(rec)
+    if layout == LAYOUT_CHIRAL:
+        return (rec["n"], (rec["a_plus"], rec["a_minus"]),
+                (bytes.fromhex(rec["h_plus"]), bytes.fromhex(rec["h_minus"])))
+    if layout == LAYOUT_HELIX:
+        k = rec["helices"] - 1
+        return rec["n"], (rec[f"a_helix_{k}"],), (bytes.fromhex(rec[f"h_helix_{k}"]),)
+    return rec["n"], (rec.get("a", 1),), (bytes.fromhex(rec["h"]),)
+
+class HelixLedger:
+    """
+    k-helix append-only lane persisted as JSONL (lanes.json "helices": k).
+
+    Each record advances the spiral once per helix, helix i using the phase
+    offset 2*pi*i/k, and chains helix hashes as raw 32-byte digests:
+        a_i = int(n * sin(a_{i-1} + phase_i)) + 1
+        h_i = SHA256( a_i (>q) || D_n || h_{i-1} )
+    where a_{-1}/h_{-1} are the previous record's last helix and D_n is the
+    data (or its SHA256 if longer than 256 bytes).
+
+    A lane whose records are already chiral (two strands, as in the meta
+    lane) keeps that layout whatever "helices" says, so epochs sealed over
+    it stay valid:
+        a_± = floor(n * sin(a_± ± pi/n)) + 1
+        h_± = SHA256( str(a_±) || data || h_±prev )
+    starting from a = 1 and an empty h.
+
+    Only the head state is kept in memory: opening is a tail read, appends
+    are O(1), and verify() streams the file.
+    """
+    def __init__(self, path: str, helices: int = 2):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.helices = helices
+        self.phases = phase_table(helices)
+        last = read_last_record(self.path) if self.path.exists() else None
+        self.layout = LAYOUT_CHIRAL if last is not None and record_layout(last) == LAYOUT_CHIRAL else LAYOUT_HELIX
+        self.n, self.a, self.h = _record_state(last)
+
+    def _step(self, data: str) -> Dict[str, Any]:
+        if self.layout == LAYOUT_CHIRAL:
+            return self._step_chiral(data)
+        n = self.n + 1
+        raw = data.encode()
+        d = raw if len(raw) <= 256 else hashlib.sha256(raw).digest()
+        (a,), (h,) = self.a, self.h
+        sha256 = hashlib.sha256
+        record: Dict[str, Any] = {"n": n, "data": data, "helices": self.helices}
+        for i, phase in enumerate(self.phases):
+            a = int(n * sin(a + phase)) + 1
+            h = sha256(_pack_q(a) + d + h).digest()
+            record[f"a_helix_{i}"] = a
+            record[f"h_helix_{i}"] = h.hex()
+        self.n, self.a, self.h = n, (a,), (h,)
+        return record
+
+    def _step_chiral(self, data: str) -> Dict[str, Any]:
+        n = self.n + 1
+        raw = data.encode()
+        record: Dict[str, Any] = {"n": n, "ts": int(time.time()), "data": data}
+        a_next, h_next = [], []
+        for (name, sign), a, h in zip(_CHIRAL_STRANDS, self.a, self.h):
+            a = floor(n * sin(a + sign * pi / n)) + 1
+            h_new = hashlib.sha256(str(a).encode() + raw + h).digest()
+            record[f"a_{name}"] = a
+            record[f"h_{name}"] = h_new.hex()
+            record[f"prev_h_{name}"] = h.hex()
+            a_next.append(a)
+            h_next.append(h_new)
+        self.n, self.a, self.h = n, tuple(a_next), tuple(h_next)
+        return record
+
+    def append(self, data: str) -> Dict[str, Any]:
+        record = self._step(data)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        return record
+
+    def append_many(self, items: Iterable[str]) -> int:
+        """Append every data string through one buffered handle; returns the count."""
+        count = 0
+        with self.path.open("a", encoding="utf-8", buffering=1 << 20) as f:
+            for data in items:
+                f.write(json.dumps(self._step(data), separators=(",", ":")) + "\n")
+                count += 1
+        return count
+
+    def head(self) -> Optional[Dict[str, Any]]:
+        return read_last_record(self.path) if self.path.exists() else None
+
+    def head_hashes(self) -> Dict[str, str]:
+        """Hex hashes the next record chains from: {"h"} for a helix lane, {"h_plus", "h_minus"} for a chiral one."""
+        if self.layout == LAYOUT_CHIRAL:
+            return {"h_plus": self.h[0].hex(), "h_minus": self.h[1].hex()}
+        return {"h": self.h[0].hex()}
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def verify(self) -> bool:
+        """
+        Stream the file and recompute every record:
+          - n increases by one per record
+          - helix records: a_helix_i / h_helix_i match
+          - chiral records: a_± / h_± / prev_h_± match
+        A leading lane init record only seeds the chain; the layout may not
+        change within a lane.
+        """
+        replay = HelixLedger.__new__(HelixLedger)
+        replay.helices = self.helices
+        replay.phases = self.phases
+        replay.layout = None
+        for rec in self.iter_records():
+            layout = record_layout(rec)
+            if layout is None:
+                if replay.layout is not None:
+                    return False
+                replay.layout = LAYOUT_HELIX
+                replay.n, replay.a, replay.h = _record_state(rec)
+                continue
+            if replay.layout is None:
+                replay.layout = layout
+                replay.n, replay.a, replay.h = _genesis(layout)
+            if layout != replay.layout or rec["n"] != replay.n + 1:
+                return False
+            if layout == LAYOUT_CHIRAL:
+                expected = replay._step_chiral(rec["data"])
+                del expected["ts"]
+                rec = {k: v for k, v in rec.items() if k != "ts"}
+            else:
+                if rec["helices"] != self.helices:
+                    return False
+                expected = replay._step(rec["data"])
+            if expected != rec:
+                return False
+        return True
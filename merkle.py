@@ -17,3 +17,36 @@ def merkle_root(leaves: List[bytes]) -> bytes:
             nxt.append(sha256(a + b))
         layer = nxt
     return layer[0]
+
+def _subtree_root(job) -> bytes:
+    """Root of an aligned chunk of up to 2**height leaves, as the full tree sees it
+    (a short last chunk keeps pairing with itself up to `height`)."""
+    leaves, height = job
+    layer = [sha256(x) for x in leaves]
+    for _ in range(height):
+        nxt = []
+        for i in range(0, len(layer), 2):
+            a = layer[i]
+            b = layer[i+1] if i+1 < len(layer) else a
+            nxt.append(sha256(a + b))
+        layer = nxt
+    return layer[0]
+
+def merkle_root_parallel(leaves: List[bytes], workers: int, chunk_height: int = 14) -> bytes:
+    """Same result as merkle_root; aligned 2**chunk_height-leaf subtrees are hashed in a
+    process pool. Small inputs (a single chunk, or workers <= 1) stay in-process."""
+    size = 1 << chunk_height
+    if workers <= 1 or len(leaves) <= size:
+        return merkle_root(leaves)
+    from concurrent.futures import ProcessPoolExecutor
+    jobs = [(leaves[i:i+size], chunk_height) for i in range(0, len(leaves), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        layer = list(pool.map(_subtree_root, jobs))
+    while len(layer) > 1:
+        nxt = []
+        for i in range(0, len(layer), 2):
+            a = layer[i]
+            b = layer[i+1] if i+1 < len(layer) else a
+            nxt.append(sha256(a + b))
+        layer = nxt
+    return layer[0]
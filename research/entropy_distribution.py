@@ -2,9 +2,13 @@
 # HashHelix Stage 3D — Distribution Curve + ASCII Visualization
 
 import json
+import sys
 from pathlib import Path
 from collections import Counter
 
+sys.path.append(str(Path(__file__).resolve().parents[1] / "scripts"))
+from lane_codec import iter_trace_values, resolve_trace_path
+
 
 LANE_FILES = [
     "hh_entropy_lane01.txt",
@@ -20,13 +24,8 @@ def load_all_values():
     """Load all entropy lane integer values."""
     all_vals = []
     for file in LANE_FILES:
-        path = Path(file)
-        with path.open() as f:
-            for line in f:
-                try:
-                    all_vals.append(int(line.strip()))
-                except:
-                    pass
+        path = resolve_trace_path(Path(file))
+        all_vals.extend(iter_trace_values(path))
     return all_vals
 
 
@@ -16,8 +16,13 @@ import json
 import math
 import random
 import hashlib
+import sys
+from pathlib import Path
 from typing import Iterable, Dict, Any
 
+sys.path.append(str(Path(__file__).resolve().parents[1] / "scripts"))
+from lane_codec import iter_trace_values, resolve_trace_path
+
 # --- Config -----------------------------------------------------------------
 
 LANE_FILES = [
@@ -149,12 +154,7 @@ def analyze_stream(values: Iterable[int]) -> Dict[str, Any]:
 def iter_hashhelix_values() -> Iterable[int]:
     for path in LANE_FILES:
         try:
-            with open(path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    yield int(line)
+            yield from iter_trace_values(resolve_trace_path(Path(path)))
         except FileNotFoundError:
             # If a lane is missing, we just skip it
             continue
@@ -4,6 +4,10 @@
 from collections import Counter
 from pathlib import Path
 import json
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "scripts"))
+from lane_codec import iter_trace_values, resolve_trace_path
 
 # Input lanes — same naming as before
 FILES = [
@@ -15,19 +19,15 @@ FILES = [
 OUT = "data/entropy_value_histogram.json"
 
 def load_values(path):
-    """Load integers from a lane file."""
-    with open(path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                yield int(line)
+    """Load integers from a lane file (text or .hhlt)."""
+    yield from iter_trace_values(path)
 
 def main():
     counter = Counter()
 
     # accumulate all values across all lanes
     for filename in FILES:
-        p = Path(filename)
+        p = resolve_trace_path(Path(filename))
         if not p.exists():
             print(f"[WARN] Missing: {filename}")
             continue
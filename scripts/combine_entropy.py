@@ -4,6 +4,8 @@
 import json
 from pathlib import Path
 
+from lane_codec import iter_trace_values, resolve_trace_path
+
 FILES = [
     "hh_entropy_lane01.txt",
     "hh_entropy_lane02.txt",
@@ -14,9 +16,8 @@ OUT = "data/entropy_summary.json"
 
 
 def load_lane(path):
-    """Load a lane text file → list of integers."""
-    with open(path, "r") as f:
-        return [int(x.strip()) for x in f.readlines()]
+    """Load a lane trace (text or .hhlt) → list of integers."""
+    return list(iter_trace_values(path))
 
 
 def compute_stats(values):
@@ -34,7 +35,7 @@ def main():
     missing = []
 
     for i, path in enumerate(FILES, start=1):
-        p = Path(path)
+        p = resolve_trace_path(Path(path))
 
         if not p.exists():
             missing.append(path)
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+HashHelix — Stage 8
+Content digest cache
+
+Persistent local cache of file digests, so repeated audits of unchanged
+artifacts cost a stat() instead of a load + canonicalize + SHA-256:
+
+    (kind, path) → size, mtime_ns, inode, digest, nbytes, last_used
+
+An entry is only returned while the file's size, mtime_ns and inode
+still match the values stat() gave *before* the digest was computed.
+`kind` namespaces what was hashed, e.g.
+
+    canonical                 SHA-256 of the canonical JSON of the content
+    stream                    SHA-256 of the decoded bytes of a plain,
+                              gzip or .hhz file
+    lane_artifact/<version>   digest of the lane artifact sealed from a
+                              lane result file
+    epoch_bundle              integrity.sha256_epoch_bundle recomputed
+                              from an epoch bundle file
+
+Storage is one SQLite file (stdlib sqlite3, WAL mode), safe to share
+between the processes of a batch run. Eviction is LRU by last_used
+once max_entries is exceeded; invalidate() / invalidate_prefix() /
+clear() drop entries explicitly.
+
+Location: $HH_DIGEST_CACHE, default ~/.cache/hashhelix/digests.sqlite3;
+HH_DIGEST_CACHE=off disables caching.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple
+
+
+ENV_VAR = "HH_DIGEST_CACHE"
+# expanded when opened, so importing never needs a home directory
+DEFAULT_PATH = Path("~") / ".cache" / "hashhelix" / "digests.sqlite3"
+DEFAULT_MAX_ENTRIES = 200_000
+
+# Hits refresh last_used at most this often (seconds), so audits of
+# unchanged trees stay read-only most of the time.
+TOUCH_INTERVAL = 60
+EVICT_EVERY = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+    kind      TEXT    NOT NULL,
+    path      TEXT    NOT NULL,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    inode     INTEGER NOT NULL,
+    digest    TEXT    NOT NULL,
+    nbytes    INTEGER NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (kind, path)
+);
+CREATE INDEX IF NOT EXISTS digests_last_used ON digests (last_used);
+"""
+
+Stat = Tuple[int, int, int]
+
+
+def file_stat(path: Path) -> Stat:
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+def _key_path(path: Path) -> str:
+    return str(Path(path).resolve())
+
+
+class DigestCache:
+    def __init__(self, path: Path = DEFAULT_PATH, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.path = Path(path).expanduser()
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._pid = os.getpid()
+        self._puts = 0
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "DigestCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator["DigestCache"]:
+        """
+        Group many put() calls into one commit.
+        """
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    # ---------- lookup / store ----------
+
+    def get(self, path: Path, kind: str = "canonical", stat: Optional[Stat] = None) -> Optional[Tuple[str, int]]:
+        """
+        (digest, nbytes) if cached for the file as it is now, else None.
+        """
+        key = _key_path(path)
+        stat = stat or file_stat(Path(path))
+        row = self._db.execute(
+            "SELECT size, mtime_ns, inode, digest, nbytes, last_used FROM digests WHERE kind = ? AND path = ?",
+            (kind, key),
+        ).fetchone()
+        if row is None or tuple(row[:3]) != stat:
+            self.misses += 1
+            return None
+        self.hits += 1
+        now = int(time.time())
+        if now - row[5] >= TOUCH_INTERVAL:
+            self._db.execute(
+                "UPDATE digests SET last_used = ? WHERE kind = ? AND path = ?", (now, kind, key)
+            )
+        return row[3], row[4]
+
+    def put(self, path: Path, digest: str, nbytes: int, kind: str = "canonical", stat: Optional[Stat] = None) -> None:
+        """
+        Record a digest. Pass the stat taken before reading the file so a
+        concurrent modification can never be cached as current.
+        """
+        stat = stat or file_stat(Path(path))
+        self._db.execute(
+            "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (kind, _key_path(path), *stat, digest, nbytes, int(time.time())),
+        )
+        self._evict()
+
+    def digest(
+        self,
+        path: Path,
+        compute: Callable[[Path], Tuple[str, int]],
+        kind: str = "canonical",
+    ) -> Tuple[str, int]:
+        """
+        Cached (digest, nbytes) for path, calling compute(path) on a miss.
+        """
+        stat = file_stat(Path(path))
+        cached = self.get(path, kind, stat)
+        if cached is not None:
+            return cached
+        digest, nbytes = compute(Path(path))
+        self.put(path, digest, nbytes, kind, stat)
+        return digest, nbytes
+
+    def _evict(self) -> None:
+        # COUNT(*) scans the table, so check every EVICT_EVERY puts
+        self._puts += 1
+        if (self._puts - 1) % EVICT_EVERY:
+            return
+        (count,) = self._db.execute("SELECT COUNT(*) FROM digests").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM digests WHERE rowid IN "
+                "(SELECT rowid FROM digests ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+
+    # ---------- invalidation ----------
+
+    def invalidate(self, path: Path, kind: Optional[str] = None) -> int:
+        """
+        Drop the entries for one file (all kinds unless kind is given).
+        """
+        if kind is None:
+            cur = self._db.execute("DELETE FROM digests WHERE path = ?", (_key_path(path),))
+        else:
+            cur = self._db.execute(
+                "DELETE FROM digests WHERE kind = ? AND path = ?", (kind, _key_path(path))
+            )
+        return cur.rowcount
+
+    def invalidate_prefix(self, directory: Path) -> int:
+        """
+        Drop every entry for files under a directory.
+        """
+        prefix = _key_path(directory).rstrip(os.sep) + os.sep
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        cur = self._db.execute(
+            "DELETE FROM digests WHERE path LIKE ? ESCAPE '\\'", (escaped + "%",)
+        )
+        return cur.rowcount
+
+    def clear(self) -> int:
+        return self._db.execute("DELETE FROM digests").rowcount
+
+    def stats(self) -> dict:
+        (count,) = self._db.execute("SELECT COUNT(*) FROM digests").fetchone()
+        return {"path": str(self.path), "entries": count, "max_entries": self.max_entries}
+
+
+# ---------- Process-wide default ----------
+
+_default: Optional[DigestCache] = None
+_unusable = False
+
+
+def default_cache() -> Optional[DigestCache]:
+    """
+    The shared cache for this process (None when disabled or when the
+    location cannot be opened, e.g. a read-only or missing $HOME; that
+    case warns once and the tools run uncached). Reopened after a fork,
+    since SQLite connections must not cross processes.
+    """
+    global _default, _unusable
+    location = os.environ.get(ENV_VAR, "")
+    if location.lower() in ("off", "0", "none") or _unusable:
+        return None
+    if _default is None or _default._pid != os.getpid():
+        path = Path(location) if location else DEFAULT_PATH
+        try:
+            path = path.expanduser()
+            _default = DigestCache(path)
+        except (OSError, RuntimeError, sqlite3.Error) as e:
+            _default = None
+            _unusable = True
+            print(f"[WARN] digest cache disabled: cannot open {path}: {e}", file=sys.stderr)
+    return _default
+
+
+# ---------- CLI ----------
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="HashHelix Stage 8 — Content digest cache maintenance."
+    )
+    parser.add_argument("--cache", default=None, help=f"Cache file (default: ${ENV_VAR} or {DEFAULT_PATH}).")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="Entry count and location.")
+    inv = sub.add_parser("invalidate", help="Drop entries for files or directories.")
+    inv.add_argument("paths", nargs="+")
+    inv.add_argument("--kind", default=None)
+    sub.add_parser("clear", help="Drop every entry.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    location = args.cache or os.environ.get(ENV_VAR) or DEFAULT_PATH
+    if str(location).lower() in ("off", "0", "none"):
+        raise SystemExit(f"digest cache disabled (${ENV_VAR}={location}); pass --cache")
+    with DigestCache(Path(location)) as cache:
+        if args.cmd == "stats":
+            result = cache.stats()
+        elif args.cmd == "clear":
+            result = {"removed": cache.clear()}
+        else:
+            removed = 0
+            for p in args.paths:
+                if Path(p).is_dir():
+                    removed += cache.invalidate_prefix(Path(p))
+                else:
+                    removed += cache.invalidate(Path(p), args.kind)
+            result = {"removed": removed}
+    print(json.dumps(result, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,12 @@ Takes lane trace files (from lane_runtime.py) and produces:
 - Per-lane epoch artifacts (JSON)
 - Per-epoch bundles referencing all lanes
 
+With --stream, lanes are generated in-process and each epoch is emitted as
+soon as it closes; raw traces are only written if --trace-dir is given.
+With --workers N, (lane, epoch) jobs are fanned out to a process pool.
+With --incremental, an epoch_manifest.json in the output directory lets
+reruns process only steps appended since the last run.
+
 Properties:
 - Deterministic and reproducible
 - No timestamps, no randomness
@@ -17,8 +23,24 @@ Properties:
 import argparse
 import hashlib
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from lane_codec import (
+    CODECS,
+    DEFAULT_CODEC,
+    TRACE_FORMATS,
+    LaneTraceReader,
+    is_hhlt,
+    iter_trace_values,
+    lane_trace_path,
+    open_lane_trace_writer,
+    write_trace_meta,
+)
+from digest_cache import file_stat
+from lane_runtime import DEFAULT_GUARD_INTERVAL, ENGINES, iter_lanes_lockstep
 
 
 # ---------- Merkle Helpers ----------
@@ -38,7 +60,15 @@ def merkle_root_from_ints(values: List[int]) -> str:
     if not values:
         return hashlib.sha256(b"").hexdigest()
 
-    layer = [sha256_bytes(str(v).encode("utf-8")) for v in values]
+    return merkle_root_from_leaves(
+        [sha256_bytes(str(v).encode("utf-8")) for v in values]
+    )
+
+
+def merkle_root_from_leaves(layer: List[bytes]) -> str:
+    """
+    Fold a non-empty layer of leaf digests up to the root (hex).
+    """
     while len(layer) > 1:
         next_layer: List[bytes] = []
         for i in range(0, len(layer), 2):
@@ -64,17 +94,115 @@ def sequence_hash_from_ints(values: List[int]) -> str:
     return h.hexdigest()
 
 
+def epoch_digest(values: Iterable[int]) -> Tuple[str, str, Dict[str, float]]:
+    """
+    Single-pass epoch kernel: (merkle_root, sequence_hash, stats).
+
+    Feeds an EpochAccumulator, so batch, parallel and streamed epochs go
+    through one implementation. Results are identical to
+    merkle_root_from_ints, sequence_hash_from_ints and compute_epoch_stats
+    over the same values.
+    """
+    acc = EpochAccumulator()
+    acc.extend(values)
+    return acc.merkle_root(), acc.sequence_hash(), acc.stats()
+
+
+class EpochAccumulator:
+    """
+    Online epoch state for one lane.
+
+    Each value is encoded once and fed to the Merkle leaf stack, the
+    sequence hash and the running min/max/sum. Results are identical to
+    merkle_root_from_ints / sequence_hash_from_ints / compute_epoch_stats
+    over the same values.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        # _levels[k] holds a pending left node of height k (or None)
+        self._levels: List[Optional[bytes]] = []
+        self._seq = hashlib.sha256()
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def update(self, value: int) -> None:
+        data = b"%d" % value
+        self._seq.update(data + b"\n")
+
+        if self.count == 0:
+            self.min = self.max = value
+        elif value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+        self.total += value
+        self.count += 1
+
+        node = sha256_bytes(data)
+        levels = self._levels
+        level = 0
+        while level < len(levels) and levels[level] is not None:
+            node = sha256_bytes(levels[level] + node)
+            levels[level] = None
+            level += 1
+        if level == len(levels):
+            levels.append(node)
+        else:
+            levels[level] = node
+
+    def extend(self, values: Iterable[int]) -> None:
+        update = self.update
+        for value in values:
+            update(value)
+
+    def merkle_root(self) -> str:
+        """
+        Fold the pending nodes bottom-up, duplicating the trailing node of
+        any odd layer exactly as merkle_root_from_ints does.
+        """
+        if self.count == 0:
+            return hashlib.sha256(b"").hexdigest()
+
+        levels = self._levels
+        top = max(k for k, node in enumerate(levels) if node is not None)
+        carry: Optional[bytes] = None
+        for level in range(top + 1):
+            node = levels[level]
+            if node is not None and carry is not None:
+                carry = sha256_bytes(node + carry)
+            elif node is not None:
+                carry = node if level == top else sha256_bytes(node + node)
+            elif carry is not None:
+                carry = sha256_bytes(carry + carry)
+        assert carry is not None
+        return carry.hex()
+
+    def sequence_hash(self) -> str:
+        return self._seq.hexdigest()
+
+    def stats(self) -> Dict[str, float]:
+        if self.count == 0:
+            return {
+                "min": 0,
+                "max": 0,
+                "mean": 0.0,
+            }
+        return {
+            "min": self.min,
+            "max": self.max,
+            "mean": self.total / float(self.count),
+        }
+
+
 # ---------- Core Epoch Logic ----------
 
 def load_lane_values(lane_path: Path) -> List[int]:
-    values: List[int] = []
-    with lane_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            values.append(int(line))
-    return values
+    return list(iter_trace_values(lane_path))
 
 
 def compute_epoch_stats(segment: List[int]) -> Dict[str, float]:
@@ -94,9 +222,74 @@ def compute_epoch_stats(segment: List[int]) -> Dict[str, float]:
     }
 
 
+def write_epoch(
+    lane_id: int,
+    epoch_index: int,
+    start_step: int,
+    end_step: int,
+    step_count: int,
+    merkle: str,
+    seq_hash: str,
+    stats: Dict[str, float],
+    out_dir: Path,
+) -> Dict:
+    """
+    Emit one epoch_laneXX_epYYYY.json and return its bundle summary.
+    """
+    epoch_id = f"epoch-lane{lane_id:02d}-ep{epoch_index:04d}"
+
+    epoch_obj = {
+        # Stage 7 / Epoch schema alignment
+        "schema": "https://hashhelix.dev/schemas/epoch.stage5.json",
+        "stage": 8,
+        "epoch_id": epoch_id,
+        "lane_id": lane_id,
+        "epoch_index": epoch_index,
+        "start_step": start_step,
+        "end_step": end_step,
+        "step_count": step_count,
+        "merkle_root": merkle,
+        "sequence_hash": seq_hash,
+        "stats": stats,
+    }
+
+    epoch_filename = f"epoch_lane{lane_id:02d}_ep{epoch_index:04d}.json"
+    epoch_path = out_dir / epoch_filename
+    with epoch_path.open("w", encoding="utf-8") as f:
+        json.dump(epoch_obj, f, indent=2, sort_keys=True)
+
+    return {
+        "lane_id": lane_id,
+        "epoch_id": epoch_id,
+        "merkle_root": merkle,
+        "sequence_hash": seq_hash,
+    }
+
+
+def iter_epoch_windows(
+    values: Iterable[int],
+    epoch_length: int,
+    max_epochs: int,
+) -> Iterator[Tuple[int, List[int]]]:
+    """
+    Yield (epoch_index, segment) for each full epoch in a value stream.
+
+    Only one epoch-sized window is held at a time. A trailing partial
+    epoch is dropped, and nothing past max_epochs (if > 0) is read.
+    """
+    it = iter(values)
+    epoch_index = 0
+    while max_epochs <= 0 or epoch_index < max_epochs:
+        segment = list(islice(it, epoch_length))
+        if len(segment) < epoch_length:
+            return
+        epoch_index += 1
+        yield epoch_index, segment
+
+
 def generate_epochs_for_lane(
     lane_id: int,
-    values: List[int],
+    values: Iterable[int],
     epoch_length: int,
     max_epochs: int,
     out_dir: Path,
@@ -104,69 +297,53 @@ def generate_epochs_for_lane(
     """
     Slice a lane into fixed-length epochs and emit JSON files.
 
+    values may be a list or any stream (e.g. iter_trace_values); memory
+    is bounded by one epoch either way.
+
     Returns:
         List of (epoch_index, summary_dict) for bundle construction.
     """
     summaries: List[Tuple[int, Dict]] = []
 
-    total_steps = len(values)
-    if total_steps < epoch_length:
-        # Not enough steps to form even one epoch → no output for this lane.
-        return summaries
-
-    num_epochs = total_steps // epoch_length
-    if max_epochs > 0:
-        num_epochs = min(num_epochs, max_epochs)
-
-    for epoch_index in range(1, num_epochs + 1):
-        start_idx = (epoch_index - 1) * epoch_length
-        end_idx = start_idx + epoch_length
-        segment = values[start_idx:end_idx]
-
-        start_step = start_idx + 1
-        end_step = end_idx
-
-        merkle = merkle_root_from_ints(segment)
-        seq_hash = sequence_hash_from_ints(segment)
-        stats = compute_epoch_stats(segment)
-
-        epoch_id = f"epoch-lane{lane_id:02d}-ep{epoch_index:04d}"
-
-        epoch_obj = {
-            # Stage 7 / Epoch schema alignment
-            "schema": "https://hashhelix.dev/schemas/epoch.stage5.json",
-            "stage": 8,
-            "epoch_id": epoch_id,
-            "lane_id": lane_id,
-            "epoch_index": epoch_index,
-            "start_step": start_step,
-            "end_step": end_step,
-            "step_count": len(segment),
-            "merkle_root": merkle,
-            "sequence_hash": seq_hash,
-            "stats": stats,
-        }
-
-        epoch_filename = f"epoch_lane{lane_id:02d}_ep{epoch_index:04d}.json"
-        epoch_path = out_dir / epoch_filename
-        with epoch_path.open("w", encoding="utf-8") as f:
-            json.dump(epoch_obj, f, indent=2, sort_keys=True)
-
+    for epoch_index, segment in iter_epoch_windows(values, epoch_length, max_epochs):
         summaries.append(
             (
                 epoch_index,
-                {
-                    "lane_id": lane_id,
-                    "epoch_id": epoch_id,
-                    "merkle_root": merkle,
-                    "sequence_hash": seq_hash,
-                },
+                emit_epoch_segment(lane_id, epoch_index, segment, epoch_length, out_dir),
             )
         )
 
     return summaries
 
 
+def emit_epoch_segment(
+    lane_id: int,
+    epoch_index: int,
+    segment: List[int],
+    epoch_length: int,
+    out_dir: Path,
+) -> Dict:
+    """
+    Hash one full epoch segment, write its JSON, return its bundle summary.
+    """
+    start_step = (epoch_index - 1) * epoch_length + 1
+    end_step = start_step + epoch_length - 1
+
+    merkle, seq_hash, stats = epoch_digest(segment)
+
+    return write_epoch(
+        lane_id=lane_id,
+        epoch_index=epoch_index,
+        start_step=start_step,
+        end_step=end_step,
+        step_count=len(segment),
+        merkle=merkle,
+        seq_hash=seq_hash,
+        stats=stats,
+        out_dir=out_dir,
+    )
+
+
 def build_epoch_bundles(
     epoch_summaries: Dict[int, List[Dict]],
     out_dir: Path,
@@ -175,30 +352,495 @@ def build_epoch_bundles(
     For each epoch_index, emit a bundle JSON listing all lane epochs.
     """
     for epoch_index in sorted(epoch_summaries.keys()):
-        lanes = epoch_summaries[epoch_index]
-        bundle_id = f"epoch-bundle-ep{epoch_index:04d}"
-
-        bundle_obj = {
-            "schema": "https://hashhelix.dev/schemas/hashBundle.stage6.json",
-            "stage": 8,
-            "bundle_id": bundle_id,
-            "bundle_type": "epoch_bundle",
-            "epoch_index": epoch_index,
-            "lane_count": len(lanes),
-            "lanes": lanes,
-        }
+        write_epoch_bundle(epoch_index, epoch_summaries[epoch_index], out_dir)
+
+
+def write_epoch_bundle(epoch_index: int, lanes: List[Dict], out_dir: Path) -> None:
+    bundle_id = f"epoch-bundle-ep{epoch_index:04d}"
+
+    bundle_obj = {
+        "schema": "https://hashhelix.dev/schemas/hashBundle.stage6.json",
+        "stage": 8,
+        "bundle_id": bundle_id,
+        "bundle_type": "epoch_bundle",
+        "epoch_index": epoch_index,
+        "lane_count": len(lanes),
+        "lanes": lanes,
+    }
+
+    bundle_filename = f"epoch_bundle_ep{epoch_index:04d}.json"
+    bundle_path = out_dir / bundle_filename
+    with bundle_path.open("w", encoding="utf-8") as f:
+        json.dump(bundle_obj, f, indent=2, sort_keys=True)
+
+
+# ---------- Parallel (lane, epoch) production ----------
+
+# Job: (lane_id, lane_path, epoch_index, epoch_length, byte_start, byte_end, out_dir)
+# byte_start/byte_end delimit the epoch in a text trace; .hhlt jobs use -1
+# and seek through the chunk index instead.
+EpochJob = Tuple[int, str, int, int, int, int, str]
+
+
+def text_epoch_offsets(
+    path: Path,
+    epoch_length: int,
+    max_epochs: int,
+    block_size: int = 1 << 20,
+) -> List[int]:
+    """
+    Byte offsets of epoch boundaries in a text trace, found by counting
+    newlines block by block without parsing values.
+
+    offsets[k] is where step k*epoch_length+1 starts, so epoch e spans
+    offsets[e-1]:offsets[e]. Only full epochs (capped at max_epochs) are
+    included.
+    """
+    offsets = [0]
+    seen = 0  # newlines consumed so far
+    base = 0
+    last_byte = b""
+    with path.open("rb") as f:
+        while max_epochs <= 0 or len(offsets) - 1 < max_epochs:
+            block = f.read(block_size)
+            if not block:
+                break
+            last_byte = block[-1:]
+            pos = 0
+            while max_epochs <= 0 or len(offsets) - 1 < max_epochs:
+                need = len(offsets) * epoch_length - seen
+                available = block.count(b"\n", pos)
+                if available < need:
+                    seen += available
+                    break
+                rest = block[pos:].split(b"\n", need)[-1]
+                pos = len(block) - len(rest)
+                seen += need
+                offsets.append(base + pos)
+            base += len(block)
+
+    # A final line without a trailing newline still counts as a step.
+    if (
+        last_byte not in (b"", b"\n")
+        and seen + 1 == len(offsets) * epoch_length
+        and (max_epochs <= 0 or len(offsets) - 1 < max_epochs)
+    ):
+        offsets.append(base)
+    return offsets
+
+
+def plan_epoch_jobs(
+    lane_id: int,
+    lane_path: Path,
+    epoch_length: int,
+    max_epochs: int,
+    out_dir: Path,
+) -> List[EpochJob]:
+    jobs: List[EpochJob] = []
+    if is_hhlt(lane_path):
+        num_epochs = len(LaneTraceReader(lane_path)) // epoch_length
+        if max_epochs > 0:
+            num_epochs = min(num_epochs, max_epochs)
+        for epoch_index in range(1, num_epochs + 1):
+            jobs.append(
+                (lane_id, str(lane_path), epoch_index, epoch_length, -1, -1, str(out_dir))
+            )
+        return jobs
+
+    offsets = text_epoch_offsets(lane_path, epoch_length, max_epochs)
+    for epoch_index in range(1, len(offsets)):
+        jobs.append(
+            (
+                lane_id,
+                str(lane_path),
+                epoch_index,
+                epoch_length,
+                offsets[epoch_index - 1],
+                offsets[epoch_index],
+                str(out_dir),
+            )
+        )
+    return jobs
+
+
+def run_epoch_job(job: EpochJob) -> Tuple[int, int, Dict]:
+    """
+    Worker: read only this epoch's slice of the lane trace and emit it.
+    """
+    lane_id, lane_path, epoch_index, epoch_length, start, end, out_dir = job
+    path = Path(lane_path)
+    if start < 0:
+        start_step = (epoch_index - 1) * epoch_length + 1
+        values = LaneTraceReader(path).iter_values(start_step)
+        segment = list(islice(values, epoch_length))
+    else:
+        with path.open("rb") as f:
+            f.seek(start)
+            segment = [int(tok) for tok in f.read(end - start).split()]
+    if len(segment) != epoch_length:
+        raise ValueError(
+            f"{path}: epoch {epoch_index} has {len(segment)} values, "
+            f"expected {epoch_length} (blank or malformed lines?)"
+        )
+    summary = emit_epoch_segment(lane_id, epoch_index, segment, epoch_length, Path(out_dir))
+    return lane_id, epoch_index, summary
+
+
+def produce_epochs_parallel(
+    lanes: List[Tuple[int, Path]],
+    epoch_length: int,
+    max_epochs: int,
+    out_dir: Path,
+    workers: int,
+) -> Dict[int, List[Dict]]:
+    """
+    Fan (lane, epoch) jobs out to a process pool. Results are gathered in
+    job order (lane-major), so bundles list lanes exactly as the serial
+    path does.
+    """
+    jobs: List[EpochJob] = []
+    for lane_id, lane_path in lanes:
+        jobs.extend(plan_epoch_jobs(lane_id, lane_path, epoch_length, max_epochs, out_dir))
+
+    epoch_summaries: Dict[int, List[Dict]] = {}
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for _, epoch_index, summary in pool.map(run_epoch_job, jobs, chunksize=chunksize):
+            epoch_summaries.setdefault(epoch_index, []).append(summary)
+    return epoch_summaries
+
+
+# ---------- Incremental production (manifest) ----------
+
+MANIFEST_NAME = "epoch_manifest.json"
+CHAIN_GENESIS = "0" * 64
+
+
+def chain_digest(prev: str, seq_hash: str) -> str:
+    """
+    Per-lane prefix digest: SHA256(prev || sequence_hash) over epochs 1..k.
+    """
+    return hashlib.sha256(bytes.fromhex(prev) + bytes.fromhex(seq_hash)).hexdigest()
+
+
+def new_manifest_entry(lane_path: Path) -> Dict:
+    return {
+        "trace": lane_path.name,
+        "epochs": 0,
+        "chain": CHAIN_GENESIS,
+        "trace_stat": None,
+        "byte_offset": 0 if not is_hhlt(lane_path) else None,
+    }
+
+
+def load_manifest(out_dir: Path, epoch_length: int) -> Dict[str, Dict]:
+    """
+    Per-lane manifest entries, or {} if absent or built with another
+    epoch length.
+    """
+    path = out_dir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("epoch_length") != epoch_length:
+        return {}
+    return manifest.get("lanes", {})
+
+
+def write_manifest(out_dir: Path, epoch_length: int, lanes: Dict[str, Dict]) -> None:
+    manifest = {
+        "stage": 8,
+        "epoch_length": epoch_length,
+        "lanes": lanes,
+    }
+    path = out_dir / MANIFEST_NAME
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
 
-        bundle_filename = f"epoch_bundle_ep{epoch_index:04d}.json"
-        bundle_path = out_dir / bundle_filename
-        with bundle_path.open("w", encoding="utf-8") as f:
-            json.dump(bundle_obj, f, indent=2, sort_keys=True)
+
+def validate_lane_prefix(
+    lane_path: Path,
+    entry: Dict,
+    epoch_length: int,
+    full: bool = False,
+) -> bool:
+    """
+    Check that the first entry["epochs"] epochs of the trace are unchanged
+    by re-hashing them and comparing the chain digest.
+
+    A trace whose size, mtime_ns and inode still match the stat recorded
+    before it was last read (the digest_cache rule) is taken as unchanged
+    without a re-read; full=True re-hashes it anyway.
+    """
+    if entry.get("trace") != lane_path.name:
+        return False
+    k = entry.get("epochs", 0)
+    if k == 0:
+        return True
+    if not full and entry.get("trace_stat") == list(file_stat(lane_path)):
+        return True
+
+    chain = CHAIN_GENESIS
+    seen = 0
+    values = iter_trace_values(lane_path)
+    try:
+        for seen, segment in iter_epoch_windows(values, epoch_length, k):
+            chain = chain_digest(chain, sequence_hash_from_ints(segment))
+    finally:
+        values.close()
+    return seen == k and chain == entry["chain"]
+
+
+def iter_lane_epochs_from(
+    lane_path: Path,
+    epoch_length: int,
+    first_epoch: int,
+    byte_offset: Optional[int],
+) -> Iterator[Tuple[int, List[int], Optional[int], Optional[int]]]:
+    """
+    Yield (epoch_index, segment, start_offset, end_offset) for full epochs
+    from first_epoch on. Text traces resume at byte_offset and report byte
+    offsets; .hhlt traces seek via the chunk index (offsets are None).
+
+    A final line without a trailing newline counts as a step, as in
+    iter_trace_values. If it was still being written, the next run's
+    prefix check fails and the lane is rebuilt.
+    """
+    if is_hhlt(lane_path):
+        start_step = (first_epoch - 1) * epoch_length + 1
+        values = LaneTraceReader(lane_path).iter_values(start_step)
+        for i, segment in iter_epoch_windows(values, epoch_length, 0):
+            yield first_epoch + i - 1, segment, None, None
+        return
+
+    epoch_index = first_epoch
+    with lane_path.open("rb") as f:
+        f.seek(byte_offset or 0)
+        pos = start = f.tell()
+        segment: List[int] = []
+        for line in f:
+            pos += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            segment.append(int(line))
+            if len(segment) == epoch_length:
+                yield epoch_index, segment, start, pos
+                epoch_index += 1
+                segment = []
+                start = pos
+
+
+def read_epoch_summary(out_dir: Path, lane_id: int, epoch_index: int) -> Dict:
+    """
+    Bundle summary of an already-written epoch JSON.
+    """
+    epoch_path = out_dir / f"epoch_lane{lane_id:02d}_ep{epoch_index:04d}.json"
+    with epoch_path.open("r", encoding="utf-8") as f:
+        obj = json.load(f)
+    return {
+        "lane_id": obj["lane_id"],
+        "epoch_id": obj["epoch_id"],
+        "merkle_root": obj["merkle_root"],
+        "sequence_hash": obj["sequence_hash"],
+    }
+
+
+def remove_stale_epochs(out_dir: Path, lane_id: int, keep: int) -> List[int]:
+    """
+    Delete a lane's epoch JSONs past its first keep epochs; returns the
+    removed epoch indices.
+    """
+    prefix = f"epoch_lane{lane_id:02d}_ep"
+    removed: List[int] = []
+    for path in out_dir.glob(prefix + "*.json"):
+        index = path.name[len(prefix):-len(".json")]
+        if index.isdigit() and int(index) > keep:
+            path.unlink()
+            removed.append(int(index))
+    return sorted(removed)
+
+
+def produce_epochs_incremental(
+    lanes: List[Tuple[int, Path]],
+    epoch_length: int,
+    max_epochs: int,
+    out_dir: Path,
+    full_check: bool = False,
+) -> Dict[int, int]:
+    """
+    Emit only epochs completed since the last run recorded in the manifest.
+
+    Lanes whose recorded prefix no longer validates are rebuilt from epoch
+    1; if a rebuilt lane ends up shorter, its epoch JSONs past the new
+    count are deleted. Only bundles for epoch indices that gained or lost
+    a lane epoch are rewritten (or deleted once no lane reaches them);
+    unchanged lanes are read back from their epoch JSON.
+
+    Returns:
+        lane_id -> number of newly emitted epochs.
+    """
+    manifest = load_manifest(out_dir, epoch_length)
+    new_summaries: Dict[int, Dict[int, Dict]] = {}
+    completed: Dict[int, int] = {}
+    emitted: Dict[int, int] = {}
+    shrunk: set = set()
+
+    for lane_id, lane_path in lanes:
+        # taken before reading, so a concurrent append is never recorded as seen
+        stat = list(file_stat(lane_path))
+        entry = manifest.get(str(lane_id))
+        rebuilt = entry is None or not validate_lane_prefix(lane_path, entry, epoch_length, full_check)
+        if rebuilt:
+            entry = new_manifest_entry(lane_path)
+
+        emitted[lane_id] = 0
+        if max_epochs <= 0 or entry["epochs"] < max_epochs:
+            epochs = iter_lane_epochs_from(
+                lane_path, epoch_length, entry["epochs"] + 1, entry["byte_offset"]
+            )
+            try:
+                for epoch_index, segment, _, end in epochs:
+                    summary = emit_epoch_segment(
+                        lane_id, epoch_index, segment, epoch_length, out_dir
+                    )
+                    new_summaries.setdefault(epoch_index, {})[lane_id] = summary
+                    entry["epochs"] = epoch_index
+                    entry["chain"] = chain_digest(entry["chain"], summary["sequence_hash"])
+                    entry["byte_offset"] = end
+                    emitted[lane_id] += 1
+                    if max_epochs > 0 and epoch_index >= max_epochs:
+                        break
+            finally:
+                epochs.close()
+
+        if rebuilt:
+            shrunk.update(remove_stale_epochs(out_dir, lane_id, entry["epochs"]))
+        entry["trace_stat"] = stat
+        manifest[str(lane_id)] = entry
+        completed[lane_id] = entry["epochs"]
+
+    for epoch_index in sorted(shrunk.union(new_summaries)):
+        fresh = new_summaries.get(epoch_index, {})
+        bundle_lanes: List[Dict] = []
+        for lane_id, _ in lanes:
+            if lane_id in fresh:
+                bundle_lanes.append(fresh[lane_id])
+            elif completed[lane_id] >= epoch_index:
+                bundle_lanes.append(read_epoch_summary(out_dir, lane_id, epoch_index))
+        if bundle_lanes:
+            write_epoch_bundle(epoch_index, bundle_lanes, out_dir)
+        else:
+            (out_dir / f"epoch_bundle_ep{epoch_index:04d}.json").unlink(missing_ok=True)
+
+    write_manifest(out_dir, epoch_length, manifest)
+    return emitted
+
+
+# ---------- Streaming (fused lane → epoch) ----------
+
+def stream_epochs_from_runtime(
+    lanes: int,
+    steps: int,
+    seed: int,
+    seed_stride: int,
+    epoch_length: int,
+    max_epochs: int,
+    out_dir: Path,
+    trace_dir: Optional[Path] = None,
+    engine: str = "python",
+    guard_interval: int = DEFAULT_GUARD_INTERVAL,
+    trace_format: str = "text",
+    codec: str = DEFAULT_CODEC,
+) -> int:
+    """
+    Generate lanes in lockstep and build epochs online.
+
+    Every epoch JSON and its bundle are written the moment the epoch
+    closes, with output byte-identical to running lane_runtime.py followed
+    by the batch path. Lane traces are written only if trace_dir is given;
+    without traces, generation stops after the last emitted epoch.
+
+    Returns:
+        Number of epochs emitted per lane.
+    """
+    num_epochs = steps // epoch_length
+    if max_epochs > 0:
+        num_epochs = min(num_epochs, max_epochs)
+
+    last_step = steps if trace_dir is not None else num_epochs * epoch_length
+    if last_step == 0:
+        return 0
+
+    stepper = iter_lanes_lockstep(
+        lanes, last_step, seed, seed_stride,
+        engine=engine, guard_interval=guard_interval,
+    )
+    accumulators = [EpochAccumulator() for _ in range(lanes)]
+    trace_files = []
+    if trace_dir is not None:
+        trace_dir.mkdir(parents=True, exist_ok=True)
+        for lane_id in range(1, lanes + 1):
+            trace_files.append(
+                open_lane_trace_writer(trace_dir, lane_id, trace_format, codec)
+            )
+
+    epoch_index = 0
+    try:
+        for n, lane_states in stepper:
+            for f, a in zip(trace_files, lane_states):
+                f.write(a)
+
+            if epoch_index >= num_epochs:
+                continue
+
+            for acc, a in zip(accumulators, lane_states):
+                acc.update(a)
+
+            if n % epoch_length == 0:
+                epoch_index += 1
+                summaries: List[Dict] = []
+                for lane_id, acc in enumerate(accumulators, start=1):
+                    summaries.append(
+                        write_epoch(
+                            lane_id=lane_id,
+                            epoch_index=epoch_index,
+                            start_step=n - epoch_length + 1,
+                            end_step=n,
+                            step_count=acc.count,
+                            merkle=acc.merkle_root(),
+                            seq_hash=acc.sequence_hash(),
+                            stats=acc.stats(),
+                            out_dir=out_dir,
+                        )
+                    )
+                    acc.reset()
+                write_epoch_bundle(epoch_index, summaries, out_dir)
+    finally:
+        for f in trace_files:
+            f.close()
+
+    for lane_id, f in enumerate(trace_files, start=1):
+        write_trace_meta(
+            f,
+            lane_id=lane_id,
+            lane_seed=seed + (lane_id - 1) * seed_stride,
+            seed=seed,
+            seed_stride=seed_stride,
+            mode="stream",
+        )
+
+    return epoch_index
 
 
 # ---------- CLI ----------
 
 def autodetect_lanes(lane_dir: Path) -> List[int]:
     lane_ids: List[int] = []
-    for path in sorted(lane_dir.glob("lane*.txt")):
+    for path in sorted(lane_dir.glob("lane*")):
+        if path.suffix not in (".txt", ".hhlt"):
+            continue
         name = path.stem  # e.g., lane01
         if not name.startswith("lane"):
             continue
@@ -206,7 +848,7 @@ def autodetect_lanes(lane_dir: Path) -> List[int]:
         if not suffix.isdigit():
             continue
         lane_ids.append(int(suffix))
-    return sorted(lane_ids)
+    return sorted(set(lane_ids))
 
 
 def parse_args() -> argparse.Namespace:
@@ -217,7 +859,7 @@ def parse_args() -> argparse.Namespace:
         "--lane-dir",
         type=str,
         default="data/runtime/lanes",
-        help="Directory containing laneXX.txt traces (default: data/runtime/lanes).",
+        help="Directory containing laneXX.txt / laneXX.hhlt traces (default: data/runtime/lanes).",
     )
     parser.add_argument(
         "--out-dir",
@@ -246,6 +888,87 @@ def parse_args() -> argparse.Namespace:
         default=0,
         help="Maximum epochs per lane (0 = all possible).",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Generate lanes in-process and emit epochs as they close "
+            "instead of reading traces from lane-dir (requires --lanes, --steps)."
+        ),
+    )
+    parser.add_argument(
+        "--steps",
+        type=int,
+        default=0,
+        help="Steps per lane in --stream mode.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=1,
+        help="Base seed a_1 for lane 1 in --stream mode (default: 1).",
+    )
+    parser.add_argument(
+        "--seed-stride",
+        type=int,
+        default=0,
+        help="Per-lane seed increment in --stream mode (default: 0).",
+    )
+    parser.add_argument(
+        "--trace-dir",
+        type=str,
+        default=None,
+        help="In --stream mode, also write lane traces here (default: none).",
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=TRACE_FORMATS,
+        default="text",
+        help="Format of --trace-dir traces: text or hhlt (default: text).",
+    )
+    parser.add_argument(
+        "--codec",
+        choices=sorted(CODECS),
+        default=DEFAULT_CODEC,
+        help=f"Per-chunk compression for hhlt traces (default: {DEFAULT_CODEC}).",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="python",
+        help="Lane stepping engine in --stream mode (default: python).",
+    )
+    parser.add_argument(
+        "--guard-interval",
+        type=int,
+        default=DEFAULT_GUARD_INTERVAL,
+        help=(
+            "NumPy engine in --stream mode: cross-check every N-th step against "
+            f"math.sin (0 = only n=2; default: {DEFAULT_GUARD_INTERVAL})."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for (lane, epoch) jobs (default: 1 = serial streaming).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            f"Resume from {MANIFEST_NAME} in out-dir: only newly completed "
+            "epochs are computed and only their bundles rewritten."
+        ),
+    )
+    parser.add_argument(
+        "--full-prefix-check",
+        action="store_true",
+        help=(
+            "With --incremental, re-hash recorded epochs even when a trace's "
+            "size/mtime/inode are unchanged since the last run."
+        ),
+    )
     return parser.parse_args()
 
 
@@ -256,11 +979,36 @@ def main() -> None:
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    if not lane_dir.exists():
-        raise FileNotFoundError(f"lane-dir does not exist: {lane_dir}")
-
     if args.epoch_length <= 0:
         raise ValueError("epoch-length must be > 0")
+    if args.workers < 1:
+        raise ValueError("workers must be >= 1")
+    if args.incremental and (args.workers > 1 or args.stream):
+        raise ValueError("--incremental cannot be combined with --workers or --stream")
+
+    if args.stream:
+        if args.lanes < 1:
+            raise ValueError("--stream requires --lanes >= 1")
+        if args.steps < 1:
+            raise ValueError("--stream requires --steps >= 1")
+        stream_epochs_from_runtime(
+            lanes=args.lanes,
+            steps=args.steps,
+            seed=args.seed,
+            seed_stride=args.seed_stride,
+            epoch_length=args.epoch_length,
+            max_epochs=args.max_epochs,
+            out_dir=out_dir,
+            trace_dir=Path(args.trace_dir) if args.trace_dir else None,
+            engine=args.engine,
+            guard_interval=args.guard_interval,
+            trace_format=args.trace_format,
+            codec=args.codec,
+        )
+        return
+
+    if not lane_dir.exists():
+        raise FileNotFoundError(f"lane-dir does not exist: {lane_dir}")
 
     # Lane discovery
     if args.lanes > 0:
@@ -271,22 +1019,52 @@ def main() -> None:
     if not lane_ids:
         raise ValueError("No lanes found to process.")
 
-    epoch_summaries: Dict[int, List[Dict]] = {}
-
+    lane_paths: List[Tuple[int, Path]] = []
     for lane_id in lane_ids:
-        lane_path = lane_dir / f"lane{lane_id:02d}.txt"
+        lane_path = lane_trace_path(lane_dir, lane_id)
         if not lane_path.exists():
             # Strict: fail if a requested lane is missing.
             raise FileNotFoundError(f"Missing lane trace: {lane_path}")
+        lane_paths.append((lane_id, lane_path))
 
-        values = load_lane_values(lane_path)
-        summaries = generate_epochs_for_lane(
-            lane_id=lane_id,
-            values=values,
+    if args.incremental:
+        emitted = produce_epochs_incremental(
+            lanes=lane_paths,
+            epoch_length=args.epoch_length,
+            max_epochs=args.max_epochs,
+            out_dir=out_dir,
+            full_check=args.full_prefix_check,
+        )
+        print(f"[OK] Incremental: {sum(emitted.values())} new lane epochs")
+        return
+
+    if args.workers > 1:
+        epoch_summaries = produce_epochs_parallel(
+            lanes=lane_paths,
             epoch_length=args.epoch_length,
             max_epochs=args.max_epochs,
             out_dir=out_dir,
+            workers=args.workers,
         )
+        build_epoch_bundles(epoch_summaries, out_dir)
+        return
+
+    epoch_summaries = {}
+
+    for lane_id, lane_path in lane_paths:
+
+        # Stream the trace: one epoch in memory, stop at --max-epochs.
+        values = iter_trace_values(lane_path)
+        try:
+            summaries = generate_epochs_for_lane(
+                lane_id=lane_id,
+                values=values,
+                epoch_length=args.epoch_length,
+                max_epochs=args.max_epochs,
+                out_dir=out_dir,
+            )
+        finally:
+            values.close()
 
         for epoch_index, summary in summaries:
             epoch_summaries.setdefault(epoch_index, []).append(summary)
@@ -29,12 +29,51 @@ import json
 import hashlib
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Tuple
+
+from digest_cache import default_cache, file_stat
+
+EPOCH_BUNDLE_CACHE_KIND = "epoch_bundle"
 
 
 def sha256_hex(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+def epoch_bundle_integrity(bundle: dict) -> Tuple[str, int]:
+    """
+    (sha256_epoch_bundle, size_bytes): canonical JSON of the bundle with
+    its integrity fields blanked, as filled in by build_epoch_bundle.
+    """
+    unsealed = dict(bundle)
+    unsealed["integrity"] = {"sha256_epoch_bundle": "", "size_bytes": 0}
+    serialized = json.dumps(unsealed, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return sha256_hex(serialized), len(serialized)
+
+
+def verified_epoch_bundle_hash(path: Path, bundle: dict) -> str:
+    """
+    The bundle's sha256_epoch_bundle after checking it against the file
+    content; unchanged files are answered from the digest cache.
+    Raises ValueError on mismatch.
+    """
+    cache = default_cache()
+    stat = file_stat(path)
+    cached = cache.get(path, EPOCH_BUNDLE_CACHE_KIND, stat) if cache is not None else None
+    if cached is not None:
+        digest, size = cached
+    else:
+        digest, size = epoch_bundle_integrity(bundle)
+
+    integrity = bundle.get("integrity", {})
+    if integrity.get("sha256_epoch_bundle") != digest or integrity.get("size_bytes") != size:
+        raise ValueError(f"{path}: epoch bundle integrity mismatch")
+
+    if cached is None and cache is not None:
+        cache.put(path, digest, size, EPOCH_BUNDLE_CACHE_KIND, stat)
+    return digest
+
+
 def build_epoch_bundle(
     singularity_id: str,
     singularity_version: str,
@@ -63,9 +102,9 @@ def build_epoch_bundle(
     }
 
     # Compute integrity over canonical JSON
-    serialized = json.dumps(bundle, sort_keys=True, separators=(",", ":")).encode("utf-8")
-    bundle["integrity"]["sha256_epoch_bundle"] = sha256_hex(serialized)
-    bundle["integrity"]["size_bytes"] = len(serialized)
+    digest, size = epoch_bundle_integrity(bundle)
+    bundle["integrity"]["sha256_epoch_bundle"] = digest
+    bundle["integrity"]["size_bytes"] = size
 
     return bundle
 
@@ -133,6 +172,12 @@ def main() -> None:
     with output_path.open("w", encoding="utf-8") as f:
         json.dump(bundle, f, indent=2, sort_keys=True)
 
+    # spawn_relic verifies this file's integrity; it was just computed
+    cache = default_cache()
+    if cache is not None:
+        integrity = bundle["integrity"]
+        cache.put(output_path, integrity["sha256_epoch_bundle"], integrity["size_bytes"], EPOCH_BUNDLE_CACHE_KIND)
+
     print(f"[OK] Wrote epoch bundle → {output_path}")
 
 
@@ -1,103 +1,338 @@
 #!/usr/bin/env python3
 import argparse, json, os, hashlib, glob, sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
 # Ensure repo root importable
 sys.path.append(str(Path(__file__).resolve().parents[1]))
-from merkle import merkle_root
+from merkle import merkle_root, merkle_root_parallel
+from helix_ledger import record_heads
+
+EPOCH_GENESIS = "0" * 64
+
+def epoch_digest(ep: dict) -> str:
+    """Canonical digest of a sealed epoch (sorted keys, compact separators); chained via prev_epoch_digest."""
+    return hashlib.sha256(json.dumps(ep, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+def helix_commitment(heads) -> str:
+    """Commutative commitment over a lane's strand heads: SHA256 of the sorted raw digests."""
+    return hashlib.sha256(b"".join(sorted(bytes.fromhex(h) for h in heads))).hexdigest()
 
 def chiral_commitment(h_plus_hex: str, h_minus_hex: str) -> str:
-    a, b = sorted([bytes.fromhex(h_plus_hex), bytes.fromhex(h_minus_hex)])
-    return hashlib.sha256(a + b).hexdigest()
+    return helix_commitment([h_plus_hex, h_minus_hex])
 
-def _find_record_by_n(lane_path: Path, n_target: int):
-    if not lane_path.exists():
+def lane_snapshot(rec: dict) -> dict:
+    """Epoch snapshot of a lane head: h_plus/h_minus for chiral records, every strand head otherwise."""
+    if "h_plus" in rec:
+        return {"n": rec["n"], "h_plus": rec["h_plus"], "h_minus": rec["h_minus"]}
+    return {"n": rec["n"], "heads": record_heads(rec)}
+
+def snapshot_heads(snap: dict):
+    return [snap["h_plus"], snap["h_minus"]] if "h_plus" in snap else snap["heads"]
+
+def _line_at(f, off: int):
+    """First non-blank line starting at or after byte off -> (start, line); line is b"" at EOF."""
+    if off == 0:
+        f.seek(0)
+    else:
+        f.seek(off - 1)
+        f.readline()  # realign: finish the line containing off-1
+    while True:
+        start = f.tell()
+        line = f.readline()
+        if not line or line.strip():
+            return start, line
+
+def _bisect_first(path: Path, key, target):
+    """
+    Lines are sorted by key(rec) (e.g. n, appended in increasing order), so
+    bisect on byte offsets and parse only the probed lines: returns the first
+    record with key(rec) >= target in O(log N) json.loads, or None.
+    Invariant: lines starting before lo have key < target; the best match so
+    far starts at or after hi.
+    """
+    if not path.exists():
         return None
-    with lane_path.open("rb") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
+    best = None
+    with path.open("rb") as f:
+        lo, hi = 0, path.stat().st_size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start, line = _line_at(f, mid)
+            if not line or start >= hi:
+                hi = mid
                 continue
             rec = json.loads(line)
-            if rec.get("n") == n_target:
-                return rec
-    return None
+            if key(rec) < target:
+                lo = start + len(line)
+            else:
+                best, hi = rec, mid
+    return best
+
+def _find_record_by_n(lane_path: Path, n_target: int):
+    rec = _bisect_first(lane_path, lambda r: r.get("n"), n_target)
+    return rec if rec is not None and rec.get("n") == n_target else None
+
+def _read_last_record(path: Path, window: int = 8192):
+    """Last JSONL record of a non-empty file; the tail window grows until that record is complete."""
+    with path.open("rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        while True:
+            off = max(0, size - window)
+            f.seek(off)
+            tail = f.read().rstrip()
+            cut = tail.rfind(b"\n")
+            if cut >= 0 or off == 0:
+                return json.loads(tail[cut + 1:].decode())
+            window *= 4
+
+# ---- epoch registry: append-only epochs/registry.jsonl, one line per sealed epoch ----
+
+REGISTRY_PATH = Path("epochs/registry.jsonl")
+REGISTRY_LOCK = Path("epochs/registry.lock")
+
+class _registry_lock:
+    """Exclusive advisory lock on epochs/registry.lock (flock on POSIX, msvcrt on Windows)."""
+    def __enter__(self):
+        REGISTRY_LOCK.parent.mkdir(parents=True, exist_ok=True)
+        self.f = open(REGISTRY_LOCK, "a+b")
+        try:
+            import fcntl
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_EX)
+        except ImportError:
+            import msvcrt
+            self.f.seek(0)
+            msvcrt.locking(self.f.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+    def __exit__(self, *exc):
+        self.f.close()  # releases the lock
+
+def _registry_entry(ep: dict) -> dict:
+    return {"epoch": ep["epoch"], "digest": epoch_digest(ep), "merkle_root": ep["merkle_root"],
+            "lanes": {k: v["n"] for k, v in ep["lanes"].items()}}
+
+def _registry_append(entry: dict) -> None:
+    with REGISTRY_PATH.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, sort_keys=True, separators=(",", ":")) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def registry_latest():
+    """Last registry entry (tail read), or None if nothing is registered."""
+    if not REGISTRY_PATH.exists() or REGISTRY_PATH.stat().st_size == 0:
+        return None
+    return _read_last_record(REGISTRY_PATH, 65536)
+
+def registry_find(lane: str, n: int):
+    """First registered epoch whose snapshot of lane is at height >= n (lane heights only grow)."""
+    return _bisect_first(REGISTRY_PATH, lambda r: r["lanes"].get(lane, -1), n)
+
+def _registry_bootstrap() -> None:
+    """One-time migration: register epochs sealed before the registry existed (caller holds the lock)."""
+    if REGISTRY_PATH.exists():
+        return
+    eps = sorted((json.load(open(p)) for p in glob.glob("epochs/epoch-*.json")), key=lambda e: e["epoch"])
+    REGISTRY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = REGISTRY_PATH.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        for ep in eps:
+            f.write(json.dumps(_registry_entry(ep), sort_keys=True, separators=(",", ":")) + "\n")
+    os.replace(tmp, REGISTRY_PATH)
 
-def read_head_for_lane(lanes, lane_name):
+_LANES_CACHE = {}
+
+def load_lanes_config(path: str = "lanes.json"):
+    """Parsed lanes.json, re-read only when its mtime/size change."""
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _LANES_CACHE.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, json.load(open(path)))
+        _LANES_CACHE[path] = cached
+    return cached[1]
+
+def read_head_for_lane(lanes, lane_name, window: int = 8192):
     path = Path(lanes["lanes"][lane_name]["path"])
     if not path.exists() or path.stat().st_size == 0:
         raise SystemExit(f"lane '{lane_name}' has no records; run: scripts/hashhelix_tools.py init --lane {lane_name}")
-    with path.open("rb") as f:
-        f.seek(0, os.SEEK_END)
-        size = f.tell()
-        off = max(0, size - 8192)
-        f.seek(off)
-        tail = f.read().splitlines()
-        last = json.loads(tail[-1].decode())
-    return last
+    return _read_last_record(path, window)
+
+def read_lane_heads(lanes, workers: int):
+    """Head record of every lane in lanes.json order; tail reads run on a thread pool."""
+    names = list(lanes["lanes"])
+    if workers <= 1 or len(names) <= 1:
+        return {lane: read_head_for_lane(lanes, lane) for lane in names}
+    with ThreadPoolExecutor(max_workers=min(workers, len(names))) as pool:
+        return dict(zip(names, pool.map(lambda lane: read_head_for_lane(lanes, lane), names)))
 
 def cmd_seal(args):
-    lanes = json.load(open("lanes.json"))
-    lane_heads = {lane: read_head_for_lane(lanes, lane) for lane in lanes["lanes"]}
-    leaves = []
-    for _, last in lane_heads.items():
-        leaves += [bytes.fromhex(last["h_plus"]), bytes.fromhex(last["h_minus"])]
-    root = merkle_root(leaves).hex()
-    chiral = {lane: chiral_commitment(last["h_plus"], last["h_minus"]) for lane, last in lane_heads.items()}
-    epoch_idx = len(glob.glob("epochs/epoch-*.json")) + 1
-    epoch_path = Path(f"epochs/epoch-{epoch_idx:06d}.json")
-    epoch = {
-        "epoch": epoch_idx,
-        "lanes": {k: {"n": v["n"], "h_plus": v["h_plus"], "h_minus": v["h_minus"]} for k, v in lane_heads.items()},
-        "merkle_root": root,
-        "chiral_commitments": chiral
-    }
-    epoch_path.parent.mkdir(parents=True, exist_ok=True)
-    epoch_path.write_text(json.dumps(epoch, indent=2))
+    lanes = load_lanes_config()
+    with _registry_lock():
+        # Index allocation, head reads and the registry append happen under one lock,
+        # so concurrent sealers get distinct, correctly chained epochs.
+        _registry_bootstrap()
+        latest = registry_latest()
+        epoch_idx = 1 if latest is None else latest["epoch"] + 1
+        prev_digest = EPOCH_GENESIS if latest is None else latest["digest"]
+        lane_heads = read_lane_heads(lanes, args.io_workers)
+        leaves = []
+        snaps = {lane: lane_snapshot(last) for lane, last in lane_heads.items()}
+        for snap in snaps.values():
+            leaves += [bytes.fromhex(h) for h in snapshot_heads(snap)]
+        root = merkle_root_parallel(leaves, args.workers).hex()
+        chiral = {lane: helix_commitment(snapshot_heads(snap)) for lane, snap in snaps.items()}
+        epoch_path = Path(f"epochs/epoch-{epoch_idx:06d}.json")
+        epoch = {
+            "epoch": epoch_idx,
+            "prev_epoch_digest": prev_digest,
+            "lanes": snaps,
+            "merkle_root": root,
+            "chiral_commitments": chiral
+        }
+        epoch_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = epoch_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(epoch, indent=2))
+        os.replace(tmp, epoch_path)
+        _registry_append(_registry_entry(epoch))
     print(json.dumps({"sealed": epoch_idx, "merkle_root": root, "chiral": chiral}, indent=2))
 
+def cmd_latest(args):
+    latest = registry_latest()
+    if latest is None:
+        raise SystemExit("no epochs registered (epochs/registry.jsonl); run: scripts/epoch_tools.py seal")
+    print(json.dumps(latest, indent=2))
+
+def cmd_find(args):
+    entry = registry_find(args.lane, args.n)
+    if entry is None:
+        raise SystemExit(f"no registered epoch covers lane '{args.lane}' at n={args.n}")
+    print(json.dumps(entry, indent=2))
+
+def _scan_lane(job):
+    """One streaming pass over a lane: {n: strand heads} for every wanted n."""
+    lane_path, wanted = job
+    found, last = {}, max(wanted)
+    if not Path(lane_path).exists():
+        return found
+    with open(lane_path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            rec = json.loads(line)
+            n = rec.get("n")
+            if n in wanted:
+                found[n] = record_heads(rec)
+                if len(found) == len(wanted):
+                    break
+            elif isinstance(n, int) and n > last:
+                break  # records are sorted by n
+    return found
+
+def _check_epoch(job):
+    """Check one epoch snapshot against pre-fetched lane records; returns FAIL lines."""
+    ep_file, ep, records = job
+    fails, leaves = [], []
+    for lane_name, snap in ep["lanes"].items():
+        n_expected = snap["n"]; heads_expected = snapshot_heads(snap)
+        rec = records[lane_name].get(n_expected)
+        if rec is None:
+            fails.append(f"[FAIL] {ep_file}: lane {lane_name} has no record with n={n_expected}")
+            continue
+        if rec != heads_expected:
+            fails.append(f"[FAIL] {ep_file}: lane {lane_name} strand hash mismatch at n={n_expected}")
+        leaves += [bytes.fromhex(h) for h in heads_expected]
+        c_now = helix_commitment(heads_expected)
+        if c_now != ep["chiral_commitments"][lane_name]:
+            fails.append(f"[FAIL] {ep_file}: lane {lane_name} chiral commitment mismatch")
+    root_now = merkle_root(leaves).hex()
+    if root_now != ep["merkle_root"]:
+        fails.append(f"[FAIL] {ep_file}: merkle root mismatch")
+    return fails
+
+def _check_link(ep_file, ep, prev):
+    """prev_epoch_digest must equal the digest of epoch k-1 (genesis for k=1). Unchained legacy epochs pass."""
+    if "prev_epoch_digest" not in ep:
+        return []
+    if ep["epoch"] == 1:
+        expected = EPOCH_GENESIS
+    elif prev is None:
+        return [f"[FAIL] {ep_file}: previous epoch {ep['epoch'] - 1} not found for chain check"]
+    else:
+        expected = epoch_digest(prev)
+    if ep["prev_epoch_digest"] != expected:
+        return [f"[FAIL] {ep_file}: prev_epoch_digest does not match epoch {ep['epoch'] - 1}"]
+    return []
+
 def cmd_verify(args):
     """
     Verify epochs as immutable snapshots:
-      - For each epoch, read stored (n, h_plus, h_minus) per lane.
-      - Find the lane record with that exact n.
-      - Compare its h_plus/h_minus to the epoch snapshot.
-      - Rebuild the epoch's Merkle root from the epoch snapshot values.
+      - Sort epochs by index; check each prev_epoch_digest link.
+      - Collect every (lane, n) the epochs reference: one streaming pass per
+        lane (bisection lookups when verifying a single epoch).
+      - Compare strand heads to each snapshot and rebuild its Merkle root,
+        spread over --workers processes; output stays in epoch order.
     """
     ok = True
-    lanes_cfg = json.load(open("lanes.json"))
-    for ep_file in glob.glob(args.pattern):
-        ep = json.load(open(ep_file))
-        leaves = []
+    lanes_cfg = load_lanes_config()
+    epochs = sorted(((p, json.load(open(p))) for p in glob.glob(args.pattern)), key=lambda e: e[1]["epoch"])
+    if not epochs:
+        return
+
+    wanted = {}
+    for _, ep in epochs:
         for lane_name, snap in ep["lanes"].items():
-            n_expected = snap["n"]; hp_expected = snap["h_plus"]; hm_expected = snap["h_minus"]
-            lane_path = Path(lanes_cfg["lanes"][lane_name]["path"])
-            rec = _find_record_by_n(lane_path, n_expected)
-            if rec is None:
-                print(f"[FAIL] {ep_file}: lane {lane_name} has no record with n={n_expected}")
-                ok = False
-                continue
-            if rec.get("h_plus") != hp_expected or rec.get("h_minus") != hm_expected:
-                print(f"[FAIL] {ep_file}: lane {lane_name} strand hash mismatch at n={n_expected}")
-                ok = False
-            leaves += [bytes.fromhex(hp_expected), bytes.fromhex(hm_expected)]
-            c_now = chiral_commitment(hp_expected, hm_expected)
-            if c_now != ep["chiral_commitments"][lane_name]:
-                print(f"[FAIL] {ep_file}: lane {lane_name} chiral commitment mismatch")
-                ok = False
-        root_now = merkle_root(leaves).hex()
-        if root_now != ep["merkle_root"]:
-            print(f"[FAIL] {ep_file}: merkle root mismatch")
-            ok = False
+            wanted.setdefault(lane_name, set()).add(snap["n"])
+    lane_names = sorted(wanted)
+    lane_paths = [lanes_cfg["lanes"][lane]["path"] for lane in lane_names]
+
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        if len(epochs) == 1:
+            records = {}
+            for lane, path in zip(lane_names, lane_paths):
+                rec = _find_record_by_n(Path(path), next(iter(wanted[lane])))
+                records[lane] = {} if rec is None else {rec["n"]: record_heads(rec)}
         else:
-            print(f"[OK] {ep_file}")
+            jobs = [(path, wanted[lane]) for lane, path in zip(lane_names, lane_paths)]
+            scans = pool.map(_scan_lane, jobs) if pool else map(_scan_lane, jobs)
+            records = dict(zip(lane_names, scans))
+
+        jobs = []
+        for ep_file, ep in epochs:
+            # ship each worker only the records its epoch references
+            subset = {lane: {} for lane in ep["lanes"]}
+            for lane, snap in ep["lanes"].items():
+                if snap["n"] in records[lane]:
+                    subset[lane][snap["n"]] = records[lane][snap["n"]]
+            jobs.append((ep_file, ep, subset))
+        results = pool.map(_check_epoch, jobs, chunksize=max(1, len(jobs) // (args.workers * 8))) if pool else map(_check_epoch, jobs)
+
+        prev = None
+        for (ep_file, ep), fails in zip(epochs, results):
+            if prev is None or prev["epoch"] != ep["epoch"] - 1:
+                prev_path = Path(ep_file).with_name(f"epoch-{ep['epoch'] - 1:06d}.json")
+                prev = json.load(open(prev_path)) if prev_path.exists() else None
+            fails += _check_link(ep_file, ep, prev)
+            for line in fails:
+                print(line)
+            if fails:
+                ok = False
+            else:
+                print(f"[OK] {ep_file}")
+            prev = ep
+    finally:
+        if pool:
+            pool.shutdown()
     if not ok:
         raise SystemExit(1)
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     sub = ap.add_subparsers(dest="cmd", required=True)
-    s1 = sub.add_parser("seal");   s1.set_defaults(func=cmd_seal)
-    s2 = sub.add_parser("verify"); s2.add_argument("pattern"); s2.set_defaults(func=cmd_verify)
+    s1 = sub.add_parser("seal");   s1.add_argument("--io-workers", type=int, default=32); s1.add_argument("--workers", type=int, default=os.cpu_count() or 1); s1.set_defaults(func=cmd_seal)
+    s2 = sub.add_parser("verify"); s2.add_argument("pattern"); s2.add_argument("--workers", type=int, default=1); s2.set_defaults(func=cmd_verify)
+    s3 = sub.add_parser("latest"); s3.set_defaults(func=cmd_latest)
+    s4 = sub.add_parser("find");   s4.add_argument("--lane", required=True); s4.add_argument("--n", type=int, required=True); s4.set_defaults(func=cmd_find)
     args = ap.parse_args()
     args.func(args)
@@ -1,12 +1,10 @@
 #!/usr/bin/env python3
-import argparse, json, math, time, os, hashlib, struct
+import argparse, json, sys
 from pathlib import Path
 
-def sha256_hex(b: bytes) -> str:
-    return hashlib.sha256(b).hexdigest()
-
-def spiral_next(a_prev: int, n: int, phase: float) -> int:
-    return int(n * math.sin(a_prev + phase)) + 1
+# Ensure repo root importable
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from helix_ledger import HelixLedger
 
 def lane_path(lane: str) -> Path:
     lanes = json.loads(open("lanes.json").read())["lanes"]
@@ -23,41 +21,47 @@ def cmd_init(args):
         path.write_text(json.dumps({"lane": args.lane, "n": 0, "h": "0"*64}) + "\n")
         print(json.dumps({"lane": args.lane, "initialized": True}))
 
-def cmd_append(args):
-    data = args.data.encode()
-    data_bytes = data if len(data) <= 256 else hashlib.sha256(data).digest()
-    lanes = json.loads(open("lanes.json").read())["lanes"]
-    lane_config = lanes[args.lane]
-    path = Path(lane_config["path"])
-    lines = path.read_text().splitlines()
-    last = json.loads(lines[-1]) if lines else {"n": 0, "h": "0"*64}
-    n = last["n"] + 1
-    h_prev = last["h"]
-    a_prev = last.get("a", 1)
+def open_lane(lane: str) -> HelixLedger:
+    lane_config = json.loads(open("lanes.json").read())["lanes"][lane]
+    return HelixLedger(lane_config["path"], helices=lane_config.get("helices", 2))
 
-    num_helices = lane_config.get("helices", 2)
-    phases = [i * 2 * math.pi / num_helices for i in range(num_helices)]
+def cmd_append(args):
+    ledger = open_lane(args.lane)
+    ledger.append(args.data)
+    print(json.dumps({"lane": args.lane, "n": ledger.n, **ledger.head_hashes(), "helices": ledger.helices}))
 
-    record = {"n": n, "data": args.data, "helices": num_helices}
-    a = a_prev
-    h = h_prev.encode()
-    for i, phase in enumerate(phases):
-        a = spiral_next(a, n, phase)
-        h = sha256_hex(struct.pack(">Q", a) + data_bytes + h.encode())
-        record[f"a_helix_{i}"] = a
-        record[f"h_helix_{i}"] = h
+def iter_bulk_data(src, fmt: str):
+    """One data string per input line; with --format jsonl each line is a JSON value (strings kept, others dumped compact)."""
+    for line in src:
+        line = line.rstrip("\n")
+        if not line.strip():
+            continue
+        if fmt == "jsonl":
+            value = json.loads(line)
+            yield value if isinstance(value, str) else json.dumps(value, separators=(',', ':'))
+        else:
+            yield line
 
-    path.write_text(path.read_text() + json.dumps(record, separators=(',', ':')) + "\n")
-    print(json.dumps({"lane": args.lane, "n": n, "h": h, "helices": num_helices}))
+def cmd_bulk_append(args):
+    ledger = open_lane(args.lane)
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    try:
+        count = ledger.append_many(iter_bulk_data(src, args.format))
+    finally:
+        if src is not sys.stdin:
+            src.close()
+    print(json.dumps({"lane": args.lane, "appended": count, "n": ledger.n, **ledger.head_hashes(), "helices": ledger.helices}))
 
 def cmd_head(args):
-    path = lane_path(args.lane)
-    lines = path.read_text().splitlines()
-    if not lines:
-        print(json.dumps({"lane": args.lane, "n": 0, "h": "0"*64}))
-        return
-    last = json.loads(lines[-1])
-    print(json.dumps({"lane": args.lane, "n": last["n"], "h": last[f"h_helix_{last['helices']-1}"]}))
+    ledger = open_lane(args.lane)
+    print(json.dumps({"lane": args.lane, "n": ledger.n, **ledger.head_hashes()}))
+
+def cmd_verify(args):
+    ledger = open_lane(args.lane)
+    ok = ledger.verify()
+    print(json.dumps({"lane": args.lane, "verified": ok, "n": ledger.n}))
+    if not ok:
+        raise SystemExit(1)
 
 parser = argparse.ArgumentParser()
 sub = parser.add_subparsers()
@@ -68,9 +72,17 @@ append = sub.add_parser("append")
 append.add_argument("--lane", required=True)
 append.add_argument("--data", required=True)
 append.set_defaults(func=cmd_append)
+bulk = sub.add_parser("bulk-append")
+bulk.add_argument("--lane", required=True)
+bulk.add_argument("--input", default="-", help="file with one record per line (default: stdin)")
+bulk.add_argument("--format", choices=["lines", "jsonl"], default="lines")
+bulk.set_defaults(func=cmd_bulk_append)
 head = sub.add_parser("head")
 head.add_argument("--lane", required=True)
 head.set_defaults(func=cmd_head)
+verify = sub.add_parser("verify")
+verify.add_argument("--lane", required=True)
+verify.set_defaults(func=cmd_verify)
 
 args = parser.parse_args()
 args.func(args)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+HashHelix — Stage 6
+Directory batch runner for the hh_* artifact tools
+
+Walks a tree, runs one per-file function over every matching file in a
+process pool and writes a JSON-lines report, one record per file:
+
+    {"path": ..., "size": ..., "mtime_ns": ..., "options": {...},
+     "status": "ok" | "error", "result": {...} | "error": "...",
+     "output_size": ..., "output_mtime_ns": ...}
+
+Records are sorted by path. When the report already exists, a file is
+not reprocessed if an "ok" record matches its size and mtime_ns, was
+made with the same tool options, and (when the result names an
+"output" file) that output still has the recorded size and mtime_ns.
+Such records are carried into the new report as-is.
+"""
+
+import fnmatch
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+def iter_tree(root: Path, patterns: Sequence[str], exclude: Optional[Path] = None) -> Iterator[Path]:
+    """
+    Files under root whose name matches any pattern, in sorted order.
+    """
+    exclude = exclude.resolve() if exclude is not None else None
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if any(fnmatch.fnmatch(name, p) for p in patterns):
+                path = Path(dirpath) / name
+                if exclude is None or path.resolve() != exclude:
+                    yield path
+
+
+def load_report(report_path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    path → record for every "ok" record of a previous report.
+    """
+    previous: Dict[str, Dict[str, Any]] = {}
+    if not report_path.exists():
+        return previous
+    with report_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line of an interrupted run
+            if rec.get("status") == "ok":
+                previous[rec["path"]] = rec
+    return previous
+
+
+def output_stamp(result: Any) -> Optional[Tuple[int, int]]:
+    """
+    (size, mtime_ns) of the file named by result["output"], or None when
+    the result has no output or it is missing.
+    """
+    if not isinstance(result, dict) or "output" not in result:
+        return None
+    try:
+        st = os.stat(result["output"])
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _is_current(prev: Dict[str, Any], st: os.stat_result, options: Dict[str, Any]) -> bool:
+    if prev.get("size") != st.st_size or prev.get("mtime_ns") != st.st_mtime_ns:
+        return False
+    if prev.get("options") != options:
+        return False
+    if "output" in prev.get("result", {}):
+        return output_stamp(prev["result"]) == (prev.get("output_size"), prev.get("output_mtime_ns"))
+    return True
+
+
+def _run_one(job: Tuple[Callable[[Path], Dict[str, Any]], str]) -> Dict[str, Any]:
+    fn, path = job
+    try:
+        return {"status": "ok", "result": fn(Path(path))}
+    except Exception as e:
+        return {"status": "error", "error": f"{type(e).__name__}: {e}"}
+
+
+def run_batch(
+    root: Path,
+    patterns: Sequence[str],
+    fn: Callable[[Path], Dict[str, Any]],
+    report_path: Path,
+    workers: int = 1,
+    force: bool = False,
+    options: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Run fn over the tree and (re)write the report; fn must be picklable
+    (a module-level function or functools.partial of one). options are the
+    tool settings that shape fn's result or output (JSON-serializable);
+    records made with other options are reprocessed.
+
+    Returns (records, counts) with counts processed / unchanged / errors.
+    """
+    if not root.is_dir():
+        raise FileNotFoundError(f"Not a directory: {root}")
+
+    options = dict(options or {})
+    previous = {} if force else load_report(report_path)
+    records: List[Dict[str, Any]] = []
+    todo: List[Dict[str, Any]] = []
+    for path in iter_tree(root, patterns, exclude=report_path):
+        st = path.stat()
+        key = str(path)
+        prev = previous.get(key)
+        if prev is not None and _is_current(prev, st, options):
+            records.append(prev)
+            continue
+        rec = {"path": key, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "options": options}
+        records.append(rec)
+        todo.append(rec)
+
+    jobs = [(fn, rec["path"]) for rec in todo]
+    if workers > 1 and len(jobs) > 1:
+        chunksize = max(1, min(64, len(jobs) // (workers * 4)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = pool.map(_run_one, jobs, chunksize=chunksize)
+            for rec, outcome in zip(todo, outcomes):
+                rec.update(outcome)
+    else:
+        for rec, job in zip(todo, jobs):
+            rec.update(_run_one(job))
+
+    for rec in todo:
+        stamp = output_stamp(rec.get("result"))
+        if stamp is not None:
+            rec["output_size"], rec["output_mtime_ns"] = stamp
+
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = report_path.with_name(report_path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec, sort_keys=True) + "\n")
+    os.replace(tmp, report_path)
+
+    counts = {
+        "files": len(records),
+        "processed": len(todo),
+        "unchanged": len(records) - len(todo),
+        "errors": sum(1 for rec in todo if rec["status"] != "ok"),
+    }
+    return records, counts
+
+
+def add_batch_args(parser) -> None:
+    """
+    Shared --batch flags for the hh_* tools.
+    """
+    parser.add_argument("--batch", action="store_true", help="Treat the path as a directory and process it recursively.")
+    parser.add_argument("--report", default=None, help="JSON-lines report for --batch (default: <dir>.<tool>.jsonl next to the directory).")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Processes for --batch (default: CPU count).")
+    parser.add_argument("--force", action="store_true", help="With --batch, reprocess files unchanged since the last report.")
+
+
+def default_report_path(root: Path, tool: str) -> Path:
+    root = root.resolve()
+    return root.with_name(f"{root.name}.{tool}.jsonl")
+
+
+def print_batch_summary(tool: str, report_path: Path, counts: Dict[str, int]) -> None:
+    print(
+        f"[OK] {tool}: {counts['files']} files, {counts['processed']} processed, "
+        f"{counts['unchanged']} unchanged, {counts['errors']} errors → {report_path}"
+    )
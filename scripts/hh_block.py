@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+HashHelix — Stage 6
+Seekable block container (.hhz)
+
+Splits a byte stream into fixed-size blocks, compresses each block on
+its own (gzip, bz2 or lzma) and ends the file with a block index:
+
+- blocks are independent, so they compress / decompress in parallel
+  (the codecs release the GIL, so a thread pool scales across cores)
+- the index maps raw byte offsets to blocks, so any byte range can be
+  read by decompressing only the blocks that cover it
+- every block carries a CRC-32 of its raw bytes and the trailer the
+  SHA-256 of the whole raw stream
+
+Layout:
+    header   ">4sBBHI"     magic "HHBZ", version, codec, reserved, block_size
+    block*                 compressed payloads, back to back
+    index*   ">QQIII"      payload offset, raw offset, payload length,
+                           raw length, raw CRC-32
+    trailer  ">QIQ32s4s"   index offset, block count, raw size,
+                           raw SHA-256, "HHBI"
+"""
+
+import bisect
+import bz2
+import gzip
+import hashlib
+import lzma
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Callable, Deque, Iterable, Iterator, List, Optional, Tuple
+
+
+MAGIC = b"HHBZ"
+INDEX_MAGIC = b"HHBI"
+VERSION = 1
+
+HEADER = struct.Struct(">4sBBHI")
+INDEX_ENTRY = struct.Struct(">QQIII")
+TRAILER = struct.Struct(">QIQ32s4s")
+
+CODECS = {"none": 0, "gzip": 1, "bz2": 2, "lzma": 3}
+CODEC_NAMES = {v: k for k, v in CODECS.items()}
+
+DEFAULT_CODEC = "gzip"
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+BLOCK_SUFFIX = ".hhz"
+
+
+# ---------- Codecs ----------
+
+def _compress(codec: int, raw: bytes) -> bytes:
+    if codec == 1:
+        return gzip.compress(raw, mtime=0)
+    if codec == 2:
+        return bz2.compress(raw)
+    if codec == 3:
+        return lzma.compress(raw)
+    return raw
+
+
+def _decompress(codec: int, payload: bytes) -> bytes:
+    if codec == 1:
+        return gzip.decompress(payload)
+    if codec == 2:
+        return bz2.decompress(payload)
+    if codec == 3:
+        return lzma.decompress(payload)
+    return payload
+
+
+def _ordered_map(fn: Callable, items: Iterable, workers: int) -> Iterator:
+    """
+    map(fn, items) in order, with at most 2 * workers calls in flight.
+    """
+    if workers <= 1:
+        yield from map(fn, items)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: Deque = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# ---------- Writer ----------
+
+class BlockWriter:
+    """
+    File-like .hhz encoder: write() bytes, close() flushes the tail block
+    and the index. Full blocks are compressed on a thread pool while
+    later input is still arriving; output order is fixed, so the file is
+    identical for any worker count. Leaving a `with` block on an
+    exception calls abort() instead, so no complete-looking container is
+    left behind for partial input.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        codec: str = DEFAULT_CODEC,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        workers: int = 1,
+    ) -> None:
+        if codec not in CODECS:
+            raise ValueError(f"unknown codec: {codec!r} (expected one of {tuple(CODECS)})")
+        if not 0 < block_size < 1 << 32:
+            raise ValueError("block_size must be in 1..2**32-1")
+        self.path = Path(path)
+        self.codec = CODECS[codec]
+        self.block_size = block_size
+        self.workers = workers
+        self.size = 0
+        self._sha = hashlib.sha256()
+        self._buf = bytearray()
+        self._index: List[Tuple[int, int, int, int, int]] = []
+        self._pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        self._pending: Deque = deque()
+        self._f: Optional[BinaryIO] = self.path.open("wb")
+        self._f.write(HEADER.pack(MAGIC, VERSION, self.codec, 0, block_size))
+        self._offset = HEADER.size
+
+    @property
+    def block_count(self) -> int:
+        return len(self._index)
+
+    @property
+    def sha256(self) -> str:
+        """
+        SHA-256 of the raw bytes written so far.
+        """
+        return self._sha.hexdigest()
+
+    def write(self, data: bytes) -> int:
+        self._sha.update(data)
+        self._buf += data
+        while len(self._buf) >= self.block_size:
+            self._submit(bytes(self._buf[: self.block_size]))
+            del self._buf[: self.block_size]
+        return len(data)
+
+    def _encode(self, raw: bytes) -> Tuple[bytes, int, int]:
+        return _compress(self.codec, raw), len(raw), zlib.crc32(raw)
+
+    def _submit(self, raw: bytes) -> None:
+        if self._pool is None:
+            self._emit(self._encode(raw))
+            return
+        self._pending.append(self._pool.submit(self._encode, raw))
+        while len(self._pending) >= 2 * self.workers:
+            self._emit(self._pending.popleft().result())
+
+    def _emit(self, encoded: Tuple[bytes, int, int]) -> None:
+        assert self._f is not None
+        payload, raw_len, crc = encoded
+        self._f.write(payload)
+        self._index.append((self._offset, self.size, len(payload), raw_len, crc))
+        self._offset += len(payload)
+        self.size += raw_len
+
+    def close(self) -> None:
+        if self._f is None:
+            return
+        if self._buf:
+            self._submit(bytes(self._buf))
+            self._buf.clear()
+        while self._pending:
+            self._emit(self._pending.popleft().result())
+        if self._pool is not None:
+            self._pool.shutdown()
+        index_offset = self._offset
+        for entry in self._index:
+            self._f.write(INDEX_ENTRY.pack(*entry))
+        self._f.write(
+            TRAILER.pack(index_offset, len(self._index), self.size, self._sha.digest(), INDEX_MAGIC)
+        )
+        self._f.close()
+        self._f = None
+
+    def abort(self) -> None:
+        """
+        Discard the output: no index or trailer is written and the
+        partial file is removed.
+        """
+        if self._f is None:
+            return
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+        self._pending.clear()
+        self._f.close()
+        self._f = None
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "BlockWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+# ---------- Reader ----------
+
+class BlockReader:
+    """
+    Random-access .hhz decoder. Only the header, trailer and block index
+    are read up front; blocks are decompressed on demand.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            head = f.read(HEADER.size)
+            if len(head) != HEADER.size:
+                raise ValueError(f"{self.path}: not a block container (short header)")
+            magic, version, codec, _, block_size = HEADER.unpack(head)
+            if magic != MAGIC:
+                raise ValueError(f"{self.path}: not a block container (bad magic)")
+            if version != VERSION:
+                raise ValueError(f"{self.path}: unsupported block container version {version}")
+            if codec not in CODEC_NAMES:
+                raise ValueError(f"{self.path}: unknown codec id {codec}")
+
+            f.seek(0, 2)
+            size = f.tell()
+            if size < HEADER.size + TRAILER.size:
+                raise ValueError(f"{self.path}: truncated block container (missing index)")
+            f.seek(size - TRAILER.size)
+            index_offset, block_count, total, digest, index_magic = TRAILER.unpack(
+                f.read(TRAILER.size)
+            )
+            if index_magic != INDEX_MAGIC:
+                raise ValueError(f"{self.path}: truncated block container (missing index)")
+            f.seek(index_offset)
+            raw = f.read(block_count * INDEX_ENTRY.size)
+
+        self.codec = codec
+        self.block_size = block_size
+        self.size = total
+        self.sha256 = digest.hex()
+        self.index = [
+            INDEX_ENTRY.unpack_from(raw, i * INDEX_ENTRY.size)
+            for i in range(block_count)
+        ]
+        self._raw_offsets = [entry[1] for entry in self.index]
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def codec_name(self) -> str:
+        return CODEC_NAMES[self.codec]
+
+    def read_block(self, i: int) -> bytes:
+        offset, _, length, raw_len, crc = self.index[i]
+        with self.path.open("rb") as f:
+            f.seek(offset)
+            payload = f.read(length)
+        try:
+            raw = _decompress(self.codec, payload)
+        except (OSError, EOFError, lzma.LZMAError, zlib.error):
+            raise ValueError(f"{self.path}: block {i} is corrupt")
+        if len(raw) != raw_len or zlib.crc32(raw) != crc:
+            raise ValueError(f"{self.path}: block {i} failed its CRC check")
+        return raw
+
+    def iter_blocks(self, start: int = 0, workers: int = 1) -> Iterator[bytes]:
+        """
+        Decompressed blocks from block `start` on, in order; workers > 1
+        decompresses ahead on a thread pool.
+        """
+        return _ordered_map(self.read_block, range(start, len(self.index)), workers)
+
+    def read(self, offset: int, length: int) -> bytes:
+        """
+        Raw bytes [offset, offset + length), decompressing only the
+        blocks that cover them.
+        """
+        if offset < 0 or length < 0 or offset + length > self.size:
+            raise ValueError(f"range [{offset}, {offset + length}) outside 0..{self.size}")
+        if length == 0:
+            return b""
+        i = bisect.bisect_right(self._raw_offsets, offset) - 1
+        out = bytearray()
+        skip = offset - self._raw_offsets[i]
+        for raw in self.iter_blocks(i):
+            out += raw[skip:]
+            skip = 0
+            if len(out) >= length:
+                break
+        return bytes(out[:length])
+
+    def copy_to(self, out: BinaryIO, workers: int = 1) -> int:
+        """
+        Stream every block to `out`, checking the trailer SHA-256; returns
+        the raw size.
+        """
+        sha = hashlib.sha256()
+        for raw in self.iter_blocks(0, workers):
+            sha.update(raw)
+            out.write(raw)
+        if sha.hexdigest() != self.sha256:
+            raise ValueError(f"{self.path}: SHA-256 mismatch over decompressed data")
+        return self.size
+
+
+def is_block_file(path: Path) -> bool:
+    with Path(path).open("rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
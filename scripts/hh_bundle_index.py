@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+HashHelix — Stage 6
+Indexed bundle tool
+
+  build  rewrite a sealed .hhl bundle canonically with a lane index
+         (adds seal.lanes_root to bundles sealed before it existed)
+  get    load one lane artifact through the index and verify it against
+         seal.lanes_root without parsing the rest of the bundle
+"""
+
+import argparse
+import json
+import pathlib
+
+from sealing import (
+    artifact_digests,
+    canonical_sha256,
+    lanes_root,
+    read_indexed_lane,
+    write_indexed_bundle,
+)
+
+
+def build_index(bundle_path: pathlib.Path, out_path: pathlib.Path) -> pathlib.Path:
+    with bundle_path.open("r", encoding="utf-8") as f:
+        bundle = json.load(f)
+
+    seal = bundle.get("seal")
+    if not isinstance(seal, dict) or "bundle_hash" not in seal:
+        raise ValueError(f"{bundle_path}: bundle is not sealed")
+    core = {k: v for k, v in bundle.items() if k != "seal"}
+    if canonical_sha256(core) != seal["bundle_hash"]:
+        raise ValueError(f"{bundle_path}: bundle_hash mismatch")
+
+    root = lanes_root(artifact_digests(bundle["lane_artifacts"]))
+    if seal.setdefault("lanes_root", root) != root:
+        raise ValueError(f"{bundle_path}: lanes_root mismatch")
+
+    return write_indexed_bundle(bundle, out_path)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="HashHelix Stage 6 — Indexed bundle build / single-lane load."
+    )
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    build = sub.add_parser("build", help="Write a canonical bundle plus its lane index.")
+    build.add_argument("bundle", help="Sealed .hhl bundle (JSON).")
+    build.add_argument("--out", required=True, help="Output bundle path (index is written next to it).")
+
+    get = sub.add_parser("get", help="Load and verify one lane artifact.")
+    get.add_argument("bundle", help="Indexed bundle (its .index.json must exist).")
+    get.add_argument("--lane", type=int, required=True, help="laneId to load.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.cmd == "build":
+        index_path = build_index(pathlib.Path(args.bundle), pathlib.Path(args.out))
+        print(f"[OK] Wrote indexed bundle → {args.out}")
+        print(f"[OK] Wrote lane index → {index_path}")
+        return
+
+    result = read_indexed_lane(pathlib.Path(args.bundle), args.lane)
+    print(json.dumps(result, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,65 +1,243 @@
 #!/usr/bin/env python3
 
+import argparse
 import json
 import gzip
 import hashlib
 import pathlib
 import sys
 import os
+import time
+from functools import partial
 
+from sealing import canonical_digest
+from digest_cache import default_cache, file_stat
+from hh_block import BLOCK_SUFFIX, BlockReader, is_block_file
+from hh_batch import add_batch_args, default_report_path, print_batch_summary, run_batch
 
-def deterministic_bytes(data):
-    return json.dumps(
-        data,
-        sort_keys=True,
-        separators=(",", ":")
-    ).encode("utf-8")
 
+GZIP_MAGIC = b"\x1f\x8b"
+DECODE_CHUNK = 1 << 20
 
-def inspect_bundle(json_path):
+
+def _decoded_chunks(path, workers=1):
+    """
+    (format, decompressed byte chunks) for a plain, gzip or .hhz file.
+    """
+    if is_block_file(path):
+        return "hhz", BlockReader(path).iter_blocks(0, workers)
+    with open(path, "rb") as f:
+        is_gz = f.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+
+    def read_chunks(opener):
+        with opener(path, "rb") as f:
+            while True:
+                chunk = f.read(DECODE_CHUNK)
+                if not chunk:
+                    return
+                yield chunk
+
+    return ("gzip", read_chunks(gzip.open)) if is_gz else ("json", read_chunks(open))
+
+
+class _HashingReader:
+    """
+    Read-only file object over decoded chunks that hashes and counts
+    every byte handed out, so json.load() and the stream digest share
+    one pass.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buf = bytearray()
+        self.sha = hashlib.sha256()
+        self.size = 0
+
+    def _pull(self):
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+        self.sha.update(chunk)
+        self.size += len(chunk)
+        self._buf += chunk
+        return True
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            while self._pull():
+                pass
+            # json.loads takes a bytearray, so the document is held once
+            out, self._buf = self._buf, bytearray()
+            return out
+        while len(self._buf) < size and self._pull():
+            pass
+        out = bytes(self._buf[:size])
+        del self._buf[:size]
+        return out
+
+    def drain(self):
+        while self._pull():
+            self._buf.clear()
+
+
+def inspect_file(json_path, digest_only=False, workers=1, use_cache=True):
+    """
+    Inspect a .json, .json.gz or .hhz artifact in one streaming pass.
+
+    stream_sha256 is the SHA-256 of the decoded bytes (for .hhz checked
+    against the trailer). sha256 is always the canonical artifact digest:
+    the JSON is parsed straight from the stream for lane / epochs and
+    re-canonicalized, and `canonical` says whether the stored bytes
+    already were. digest_only skips the parse and reports only
+    stream_sha256 (sha256 is None); hh_compress outputs store canonical
+    bytes, so for them the two digests agree.
+
+    Both digests are kept in the digest cache under their own kinds
+    ("stream", "canonical"): a digest_only inspection of an unchanged
+    file is a stat() and a lookup, and a full one skips
+    re-canonicalizing. A cache hit never changes what is reported.
+    """
     json_path = pathlib.Path(json_path)
+    cache = default_cache() if use_cache else None
+    stat = file_stat(json_path)
 
-    if not json_path.exists():
-        print(f"[ERR] File not found: {json_path}")
-        sys.exit(1)
+    fmt, chunks = _decoded_chunks(json_path, workers)
+    cached_stream = cache.get(json_path, "stream", stat) if cache is not None and digest_only else None
 
-    # Load JSON
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    lane = None
+    epoch_count = None
+    sha = None
+    canonical = None
+    if cached_stream is not None:
+        stream_sha, raw_size = cached_stream
+        decode_sec = None
+    else:
+        stream = _HashingReader(chunks)
+        t0 = time.perf_counter()
+        if digest_only:
+            stream.drain()
+        else:
+            data = json.load(stream)
+        decode_sec = time.perf_counter() - t0
+        stream_sha, raw_size = stream.sha.hexdigest(), stream.size
 
-    # Deterministic bytes
-    dbytes = deterministic_bytes(data)
-    sha = hashlib.sha256(dbytes).hexdigest()
+        if fmt == "hhz" and stream_sha != BlockReader(json_path).sha256:
+            raise ValueError(f"{json_path}: SHA-256 mismatch over decompressed data")
+        if cache is not None:
+            cache.put(json_path, stream_sha, raw_size, "stream", stat)
 
-    # Check for gzip companion
-    gz_path = json_path.with_suffix(json_path.suffix + ".gz")
-    has_gz = gz_path.exists()
+    if not digest_only:
+        cached = cache.get(json_path, "canonical", stat) if cache is not None else None
+        if cached is not None:
+            sha = cached[0]
+        else:
+            # SHA-256 of the deterministic bytes, streamed
+            sha, canonical_size = canonical_digest(data)
+            if cache is not None:
+                cache.put(json_path, sha, canonical_size, "canonical", stat)
+        canonical = sha == stream_sha
 
-    # Sizes
-    size_json = os.path.getsize(json_path)
-    size_gz = os.path.getsize(gz_path) if has_gz else None
+        # Extract expected info if present
+        lane = data.get("lane", None)
+        epochs = data.get("epochs", [])
+        epoch_count = len(epochs) if isinstance(epochs, list) else 0
+        del data
 
-    # Extract expected info if present
-    lane = data.get("lane", None)
-    epochs = data.get("epochs", [])
-    epoch_count = len(epochs) if isinstance(epochs, list) else 0
+    info = {
+        "file": json_path.name,
+        "format": fmt,
+        "lane": lane,
+        "epochs": epoch_count,
+        "json_size": raw_size,
+        "sha256": sha,
+        "stream_sha256": stream_sha,
+        "canonical": canonical,
+    }
+
+    if fmt == "json":
+        # Check for compressed companions
+        for key, suffix in (("gz_size", ".gz"), ("hhz_size", BLOCK_SUFFIX)):
+            companion = json_path.with_suffix(json_path.suffix + suffix)
+            info[key] = os.path.getsize(companion) if companion.exists() else None
+    else:
+        size = os.path.getsize(json_path)
+        info["compressed_size"] = size
+        info["ratio"] = raw_size / size if size else None
+        info["decode_sec"] = decode_sec
+        info["decode_mb_per_sec"] = raw_size / decode_sec / 1e6 if decode_sec else None
+
+    return info
+
+
+def inspect_bundle(json_path, digest_only=False, workers=1, use_cache=True):
+    json_path = pathlib.Path(json_path)
+
+    if not json_path.exists():
+        print(f"[ERR] File not found: {json_path}")
+        sys.exit(1)
+
+    info = inspect_file(json_path, digest_only, workers, use_cache)
 
     print("=== Stage 6 Artifact Inspector ===")
-    print(f"File:         {json_path.name}")
-    print(f"Lane:         {lane}")
-    print(f"Epochs:       {epoch_count}")
-    print(f"JSON Size:    {size_json} bytes")
-    if has_gz:
-        print(f"GZIP Size:    {size_gz} bytes")
+    print(f"File:         {info['file']}")
+    print(f"Format:       {info['format']}")
+    if not digest_only:
+        print(f"Lane:         {info['lane']}")
+        print(f"Epochs:       {info['epochs']}")
+    print(f"JSON Size:    {info['json_size']} bytes")
+    if info["format"] == "json":
+        if info["gz_size"] is not None:
+            print(f"GZIP Size:    {info['gz_size']} bytes")
+        else:
+            print("GZIP Size:    (not found)")
+        if info["hhz_size"] is not None:
+            print(f"HHZ Size:     {info['hhz_size']} bytes")
+    else:
+        print(f"Stored Size:  {info['compressed_size']} bytes")
+        if info["ratio"] is not None:
+            print(f"Ratio:        {info['ratio']:.2f}x")
+        if info["decode_mb_per_sec"] is not None:
+            print(f"Decode:       {info['decode_sec']:.3f}s ({info['decode_mb_per_sec']:.1f} MB/s)")
+    if digest_only:
+        print(f"Stream SHA:   {info['stream_sha256']}")
     else:
-        print("GZIP Size:    (not found)")
-    print(f"SHA-256:      {sha}")
+        print(f"SHA-256:      {info['sha256']}")
+    if info["format"] != "json" and info["canonical"] is False:
+        print("[WARN] Stored bytes are not canonical; SHA-256 is over the canonical form.")
     print("==================================")
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="HashHelix Stage 6 — Artifact inspector.")
+    parser.add_argument("path", help="JSON artifact (.json, .json.gz or .hhz); a directory with --batch.")
+    parser.add_argument(
+        "--digest-only",
+        action="store_true",
+        help="Only hash the decoded stream (constant memory); reported as stream_sha256, not the canonical sha256.",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Threads decoding .hhz blocks.")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the digest cache (digest_cache.py).")
+    parser.add_argument(
+        "--pattern",
+        action="append",
+        default=None,
+        help="With --batch, file name pattern to inspect (repeatable, default: *.json, *.json.gz, *.hhz).",
+    )
+    add_batch_args(parser)
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: hh_bundle_inspect.py <path_to_json>")
-        sys.exit(1)
+    args = parse_args()
+
+    if args.batch:
+        root = pathlib.Path(args.path)
+        report = pathlib.Path(args.report) if args.report else default_report_path(root, "inspect")
+        # one file per process; .hhz blocks within a file stay serial
+        fn = partial(inspect_file, digest_only=args.digest_only, workers=1, use_cache=not args.no_cache)
+        patterns = args.pattern or ["*.json", "*.json.gz", "*" + BLOCK_SUFFIX]
+        _, counts = run_batch(root, patterns, fn, report, args.jobs, args.force, {"digest_only": args.digest_only})
+        print_batch_summary("inspect", report, counts)
+        sys.exit(1 if counts["errors"] else 0)
 
-    inspect_bundle(sys.argv[1])
+    inspect_bundle(args.path, args.digest_only, args.workers, not args.no_cache)
@@ -1,27 +1,46 @@
 #!/usr/bin/env python3
 
+import argparse
+import hashlib
 import json
 import gzip
+import os
+import shutil
 import sys
 import pathlib
+from functools import partial
 
-def deterministic_dump(data):
-    """
-    Deterministic JSON serializer:
-    - Sorted keys
-    - No extra whitespace
-    """
-    return json.dumps(
-        data,
-        sort_keys=True,
-        separators=(",", ":")
-    ).encode("utf-8")
+from sealing import write_canonical
+from hh_block import BLOCK_SUFFIX, CODECS, DEFAULT_BLOCK_SIZE, DEFAULT_CODEC, BlockWriter
+from hh_batch import add_batch_args, default_report_path, print_batch_summary, run_batch
+from digest_cache import default_cache, file_stat
 
-def compress_json(input_path):
+def require_file(input_path):
     input_path = pathlib.Path(input_path)
     if not input_path.exists():
         print(f"[ERR] File not found: {input_path}")
         sys.exit(1)
+    return input_path
+
+def compress_json(input_path):
+    output_path = compress_json_file(require_file(input_path))["output"]
+    print(f"[OK] Compressed → {pathlib.Path(output_path).name}")
+
+def record_canonical_digest(input_path, input_stat, output_path, digest, size):
+    """
+    The canonical digest was computed while writing: cache it for the
+    input and for the compressed copy (whose content is those bytes).
+    """
+    cache = default_cache()
+    if cache is None:
+        return
+    with cache.transaction():
+        cache.put(input_path, digest, size, "canonical", input_stat)
+        cache.put(output_path, digest, size, "canonical")
+
+def compress_json_file(input_path):
+    input_path = pathlib.Path(input_path)
+    input_stat = file_stat(input_path)
 
     # Output path (same name, but .json.gz)
     output_path = input_path.with_suffix(input_path.suffix + ".gz")
@@ -30,19 +49,97 @@ def compress_json(input_path):
     with open(input_path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    # Deterministic bytes
-    payload = deterministic_dump(data)
-
-    # GZIP
+    # GZIP the deterministic bytes, streamed
+    sha = hashlib.sha256()
     with gzip.open(output_path, "wb") as gz:
-        gz.write(payload)
+        size = write_canonical(data, gz, sha)
 
-    print(f"[OK] Compressed → {output_path.name}")
+    record_canonical_digest(input_path, input_stat, output_path, sha.hexdigest(), size)
+    return {
+        "output": str(output_path),
+        "raw_size": size,
+        "compressed_size": output_path.stat().st_size,
+        "sha256": sha.hexdigest(),
+    }
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: hh_compress.py <path_to_json>")
-        sys.exit(1)
+def compress_blocks(input_path, codec=DEFAULT_CODEC, block_size=DEFAULT_BLOCK_SIZE, workers=1, raw=False):
+    result = compress_blocks_file(require_file(input_path), codec, block_size, workers, raw)
+    print(
+        f"[OK] Compressed → {pathlib.Path(result['output']).name} "
+        f"({result['raw_size']} → {result['compressed_size']} bytes, {result['blocks']} blocks)"
+    )
+
+def compress_blocks_file(input_path, codec=DEFAULT_CODEC, block_size=DEFAULT_BLOCK_SIZE, workers=1, raw=False):
+    """
+    Seekable block container (.hhz), blocks compressed in parallel.
+    JSON inputs are stored as their deterministic bytes unless raw=True;
+    anything else (e.g. lane traces) is stored byte for byte.
+    """
+    input_path = pathlib.Path(input_path)
+    input_stat = file_stat(input_path)
+    output_path = input_path.with_suffix(input_path.suffix + BLOCK_SUFFIX)
+    canonical = input_path.suffix == ".json" and not raw
+
+    # Parse before the writer exists, so bad JSON never creates an output
+    if canonical:
+        with open(input_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+    with BlockWriter(output_path, codec=codec, block_size=block_size, workers=workers) as out:
+        if canonical:
+            write_canonical(data, out)
+        else:
+            with open(input_path, "rb") as f:
+                shutil.copyfileobj(f, out, block_size)
 
-    compress_json(sys.argv[1])
+    if canonical:
+        record_canonical_digest(input_path, input_stat, output_path, out.sha256, out.size)
+    return {
+        "output": str(output_path),
+        "raw_size": out.size,
+        "compressed_size": output_path.stat().st_size,
+        "blocks": out.block_count,
+        "sha256": out.sha256,
+    }
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="HashHelix Stage 6 — Compress an artifact.")
+    parser.add_argument("path", help="JSON artifact (or, with --format block, any file); a directory with --batch.")
+    parser.add_argument(
+        "--format",
+        choices=["gz", "block"],
+        default="gz",
+        help="gz: single gzip stream (.json.gz); block: seekable parallel blocks (.hhz).",
+    )
+    parser.add_argument("--codec", choices=[c for c in CODECS if c != "none"], default=DEFAULT_CODEC)
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE, help="Raw bytes per block.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--raw", action="store_true", help="Store JSON bytes as-is instead of canonical form.")
+    parser.add_argument(
+        "--pattern",
+        action="append",
+        default=None,
+        help="With --batch, file name pattern to compress (repeatable, default: *.json).",
+    )
+    add_batch_args(parser)
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.batch:
+        root = pathlib.Path(args.path)
+        report = pathlib.Path(args.report) if args.report else default_report_path(root, "compress")
+        if args.format == "gz":
+            fn = compress_json_file
+            options = {"format": "gz"}
+        else:
+            # one file per process; blocks within a file stay serial
+            fn = partial(compress_blocks_file, codec=args.codec, block_size=args.block_size, workers=1, raw=args.raw)
+            options = {"format": "block", "codec": args.codec, "block_size": args.block_size, "raw": args.raw}
+        _, counts = run_batch(root, args.pattern or ["*.json"], fn, report, args.jobs, args.force, options)
+        print_batch_summary("compress", report, counts)
+        sys.exit(1 if counts["errors"] else 0)
+    elif args.format == "gz":
+        compress_json(args.path)
+    else:
+        compress_blocks(args.path, args.codec, args.block_size, args.workers, args.raw)
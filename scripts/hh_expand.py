@@ -1,18 +1,42 @@
 #!/usr/bin/env python3
 
+import argparse
 import json
 import gzip
+import os
+import shutil
 import sys
 import pathlib
+from functools import partial
 
-def expand_json_gz(input_path):
+from sealing import write_canonical
+from hh_block import BLOCK_SUFFIX, BlockReader, is_block_file
+from hh_batch import add_batch_args, default_report_path, print_batch_summary, run_batch
+
+COPY_CHUNK = 1 << 20
+
+def require_file(input_path):
     input_path = pathlib.Path(input_path)
     if not input_path.exists():
         print(f"[ERR] File not found: {input_path}")
         sys.exit(1)
+    return input_path
 
+def expand_json_gz(input_path, validate=True):
+    input_path = require_file(input_path)
     if not input_path.name.endswith(".json.gz"):
         print(f"[WARN] Expected a .json.gz file, got: {input_path.name}")
+    output_path = expand_json_gz_file(input_path, validate)["output"]
+    print(f"[OK] Expanded → {pathlib.Path(output_path).name}")
+
+def expand_json_gz_file(input_path, validate=True):
+    """
+    Expand a .json.gz. By default the JSON is parsed from the gzip stream
+    and written back in canonical form (a truncated or corrupt input
+    fails before any output is written); validate=False copies the
+    decompressed bytes as they are.
+    """
+    input_path = pathlib.Path(input_path)
 
     # Output path: strip only the .gz
     if input_path.suffix == ".gz":
@@ -20,20 +44,92 @@ def expand_json_gz(input_path):
     else:
         output_path = input_path.with_suffix(".json")
 
-    with gzip.open(input_path, "rb") as gz:
-        raw = gz.read()
+    if validate:
+        # Validate JSON round-trip
+        with gzip.open(input_path, "rb") as gz:
+            data = json.load(gz)
+        with open(output_path, "wb") as f:
+            write_canonical(data, f)
+    else:
+        try:
+            with gzip.open(input_path, "rb") as gz, open(output_path, "wb") as f:
+                shutil.copyfileobj(gz, f, COPY_CHUNK)
+        except BaseException:
+            output_path.unlink(missing_ok=True)
+            raise
 
-    # Validate JSON round-trip
-    data = json.loads(raw.decode("utf-8"))
+    return {"output": str(output_path), "size": output_path.stat().st_size}
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, sort_keys=True, separators=(",", ":"))
+def expand_blocks(input_path, workers=1, validate=False):
+    result = expand_blocks_file(require_file(input_path), workers, validate)
+    print(f"[OK] Expanded → {pathlib.Path(result['output']).name} ({result['blocks']} blocks, {result['codec']})")
 
-    print(f"[OK] Expanded → {output_path.name}")
+def expand_blocks_file(input_path, workers=1, validate=False):
+    """
+    Expand a .hhz block container, decompressing blocks ahead on
+    `workers` threads; the trailer SHA-256 is checked at the end.
+    """
+    input_path = pathlib.Path(input_path)
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: hh_expand.py <path_to_json_gz>")
-        sys.exit(1)
+    if input_path.suffix == BLOCK_SUFFIX:
+        output_path = input_path.with_suffix("")
+    else:
+        output_path = input_path.with_suffix(input_path.suffix + ".out")
 
-    expand_json_gz(sys.argv[1])
+    reader = BlockReader(input_path)
+    try:
+        with open(output_path, "wb") as f:
+            reader.copy_to(f, workers)
+    except BaseException:
+        output_path.unlink(missing_ok=True)
+        raise
+
+    if validate:
+        validate_json(output_path)
+
+    return {"output": str(output_path), "size": reader.size, "blocks": len(reader.index), "codec": reader.codec_name}
+
+def expand_file(input_path, workers=1, validate=False, validate_gz=True):
+    if is_block_file(input_path):
+        return expand_blocks_file(input_path, workers, validate)
+    return expand_json_gz_file(input_path, validate_gz)
+
+def validate_json(path):
+    # Validate JSON round-trip
+    with open(path, "r", encoding="utf-8") as f:
+        json.load(f)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="HashHelix Stage 6 — Expand a compressed artifact.")
+    parser.add_argument("path", help=".json.gz or .hhz block container; a directory with --batch.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Threads for .hhz blocks.")
+    parser.add_argument("--validate", action="store_true", help="Also parse expanded .hhz output as JSON.")
+    parser.add_argument(
+        "--no-validate",
+        action="store_true",
+        help="Copy .json.gz bytes as-is instead of parsing and re-canonicalizing them.",
+    )
+    parser.add_argument(
+        "--pattern",
+        action="append",
+        default=None,
+        help="With --batch, file name pattern to expand (repeatable, default: *.json.gz and *.hhz).",
+    )
+    add_batch_args(parser)
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.batch:
+        root = pathlib.Path(args.path)
+        report = pathlib.Path(args.report) if args.report else default_report_path(root, "expand")
+        # one file per process; blocks within a file stay serial
+        fn = partial(expand_file, workers=1, validate=args.validate, validate_gz=not args.no_validate)
+        options = {"validate": args.validate, "validate_gz": not args.no_validate}
+        _, counts = run_batch(root, args.pattern or ["*.json.gz", "*" + BLOCK_SUFFIX], fn, report, args.jobs, args.force, options)
+        print_batch_summary("expand", report, counts)
+        sys.exit(1 if counts["errors"] else 0)
+    elif pathlib.Path(args.path).exists() and is_block_file(args.path):
+        expand_blocks(args.path, args.workers, args.validate)
+    else:
+        expand_json_gz(args.path, not args.no_validate)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+HashHelix — Stage 6
+Batch sealing
+
+Seals a directory (one *.json per lane) or JSONL manifest of lane results
+into lane artifacts across a process pool, then assembles them in laneId
+order into one indexed .hhl bundle (see hh_bundle_index.py) and reports
+per-stage timings. Lane result files unchanged since an earlier run reuse
+their artifact digest from the digest cache (digest_cache.py).
+"""
+
+import argparse
+import json
+import pathlib
+
+from sealing import seal_batch
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="HashHelix Stage 6 — Batch seal lane results into an indexed bundle."
+    )
+    parser.add_argument("source", help="Directory of lane result *.json files, or a JSONL manifest.")
+    parser.add_argument("--out", required=True, help="Output bundle path, e.g. artifacts/run.hhl.json")
+    parser.add_argument("--bundle-id", required=True)
+    parser.add_argument("--engine-version", default="v1.6")
+    parser.add_argument(
+        "--created-at",
+        default=None,
+        help="Pin the bundle timestamp (ISO-8601, UTC) for reproducible output.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes building / digesting artifacts (default: 1).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rehash every lane result instead of reusing digests of unchanged files.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the seal and timings as JSON.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    seal, timings = seal_batch(
+        pathlib.Path(args.source),
+        pathlib.Path(args.out),
+        bundle_id=args.bundle_id,
+        workers=args.workers,
+        created_at=args.created_at,
+        engine_version=args.engine_version,
+        use_cache=not args.no_cache,
+    )
+
+    if args.json:
+        print(json.dumps({"seal": seal, "timings": timings}, indent=2, sort_keys=True))
+        return
+
+    print(f"[OK] Sealed bundle → {args.out}")
+    print(f"[OK] bundle_hash = {seal['bundle_hash']}")
+    print(f"[OK] lanes_root  = {seal['lanes_root']}")
+    for stage in ("load_sec", "artifacts_sec", "bundle_sec", "write_sec", "total_sec"):
+        print(f"[TIME] {stage:<14} {timings[stage]:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
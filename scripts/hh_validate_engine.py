@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 
+import argparse
 import json
 import sys
 import pathlib
 
+from hh_batch import add_batch_args, default_report_path, print_batch_summary, run_batch
+
 # Keys that should NOT appear in engine-only artifacts
 FORBIDDEN_BUSINESS_KEYS = {
     "pricing",
@@ -19,51 +22,71 @@ FORBIDDEN_BUSINESS_KEYS = {
     "revenue",
 }
 
-def validate_engine_file(path):
+def forbidden_key_paths(obj, prefix=""):
+    """
+    Business-layer guard: dotted paths of forbidden keys anywhere in the tree.
+    """
+    problems = []
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            full = f"{prefix}.{k}" if prefix else k
+            if k.lower() in FORBIDDEN_BUSINESS_KEYS:
+                problems.append(full)
+            problems.extend(forbidden_key_paths(v, full))
+    elif isinstance(obj, list):
+        for i, v in enumerate(obj):
+            full = f"{prefix}[{i}]"
+            problems.extend(forbidden_key_paths(v, full))
+    return problems
+
+
+def check_engine_file(path):
+    """
+    Validation outcome without printing:
+    {"valid", "error", "typical_keys", "forbidden_keys"}.
+    """
     path = pathlib.Path(path)
-
-    if not path.exists():
-        print(f"[ERR] File not found: {path}")
-        return False
+    result = {"valid": False, "error": None, "typical_keys": None, "forbidden_keys": []}
 
     try:
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
     except Exception as e:
-        print(f"[ERR] JSON parse failed for {path}: {e}")
-        return False
+        result["error"] = f"JSON parse failed for {path}: {e}"
+        return result
 
     if not isinstance(data, dict):
-        print(f"[ERR] Top-level JSON must be an object: {path}")
-        return False
+        result["error"] = f"Top-level JSON must be an object: {path}"
+        return result
 
     # Simple sanity: must look like an engine artifact
-    top_keys = set(data.keys())
     required_like = {"lane", "epochs"}  # soft expectation, not hard schema
+    result["typical_keys"] = bool(required_like & set(data.keys()))
+
+    result["forbidden_keys"] = forbidden_key_paths(data)
+    result["valid"] = not result["forbidden_keys"]
+    return result
 
-    if not required_like & top_keys:
+
+def validate_engine_file(path):
+    path = pathlib.Path(path)
+
+    if not path.exists():
+        print(f"[ERR] File not found: {path}")
+        return False
+
+    result = check_engine_file(path)
+
+    if result["error"]:
+        print(f"[ERR] {result['error']}")
+        return False
+
+    if not result["typical_keys"]:
         print(f"[WARN] {path} does not contain typical engine keys (lane/epochs).")
 
-    # Business-layer guard: no forbidden keys anywhere in the tree
-    def walk(obj, prefix=""):
-        problems = []
-        if isinstance(obj, dict):
-            for k, v in obj.items():
-                full = f"{prefix}.{k}" if prefix else k
-                if k.lower() in FORBIDDEN_BUSINESS_KEYS:
-                    problems.append(full)
-                problems.extend(walk(v, full))
-        elif isinstance(obj, list):
-            for i, v in enumerate(obj):
-                full = f"{prefix}[{i}]"
-                problems.extend(walk(v, full))
-        return problems
-
-    bad_paths = walk(data)
-
-    if bad_paths:
+    if result["forbidden_keys"]:
         print(f"[ERR] Forbidden business keys found in {path}:")
-        for p in bad_paths:
+        for p in result["forbidden_keys"]:
             print(f"  - {p}")
         return False
 
@@ -71,13 +94,43 @@ def validate_engine_file(path):
     return True
 
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="HashHelix Stage 6 — Engine-only artifact validation.")
+    parser.add_argument("paths", nargs="+", help="JSON artifacts; directories with --batch.")
+    parser.add_argument(
+        "--pattern",
+        action="append",
+        default=None,
+        help="With --batch, file name pattern to validate (repeatable, default: *.json).",
+    )
+    add_batch_args(parser)
+    return parser.parse_args(argv)
+
+
 def main(argv):
     if len(argv) < 2:
         print("Usage: hh_validate_engine.py <path1.json> [path2.json ...]")
         return 1
 
+    args = parse_args(argv[1:])
+
     ok = True
-    for p in argv[1:]:
+    if args.batch:
+        if args.report and len(args.paths) > 1:
+            print("[ERR] --report takes a single directory")
+            return 1
+        for d in args.paths:
+            root = pathlib.Path(d)
+            report = pathlib.Path(args.report) if args.report else default_report_path(root, "validate")
+            records, counts = run_batch(root, args.pattern or ["*.json"], check_engine_file, report, args.jobs, args.force)
+            invalid = sum(1 for r in records if r["status"] == "ok" and not r["result"]["valid"])
+            print_batch_summary("validate", report, counts)
+            if counts["errors"] or invalid:
+                print(f"[ERR] {invalid} files failed engine-only validation (see {report})")
+                ok = False
+        return 0 if ok else 1
+
+    for p in args.paths:
         if not validate_engine_file(p):
             ok = False
 
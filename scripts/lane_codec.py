@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+HashHelix — Stage 8
+Lane Trace Codec (.hhlt)
+
+Compact, chunked container for lane traces (one integer per step):
+
+- Values are zigzag-delta encoded and packed as LEB128 varints
+- Each chunk is independently decodable (delta restarts at 0) and
+  optionally compressed with zlib or lzma
+- A trailing chunk index lets readers start decoding mid-file
+- Streaming encode (write as values are generated) and streaming
+  decode (chunk by chunk into array('q'))
+
+Layout:
+    header   ">4sBBHI"  magic "HHLT", version, codec, reserved, chunk_values
+    chunk*   ">II"      payload_len, value_count, then payload bytes
+    index*   ">QQI"     chunk offset, first step (1-based), value_count
+    trailer  ">QIQ4s"   index offset, chunk count, total values, "HHLI"
+
+Text traces (*.txt) remain supported everywhere; readers dispatch on the
+file suffix via iter_trace_values / lane_trace_path.
+
+Every trace written by the runtime also gets a laneXX.meta.json sidecar
+(step count, seed, seed stride, mode, size and the sequence_hash computed
+while writing), so length and integrity checks need not rescan the trace.
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import lzma
+import struct
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+MAGIC = b"HHLT"
+INDEX_MAGIC = b"HHLI"
+VERSION = 1
+
+HEADER = struct.Struct(">4sBBHI")
+CHUNK_HEADER = struct.Struct(">II")
+INDEX_ENTRY = struct.Struct(">QQI")
+TRAILER = struct.Struct(">QIQ4s")
+
+CODECS = {"none": 0, "zlib": 1, "lzma": 2}
+CODEC_NAMES = {v: k for k, v in CODECS.items()}
+
+DEFAULT_CODEC = "zlib"
+DEFAULT_CHUNK_VALUES = 65536
+
+TRACE_FORMATS = ("text", "hhlt")
+TRACE_SUFFIX = {"text": ".txt", "hhlt": ".hhlt"}
+
+
+# ---------- Varint helpers ----------
+
+def encode_chunk(values: Iterable[int]) -> bytes:
+    """
+    Zigzag-delta + varint encode one chunk (delta base resets to 0).
+    """
+    out = bytearray()
+    prev = 0
+    for v in values:
+        d = v - prev
+        prev = v
+        zz = d << 1 if d >= 0 else ((-d) << 1) - 1
+        while zz >= 0x80:
+            out.append((zz & 0x7F) | 0x80)
+            zz >>= 7
+        out.append(zz)
+    return bytes(out)
+
+
+def decode_chunk(data: bytes, count: int) -> array:
+    """
+    Inverse of encode_chunk. Returns exactly `count` values.
+    """
+    values = array("q")
+    prev = 0
+    zz = 0
+    shift = 0
+    for byte in data:
+        zz |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        d = zz >> 1 if not zz & 1 else -((zz + 1) >> 1)
+        prev += d
+        values.append(prev)
+        zz = 0
+        shift = 0
+    if len(values) != count or shift:
+        raise ValueError(
+            f"corrupt chunk: expected {count} values, decoded {len(values)}"
+        )
+    return values
+
+
+def _compress(codec: int, payload: bytes) -> bytes:
+    if codec == CODECS["zlib"]:
+        return zlib.compress(payload, 6)
+    if codec == CODECS["lzma"]:
+        return lzma.compress(payload, format=lzma.FORMAT_XZ)
+    return payload
+
+
+def _decompress(codec: int, payload: bytes) -> bytes:
+    if codec == CODECS["zlib"]:
+        return zlib.decompress(payload)
+    if codec == CODECS["lzma"]:
+        return lzma.decompress(payload, format=lzma.FORMAT_XZ)
+    return payload
+
+
+# ---------- Writers ----------
+
+class LaneTraceWriter:
+    """
+    Streaming .hhlt encoder. Values are buffered until a chunk fills,
+    then encoded and written; close() flushes the tail and the index.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        codec: str = DEFAULT_CODEC,
+        chunk_values: int = DEFAULT_CHUNK_VALUES,
+    ) -> None:
+        if codec not in CODECS:
+            raise ValueError(f"unknown codec: {codec!r} (expected one of {tuple(CODECS)})")
+        if chunk_values <= 0:
+            raise ValueError("chunk_values must be > 0")
+        self.path = Path(path)
+        self.codec = CODECS[codec]
+        self.chunk_values = chunk_values
+        self.count = 0
+        self._seq = hashlib.sha256()
+        self._buf: List[int] = []
+        self._index: List[Tuple[int, int, int]] = []
+        self._f: Optional[BinaryIO] = self.path.open("wb")
+        self._f.write(HEADER.pack(MAGIC, VERSION, self.codec, 0, chunk_values))
+
+    def write(self, value: int) -> None:
+        self._seq.update(f"{value}\n".encode("ascii"))
+        self._buf.append(value)
+        if len(self._buf) >= self.chunk_values:
+            self._flush_chunk()
+
+    def sequence_hash(self) -> str:
+        """
+        Running sequence_hash of everything written so far.
+        """
+        return self._seq.hexdigest()
+
+    def write_many(self, values: Iterable[int]) -> None:
+        for v in values:
+            self.write(v)
+
+    def _flush_chunk(self) -> None:
+        if not self._buf:
+            return
+        assert self._f is not None
+        payload = _compress(self.codec, encode_chunk(self._buf))
+        offset = self._f.tell()
+        self._f.write(CHUNK_HEADER.pack(len(payload), len(self._buf)))
+        self._f.write(payload)
+        self._index.append((offset, self.count + 1, len(self._buf)))
+        self.count += len(self._buf)
+        self._buf = []
+
+    def close(self) -> None:
+        if self._f is None:
+            return
+        self._flush_chunk()
+        index_offset = self._f.tell()
+        for entry in self._index:
+            self._f.write(INDEX_ENTRY.pack(*entry))
+        self._f.write(
+            TRAILER.pack(index_offset, len(self._index), self.count, INDEX_MAGIC)
+        )
+        self._f.close()
+        self._f = None
+
+    def __enter__(self) -> "LaneTraceWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TextTraceWriter:
+    """
+    Plain one-integer-per-line trace with the LaneTraceWriter interface.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.count = 0
+        self._seq = hashlib.sha256()
+        self._f = self.path.open("w", encoding="utf-8")
+
+    def write(self, value: int) -> None:
+        line = f"{value}\n"
+        self._f.write(line)
+        self._seq.update(line.encode("ascii"))
+        self.count += 1
+
+    def sequence_hash(self) -> str:
+        return self._seq.hexdigest()
+
+    def write_many(self, values: Iterable[int]) -> None:
+        for v in values:
+            self.write(v)
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "TextTraceWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_trace_writer(path: Path, trace_format: str = "text", codec: str = DEFAULT_CODEC):
+    if trace_format == "hhlt":
+        return LaneTraceWriter(path, codec=codec)
+    if trace_format == "text":
+        return TextTraceWriter(path)
+    raise ValueError(f"unknown trace format: {trace_format!r} (expected one of {TRACE_FORMATS})")
+
+
+def open_lane_trace_writer(
+    lane_dir: Path,
+    lane_id: int,
+    trace_format: str = "text",
+    codec: str = DEFAULT_CODEC,
+):
+    """
+    Open laneXX.txt / laneXX.hhlt for writing. A stale trace of the other
+    format is removed so lane_trace_path never picks up an old run.
+    """
+    if trace_format not in TRACE_FORMATS:
+        raise ValueError(f"unknown trace format: {trace_format!r} (expected one of {TRACE_FORMATS})")
+    for fmt, suffix in TRACE_SUFFIX.items():
+        if fmt != trace_format:
+            stale = lane_dir / f"lane{lane_id:02d}{suffix}"
+            if stale.exists():
+                stale.unlink()
+    path = lane_dir / f"lane{lane_id:02d}{TRACE_SUFFIX[trace_format]}"
+    return open_trace_writer(path, trace_format, codec)
+
+
+# ---------- Reader ----------
+
+class LaneTraceReader:
+    """
+    Random-access .hhlt decoder. Only the header, trailer and chunk index
+    are read up front; chunks are decoded on demand.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            head = f.read(HEADER.size)
+            if len(head) != HEADER.size:
+                raise ValueError(f"{self.path}: not a lane trace (short header)")
+            magic, version, codec, _, chunk_values = HEADER.unpack(head)
+            if magic != MAGIC:
+                raise ValueError(f"{self.path}: not a lane trace (bad magic)")
+            if version != VERSION:
+                raise ValueError(f"{self.path}: unsupported lane trace version {version}")
+            if codec not in CODEC_NAMES:
+                raise ValueError(f"{self.path}: unknown codec id {codec}")
+
+            f.seek(0, 2)
+            size = f.tell()
+            if size < HEADER.size + TRAILER.size:
+                raise ValueError(f"{self.path}: truncated lane trace (missing index)")
+            f.seek(size - TRAILER.size)
+            index_offset, chunk_count, total, index_magic = TRAILER.unpack(
+                f.read(TRAILER.size)
+            )
+            if index_magic != INDEX_MAGIC:
+                raise ValueError(f"{self.path}: truncated lane trace (missing index)")
+            f.seek(index_offset)
+            raw = f.read(chunk_count * INDEX_ENTRY.size)
+
+        self.codec = codec
+        self.chunk_values = chunk_values
+        self.total = total
+        self.index = [
+            INDEX_ENTRY.unpack_from(raw, i * INDEX_ENTRY.size)
+            for i in range(chunk_count)
+        ]
+        self._first_steps = [entry[1] for entry in self.index]
+
+    def __len__(self) -> int:
+        return self.total
+
+    def iter_chunks(self, start_step: int = 1) -> Iterator[array]:
+        """
+        Yield decoded chunks as array('q'), beginning at start_step
+        (1-based). The first chunk is trimmed to start exactly there.
+        """
+        if start_step < 1:
+            raise ValueError("start_step must be >= 1")
+        if start_step > self.total:
+            return
+        pos = bisect.bisect_right(self._first_steps, start_step) - 1
+        with self.path.open("rb") as f:
+            for offset, first_step, count in self.index[pos:]:
+                f.seek(offset)
+                payload_len, n_values = CHUNK_HEADER.unpack(f.read(CHUNK_HEADER.size))
+                if n_values != count:
+                    raise ValueError(f"{self.path}: chunk index mismatch at offset {offset}")
+                payload = _decompress(self.codec, f.read(payload_len))
+                values = decode_chunk(payload, count)
+                if first_step < start_step:
+                    values = values[start_step - first_step:]
+                yield values
+
+    def iter_values(self, start_step: int = 1) -> Iterator[int]:
+        for chunk in self.iter_chunks(start_step):
+            yield from chunk
+
+    def read_all(self) -> array:
+        out = array("q")
+        for chunk in self.iter_chunks():
+            out.extend(chunk)
+        return out
+
+
+# ---------- Format-agnostic helpers ----------
+
+def is_hhlt(path: Path) -> bool:
+    return Path(path).suffix == ".hhlt"
+
+
+def lane_trace_path(lane_dir: Path, lane_id: int) -> Path:
+    """
+    Path of lane XX in lane_dir: laneXX.hhlt if present, else laneXX.txt.
+    """
+    hhlt = lane_dir / f"lane{lane_id:02d}.hhlt"
+    if hhlt.exists():
+        return hhlt
+    return lane_dir / f"lane{lane_id:02d}.txt"
+
+
+def resolve_trace_path(path: Path) -> Path:
+    """
+    Return path, or its .hhlt sibling if only the encoded trace exists.
+    """
+    path = Path(path)
+    if not path.exists():
+        alt = path.with_suffix(".hhlt")
+        if alt.exists():
+            return alt
+    return path
+
+
+def iter_trace_values(path: Path, start_step: int = 1) -> Iterator[int]:
+    """
+    Stream integer values from a text or .hhlt lane trace.
+    """
+    path = Path(path)
+    if is_hhlt(path):
+        yield from LaneTraceReader(path).iter_values(start_step)
+        return
+    step = 0
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            step += 1
+            if step >= start_step:
+                yield int(line)
+
+
+def trace_length(path: Path) -> int:
+    """
+    Number of values in a trace (O(1) for .hhlt, a count of non-blank
+    lines for text, matching iter_trace_values).
+    """
+    path = Path(path)
+    if is_hhlt(path):
+        return len(LaneTraceReader(path))
+    with path.open("r", encoding="utf-8") as f:
+        return sum(1 for line in f if line.strip())
+
+
+# ---------- Sidecar metadata ----------
+
+def trace_meta_path(trace_path: Path) -> Path:
+    """
+    laneXX.txt / laneXX.hhlt → laneXX.meta.json
+    """
+    trace_path = Path(trace_path)
+    return trace_path.with_name(f"{trace_path.stem}.meta.json")
+
+
+def write_trace_meta(
+    writer,
+    *,
+    lane_id: int,
+    lane_seed: int,
+    seed: int,
+    seed_stride: int,
+    mode: str,
+) -> Path:
+    """
+    Write the sidecar for a closed trace writer.
+    """
+    path = writer.path
+    meta = {
+        "stage": 8,
+        "lane_id": lane_id,
+        "trace": path.name,
+        "trace_format": "hhlt" if is_hhlt(path) else "text",
+        "size_bytes": path.stat().st_size,
+        "steps": writer.count,
+        "seed": seed,
+        "seed_stride": seed_stride,
+        "lane_seed": lane_seed,
+        "mode": mode,
+        "sequence_hash": writer.sequence_hash(),
+    }
+    meta_path = trace_meta_path(path)
+    with meta_path.open("w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, sort_keys=True)
+    return meta_path
+
+
+def read_trace_meta(trace_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Sidecar for trace_path, or None if there is none or it describes a
+    different file (e.g. the other trace format).
+    """
+    meta_path = trace_meta_path(trace_path)
+    if not meta_path.exists():
+        return None
+    with meta_path.open("r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("trace") != Path(trace_path).name:
+        return None
+    return meta
+
+
+def trace_sequence_hash(path: Path) -> str:
+    """
+    Streaming rehash of a whole trace (deep audit).
+    """
+    h = hashlib.sha256()
+    for v in iter_trace_values(path):
+        h.update(f"{v}\n".encode("ascii"))
+    return h.hexdigest()
+
+
+# ---------- CLI ----------
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="HashHelix Stage 8 — Lane trace codec (text <-> .hhlt)."
+    )
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    enc = sub.add_parser("encode", help="Encode a text trace to .hhlt.")
+    enc.add_argument("input", help="Text trace (one integer per line).")
+    enc.add_argument("--out", default=None, help="Output path (default: input with .hhlt suffix).")
+    enc.add_argument("--codec", choices=sorted(CODECS), default=DEFAULT_CODEC)
+    enc.add_argument("--chunk-values", type=int, default=DEFAULT_CHUNK_VALUES)
+
+    dec = sub.add_parser("decode", help="Decode a .hhlt trace to text.")
+    dec.add_argument("input", help=".hhlt trace.")
+    dec.add_argument("--out", default=None, help="Output path (default: input with .txt suffix).")
+    dec.add_argument("--start-step", type=int, default=1)
+    return parser.parse_args()
+
+
+def _carry_meta(src: Path, writer) -> None:
+    """
+    After a format conversion in place, point the sidecar at the new trace.
+    """
+    meta = read_trace_meta(src)
+    if meta is None or trace_meta_path(writer.path) != trace_meta_path(src):
+        return
+    write_trace_meta(
+        writer,
+        lane_id=meta["lane_id"],
+        lane_seed=meta["lane_seed"],
+        seed=meta["seed"],
+        seed_stride=meta["seed_stride"],
+        mode=meta["mode"],
+    )
+
+
+def main() -> None:
+    args = parse_args()
+    src = Path(args.input)
+
+    if args.cmd == "encode":
+        dst = Path(args.out) if args.out else src.with_suffix(".hhlt")
+        with LaneTraceWriter(dst, codec=args.codec, chunk_values=args.chunk_values) as w:
+            w.write_many(iter_trace_values(src))
+        _carry_meta(src, w)
+        print(
+            f"[OK] Encoded {w.count:,} values → {dst} "
+            f"({src.stat().st_size:,} → {dst.stat().st_size:,} bytes)"
+        )
+    else:
+        dst = Path(args.out) if args.out else src.with_suffix(".txt")
+        with TextTraceWriter(dst) as w:
+            w.write_many(iter_trace_values(src, args.start_step))
+        if args.start_step == 1:
+            _carry_meta(src, w)
+        print(f"[OK] Decoded {w.count:,} values → {dst}")
+
+
+if __name__ == "__main__":
+    main()
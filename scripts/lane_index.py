@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+HashHelix — Stage 8
+Lane Range Index (.hhri)
+
+Built once per lane trace; answers count / sum / mean / min / max for any
+step interval [start_step, end_step] without touching the raw trace:
+
+- sum via an inclusive prefix-sum column (two lookups)
+- min / max via per-block prefix and suffix columns plus a sparse table
+  over block minima / maxima (at most five lookups)
+- intervals inside a single block scan at most block_size stored values
+
+Layout (little-endian, fixed-width):
+    header   "<4sHHIQ32s12x"  magic "HHRI", version, reserved, block_size,
+                              steps, trace sequence_hash (raw 32 bytes)
+    record*  "<6q"            per step: value, prefix_sum, block_prefix_min,
+                              block_prefix_max, block_suffix_min,
+                              block_suffix_max
+    table*   "<q"             sparse-table minima, level 0..top, then maxima
+
+The index is memory-mapped on open, so queries only page in the records
+they read. The stored sequence_hash ties the index to the trace it was
+built from (compare with laneXX.meta.json).
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from lane_codec import iter_trace_values, lane_trace_path, read_trace_meta
+
+
+MAGIC = b"HHRI"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHIQ32s12x")
+RECORD = struct.Struct("<6q")
+SLOT = struct.Struct("<q")
+
+DEFAULT_BLOCK_SIZE = 64
+
+INDEX_SUFFIX = ".hhri"
+
+
+# ---------- Layout helpers ----------
+
+def _table_levels(blocks: int) -> int:
+    return max(1, blocks.bit_length())
+
+
+def _level_offsets(blocks: int) -> List[int]:
+    """
+    Slot offset of each sparse-table level (level k has blocks - 2^k + 1 slots).
+    """
+    offsets = [0]
+    for k in range(_table_levels(blocks) - 1):
+        offsets.append(offsets[-1] + blocks - (1 << k) + 1)
+    return offsets
+
+
+def _to_le(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array("q", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+# ---------- Build ----------
+
+def build_range_index(
+    values: Iterable[int],
+    out_path: Path,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> int:
+    """
+    Stream values into an .hhri file; returns the number of steps indexed.
+
+    Memory is bounded by one block of records plus two ints per block.
+    """
+    if block_size < 1:
+        raise ValueError("block_size must be >= 1")
+
+    seq = hashlib.sha256()
+    block_min = array("q")
+    block_max = array("q")
+    steps = 0
+    total = 0
+    buf: List[int] = []
+
+    def flush(f) -> None:
+        nonlocal total
+        n = len(buf)
+        rec = array("q", bytes(RECORD.size * n))
+        lo = hi = buf[0]
+        for i, v in enumerate(buf):
+            total += v
+            if v < lo:
+                lo = v
+            if v > hi:
+                hi = v
+            base = 6 * i
+            rec[base] = v
+            rec[base + 1] = total
+            rec[base + 2] = lo
+            rec[base + 3] = hi
+        block_min.append(lo)
+        block_max.append(hi)
+        lo = hi = buf[-1]
+        for i in range(n - 1, -1, -1):
+            v = buf[i]
+            if v < lo:
+                lo = v
+            if v > hi:
+                hi = v
+            base = 6 * i
+            rec[base + 4] = lo
+            rec[base + 5] = hi
+        f.write(_to_le(rec))
+        buf.clear()
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with out_path.open("wb") as f:
+            f.write(bytes(HEADER.size))
+            for v in values:
+                seq.update(b"%d\n" % v)
+                buf.append(v)
+                steps += 1
+                if len(buf) == block_size:
+                    flush(f)
+            if buf:
+                flush(f)
+
+            mins, maxs = [block_min], [block_max]
+            for k in range(1, _table_levels(len(block_min))):
+                half = 1 << (k - 1)
+                lo_prev, hi_prev = mins[-1], maxs[-1]
+                width = len(lo_prev) - half
+                mins.append(array("q", (min(lo_prev[i], lo_prev[i + half]) for i in range(width))))
+                maxs.append(array("q", (max(hi_prev[i], hi_prev[i + half]) for i in range(width))))
+            for level in mins + maxs:
+                f.write(_to_le(level))
+
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, 0, block_size, steps, seq.digest()))
+    except OverflowError:
+        out_path.unlink()
+        raise ValueError(f"{out_path}: value or prefix sum exceeds int64")
+
+    return steps
+
+
+def range_index_path(trace_path: Path) -> Path:
+    """
+    laneXX.txt / laneXX.hhlt → laneXX.hhri
+    """
+    return trace_path.with_suffix(INDEX_SUFFIX)
+
+
+def build_lane_index(trace_path: Path, block_size: int = DEFAULT_BLOCK_SIZE) -> Path:
+    out_path = range_index_path(trace_path)
+    values = iter_trace_values(trace_path)
+    try:
+        build_range_index(values, out_path, block_size)
+    finally:
+        values.close()
+    return out_path
+
+
+# ---------- Query ----------
+
+class RangeIndex:
+    """
+    Read-only, memory-mapped view of an .hhri file.
+
+    Steps are 1-based and intervals inclusive, like epoch start_step /
+    end_step.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{self.path}: empty range index")
+
+        magic, version, _, block_size, steps, digest = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path}: not an .hhri range index")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path}: unsupported .hhri version {version}")
+
+        self.block_size = block_size
+        self.steps = steps
+        self.sequence_hash = digest.hex()
+
+        blocks = -(-steps // block_size)
+        self._offsets = _level_offsets(blocks)
+        table_slots = self._offsets[-1] + blocks - (1 << (len(self._offsets) - 1)) + 1
+        self._min_base = HEADER.size + RECORD.size * steps
+        self._max_base = self._min_base + SLOT.size * table_slots
+
+        if len(self._mm) != self._max_base + SLOT.size * table_slots:
+            self.close()
+            raise ValueError(f"{self.path}: truncated range index")
+
+    def __len__(self) -> int:
+        return self.steps
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "RangeIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _record(self, i: int) -> Tuple[int, int, int, int, int, int]:
+        return RECORD.unpack_from(self._mm, HEADER.size + RECORD.size * i)
+
+    def _table(self, base: int, level: int, block: int) -> int:
+        return SLOT.unpack_from(self._mm, base + SLOT.size * (self._offsets[level] + block))[0]
+
+    def value(self, step: int) -> int:
+        return self._record(step - 1)[0]
+
+    def query(self, start_step: int, end_step: int) -> Dict[str, float]:
+        """
+        count / sum / mean / min / max over steps start_step..end_step.
+        """
+        if not 1 <= start_step <= end_step <= self.steps:
+            raise ValueError(
+                f"interval [{start_step}, {end_step}] outside 1..{self.steps}"
+            )
+        i, j = start_step - 1, end_step - 1
+        first = self._record(i)
+        last = self._record(j)
+        count = j - i + 1
+        total = last[1] - first[1] + first[0]
+
+        bs = self.block_size
+        bi, bj = i // bs, j // bs
+        if bi == bj:
+            lo = hi = first[0]
+            for k in range(i + 1, j + 1):
+                v = self._record(k)[0]
+                if v < lo:
+                    lo = v
+                elif v > hi:
+                    hi = v
+        else:
+            lo = min(first[4], last[2])
+            hi = max(first[5], last[3])
+            if bj - bi > 1:
+                a, b = bi + 1, bj - 1
+                level = (b - a + 1).bit_length() - 1
+                c = b - (1 << level) + 1
+                lo = min(lo, self._table(self._min_base, level, a), self._table(self._min_base, level, c))
+                hi = max(hi, self._table(self._max_base, level, a), self._table(self._max_base, level, c))
+
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / float(count),
+            "min": lo,
+            "max": hi,
+        }
+
+    def epoch_stats(self, start_step: int, end_step: int) -> Dict[str, float]:
+        """
+        Same shape as epoch_auto.compute_epoch_stats.
+        """
+        q = self.query(start_step, end_step)
+        return {
+            "min": q["min"],
+            "max": q["max"],
+            "mean": q["mean"],
+        }
+
+    def iter_epochs(
+        self,
+        epoch_length: int,
+        max_epochs: int = 0,
+    ) -> Iterator[Tuple[int, Dict[str, float]]]:
+        """
+        (epoch_index, query) for every full epoch of the given length.
+        """
+        if epoch_length <= 0:
+            raise ValueError("epoch_length must be > 0")
+        epochs = self.steps // epoch_length
+        if max_epochs > 0:
+            epochs = min(epochs, max_epochs)
+        for e in range(1, epochs + 1):
+            start = (e - 1) * epoch_length + 1
+            yield e, self.query(start, start + epoch_length - 1)
+
+
+def open_range_index(trace_path: Path, check: bool = True) -> RangeIndex:
+    """
+    Open the index next to a trace. With check=True, the index must match
+    the trace's sidecar (steps + sequence_hash) when a sidecar exists.
+    """
+    index = RangeIndex(range_index_path(trace_path))
+    if check:
+        meta = read_trace_meta(trace_path)
+        if meta is not None and (
+            meta["steps"] != index.steps or meta["sequence_hash"] != index.sequence_hash
+        ):
+            index.close()
+            raise ValueError(f"{index.path}: stale range index for {trace_path}")
+    return index
+
+
+# ---------- CLI ----------
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="HashHelix Stage 8 — Lane range index (O(1) interval stats)."
+    )
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    build = sub.add_parser("build", help="Build laneXX.hhri next to each lane trace.")
+    build.add_argument("--lane-dir", default="data/runtime/lanes")
+    build.add_argument("--lanes", type=int, default=1, help="Number of lanes (default: 1).")
+    build.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+
+    query = sub.add_parser("query", help="Stats for one step interval.")
+    query.add_argument("trace", help="Lane trace (its .hhri must exist).")
+    query.add_argument("--start-step", type=int, required=True)
+    query.add_argument("--end-step", type=int, required=True)
+
+    epochs = sub.add_parser("epochs", help="Per-epoch stats for any epoch length.")
+    epochs.add_argument("trace", help="Lane trace (its .hhri must exist).")
+    epochs.add_argument("--epoch-length", type=int, required=True)
+    epochs.add_argument("--max-epochs", type=int, default=0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.cmd == "build":
+        lane_dir = Path(args.lane_dir)
+        for lane_id in range(1, args.lanes + 1):
+            trace_path = lane_trace_path(lane_dir, lane_id)
+            if not trace_path.exists():
+                raise FileNotFoundError(f"Missing lane trace: {trace_path}")
+            out_path = build_lane_index(trace_path, args.block_size)
+            print(f"[OK] Indexed {trace_path} → {out_path}")
+        return
+
+    with open_range_index(Path(args.trace)) as index:
+        if args.cmd == "query":
+            result = index.query(args.start_step, args.end_step)
+        else:
+            result = [
+                {"epoch_index": e, **q}
+                for e, q in index.iter_epochs(args.epoch_length, args.max_epochs)
+            ]
+    print(json.dumps(result, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
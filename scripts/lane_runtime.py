@@ -7,13 +7,34 @@ Purpose:
 - Deterministic recurrence execution
 - Multi-lane generation
 - Sequential and simulated-parallel modes
-- Raw lane traces only (one integer per line)
+- Optional NumPy engine for parallel mode (one vector call per step)
+- Raw lane traces: one integer per line, or compressed .hhlt (lane_codec.py)
 - No timestamps, no randomness → bit-for-bit reproducible
 """
 
 import argparse
 import math
 from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from lane_codec import (
+    CODECS,
+    DEFAULT_CODEC,
+    TRACE_FORMATS,
+    open_lane_trace_writer,
+    write_trace_meta,
+)
+
+try:
+    import numpy as np
+except ImportError:  # optional: only required for engine="numpy"
+    np = None
+
+
+ENGINES = ("python", "numpy")
+
+# Scalar cross-check cadence for the NumPy engine (every N-th step).
+DEFAULT_GUARD_INTERVAL = 1000
 
 
 def hh_step(prev_a: int, n: int) -> int:
@@ -26,28 +47,138 @@ def hh_step(prev_a: int, n: int) -> int:
     return math.floor(n * math.sin(prev_a + math.pi / n)) + 1
 
 
+def iter_lane_values(seed: int, steps: int) -> Iterator[int]:
+    """
+    Yield a single lane's values a_1..a_steps without touching disk.
+    """
+    a = int(seed)
+    yield a
+    for n in range(2, steps + 1):
+        a = hh_step(a, n)
+        yield a
+
+
+def iter_lanes_lockstep(
+    lanes: int,
+    steps: int,
+    seed: int,
+    seed_stride: int,
+    engine: str = "python",
+    guard_interval: int = DEFAULT_GUARD_INTERVAL,
+) -> Iterator[Tuple[int, List[int]]]:
+    """
+    Advance all lanes in lockstep and yield (n, lane_states) for n = 1..steps.
+
+    lane_states[k] is the value of lane k+1 at step n. The same list object
+    may be reused between yields; copy it if it must outlive the step.
+
+    engine="numpy" advances every lane with one vector call per step; see
+    _iter_lockstep_numpy for its exactness guarantees.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine: {engine!r} (expected one of {ENGINES})")
+    if engine == "numpy" and np is None:
+        raise RuntimeError("engine='numpy' requires NumPy (pip install numpy)")
+
+    lane_states = [
+        int(seed + (lane_id - 1) * seed_stride)
+        for lane_id in range(1, lanes + 1)
+    ]
+    if engine == "numpy":
+        return _iter_lockstep_numpy(lane_states, steps, guard_interval)
+    return _iter_lockstep_python(lane_states, steps)
+
+
+def _iter_lockstep_python(
+    lane_states: List[int],
+    steps: int,
+) -> Iterator[Tuple[int, List[int]]]:
+    yield 1, lane_states
+    for n in range(2, steps + 1):
+        for idx in range(len(lane_states)):
+            lane_states[idx] = hh_step(lane_states[idx], n)
+        yield n, lane_states
+
+
+def _iter_lockstep_numpy(
+    lane_states: List[int],
+    steps: int,
+    guard_interval: int,
+) -> Iterator[Tuple[int, List[int]]]:
+    """
+    Vectorised lockstep stepping over the lane axis.
+
+    np.sin is not guaranteed to round identically to math.sin, so:
+    - any lane whose n*sin(...) lands within a few ulps of an integer is
+      recomputed with hh_step (the only place floor() could disagree);
+    - every guard_interval-th step (and n=2) the whole vector is checked
+      against hh_step, raising RuntimeError on the first divergence.
+    """
+    prev = lane_states
+    yield 1, prev
+    if steps < 2:
+        return
+
+    a = np.array(prev, dtype=np.int64)
+    for n in range(2, steps + 1):
+        x = n * np.sin(a + math.pi / n)
+        fl = np.floor(x)
+        frac = x - fl
+        tol = n * 1e-12
+        a = fl.astype(np.int64) + 1
+
+        for idx in np.flatnonzero((frac < tol) | (frac > 1.0 - tol)).tolist():
+            a[idx] = hh_step(prev[idx], n)
+
+        states = a.tolist()
+        if n == 2 or (guard_interval > 0 and n % guard_interval == 0):
+            for idx, (got, prev_a) in enumerate(zip(states, prev)):
+                want = hh_step(prev_a, n)
+                if got != want:
+                    raise RuntimeError(
+                        f"numpy engine diverged from math.sin at n={n}, "
+                        f"lane {idx + 1}: numpy={got} scalar={want}"
+                    )
+        prev = states
+        yield n, states
+
+
 def generate_lane_sequential(
     lane_id: int,
     steps: int,
     seed: int,
     out_dir: Path,
+    trace_format: str = "text",
+    codec: str = DEFAULT_CODEC,
+    base_seed: Optional[int] = None,
+    seed_stride: int = 0,
 ) -> None:
     """
     Generate a single lane in sequential mode:
     - n counts from 1..steps for this lane only
-    - Output: one integer per line
+    - Output: one integer per line (or .hhlt if trace_format="hhlt")
+    - Sidecar laneXX.meta.json; base_seed/seed_stride describe the
+      multi-lane run this lane belongs to (default: this lane alone)
     """
     out_dir.mkdir(parents=True, exist_ok=True)
-    lane_path = out_dir / f"lane{lane_id:02d}.txt"
 
     a = int(seed)
-    with lane_path.open("w", encoding="utf-8") as f:
+    with open_lane_trace_writer(out_dir, lane_id, trace_format, codec) as f:
         # n = 1
-        f.write(f"{a}\n")
+        f.write(a)
         # n = 2..steps
         for n in range(2, steps + 1):
             a = hh_step(a, n)
-            f.write(f"{a}\n")
+            f.write(a)
+
+    write_trace_meta(
+        f,
+        lane_id=lane_id,
+        lane_seed=int(seed),
+        seed=int(seed) if base_seed is None else base_seed,
+        seed_stride=seed_stride,
+        mode="sequential",
+    )
 
 
 def generate_lanes_sequential(
@@ -56,6 +187,8 @@ def generate_lanes_sequential(
     seed: int,
     seed_stride: int,
     out_dir: Path,
+    trace_format: str = "text",
+    codec: str = DEFAULT_CODEC,
 ) -> None:
     """
     Sequential multi-lane:
@@ -69,6 +202,10 @@ def generate_lanes_sequential(
             steps=steps,
             seed=lane_seed,
             out_dir=out_dir,
+            trace_format=trace_format,
+            codec=codec,
+            base_seed=seed,
+            seed_stride=seed_stride,
         )
 
 
@@ -79,25 +216,31 @@ def generate_lanes_parallel(
     seed_stride: int,
     out_dir: Path,
     write_interleaved: bool = True,
+    engine: str = "python",
+    guard_interval: int = DEFAULT_GUARD_INTERVAL,
+    trace_format: str = "text",
+    codec: str = DEFAULT_CODEC,
 ) -> None:
     """
     Simulated parallel multi-lane:
     - All lanes advance in lockstep with the same n (global step index).
     - For each n, every lane takes one step.
+    - engine="numpy" advances all lanes per step in one vector call.
     - Produces:
-        - laneXX.txt for each lane
+        - laneXX.txt (or laneXX.hhlt) + laneXX.meta.json for each lane
         - (optional) lanes_interleaved.txt with: n, lane_id, value
     """
+    stepper = iter_lanes_lockstep(
+        lanes, steps, seed, seed_stride,
+        engine=engine, guard_interval=guard_interval,
+    )
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # Initialize per-lane state
-    lane_states = []
     lane_files = []
     for lane_id in range(1, lanes + 1):
-        lane_seed = seed + (lane_id - 1) * seed_stride
-        lane_states.append(int(lane_seed))
-        lane_path = out_dir / f"lane{lane_id:02d}.txt"
-        lane_files.append(lane_path.open("w", encoding="utf-8"))
+        lane_files.append(
+            open_lane_trace_writer(out_dir, lane_id, trace_format, codec)
+        )
 
     interleaved_file = None
     if write_interleaved:
@@ -105,24 +248,11 @@ def generate_lanes_parallel(
         interleaved_file = interleaved_path.open("w", encoding="utf-8")
 
     try:
-        # n = 1
-        n = 1
-        for lane_id in range(1, lanes + 1):
-            a = lane_states[lane_id - 1]
-            lane_files[lane_id - 1].write(f"{a}\n")
-            if interleaved_file is not None:
-                interleaved_file.write(f"{n},{lane_id},{a}\n")
-
-        # n = 2..steps
-        for n in range(2, steps + 1):
-            for lane_id in range(1, lanes + 1):
-                idx = lane_id - 1
-                prev_a = lane_states[idx]
-                a = hh_step(prev_a, n)
-                lane_states[idx] = a
-                lane_files[idx].write(f"{a}\n")
+        for n, lane_states in stepper:
+            for idx, a in enumerate(lane_states):
+                lane_files[idx].write(a)
                 if interleaved_file is not None:
-                    interleaved_file.write(f"{n},{lane_id},{a}\n")
+                    interleaved_file.write(f"{n},{idx + 1},{a}\n")
 
     finally:
         for f in lane_files:
@@ -130,6 +260,16 @@ def generate_lanes_parallel(
         if interleaved_file is not None:
             interleaved_file.close()
 
+    for lane_id, f in enumerate(lane_files, start=1):
+        write_trace_meta(
+            f,
+            lane_id=lane_id,
+            lane_seed=seed + (lane_id - 1) * seed_stride,
+            seed=seed,
+            seed_stride=seed_stride,
+            mode="parallel",
+        )
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -182,6 +322,33 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Disable lanes_interleaved.txt in parallel mode.",
     )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="python",
+        help="Stepping engine for parallel mode (default: python).",
+    )
+    parser.add_argument(
+        "--guard-interval",
+        type=int,
+        default=DEFAULT_GUARD_INTERVAL,
+        help=(
+            "NumPy engine: cross-check every N-th step against math.sin "
+            f"(0 = only n=2; default: {DEFAULT_GUARD_INTERVAL})."
+        ),
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=TRACE_FORMATS,
+        default="text",
+        help="Lane trace format: text (laneXX.txt) or hhlt (laneXX.hhlt) (default: text).",
+    )
+    parser.add_argument(
+        "--codec",
+        choices=sorted(CODECS),
+        default=DEFAULT_CODEC,
+        help=f"Per-chunk compression for hhlt traces (default: {DEFAULT_CODEC}).",
+    )
     return parser.parse_args()
 
 
@@ -193,6 +360,8 @@ def main() -> None:
         raise ValueError("lanes must be >= 1")
     if args.steps < 1:
         raise ValueError("steps must be >= 1")
+    if args.engine != "python" and args.mode != "parallel":
+        raise ValueError("--engine numpy requires --mode parallel")
 
     if args.mode == "sequential":
         generate_lanes_sequential(
@@ -201,6 +370,8 @@ def main() -> None:
             seed=args.seed,
             seed_stride=args.seed_stride,
             out_dir=out_dir,
+            trace_format=args.trace_format,
+            codec=args.codec,
         )
     else:
         generate_lanes_parallel(
@@ -210,6 +381,10 @@ def main() -> None:
             seed_stride=args.seed_stride,
             out_dir=out_dir,
             write_interleaved=not args.no_interleaved,
+            engine=args.engine,
+            guard_interval=args.guard_interval,
+            trace_format=args.trace_format,
+            codec=args.codec,
         )
 
 
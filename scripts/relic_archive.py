@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+HashHelix — Stage 8
+Relic Archive (relic-of-relics aggregation)
+
+Builds a fixed fan-out Merkle hierarchy over the relics in a relic
+directory and answers inclusion proofs for single lane epochs:
+
+    lane epoch merkle_root
+      → epoch bundle root   (relic.epoch_bundles[k].bundle_merkle_root)
+      → relic root          (relic.aggregate.relic_merkle_root)
+      → super-relic node    (archive/node-L01-XXXXXX.json)
+      → ...                 (node-L02, node-L03, ...)
+      → archive root        (archive/archive_root.json)
+
+Each node lists at most `fanout` children (id, merkle_root, epoch range).
+Adding relics only rewrites the nodes on the path from the changed
+relics to the root, and a proof reads one relic plus one node per level.
+
+Merkle rules match relic_auto.py: leaves are the hex roots themselves,
+pairs are SHA256(left || right), the odd node of a layer is duplicated.
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+ARCHIVE_DIR = "archive"
+ARCHIVE_ROOT_NAME = "archive_root.json"
+DEFAULT_FANOUT = 16
+
+
+# ---------- Merkle paths ----------
+
+def merkle_layers_from_hex(values: List[str]) -> List[List[bytes]]:
+    """
+    All layers of the Merkle tree over hex-encoded leaves, leaves first.
+    """
+    if not values:
+        return [[hashlib.sha256(b"").digest()]]
+
+    layer = [bytes.fromhex(v) for v in values]
+    layers = [layer]
+    while len(layer) > 1:
+        next_layer: List[bytes] = []
+        for i in range(0, len(layer), 2):
+            left = layer[i]
+            right = layer[i + 1] if i + 1 < len(layer) else left
+            next_layer.append(hashlib.sha256(left + right).digest())
+        layer = next_layer
+        layers.append(layer)
+    return layers
+
+
+def merkle_path_from_hex(values: List[str], index: int) -> List[List[str]]:
+    """
+    Sibling path for values[index]: [side, sibling_hex] per layer, where
+    side "R" means the sibling is hashed on the right.
+    """
+    if not 0 <= index < len(values):
+        raise ValueError(f"leaf index {index} outside 0..{len(values) - 1}")
+
+    path: List[List[str]] = []
+    for layer in merkle_layers_from_hex(values)[:-1]:
+        if index % 2 == 0:
+            sibling = layer[index + 1] if index + 1 < len(layer) else layer[index]
+            path.append(["R", sibling.hex()])
+        else:
+            path.append(["L", layer[index - 1].hex()])
+        index //= 2
+    return path
+
+
+def fold_merkle_path(leaf: str, path: List[List[str]]) -> str:
+    node = bytes.fromhex(leaf)
+    for side, sibling in path:
+        other = bytes.fromhex(sibling)
+        if side == "R":
+            node = hashlib.sha256(node + other).digest()
+        elif side == "L":
+            node = hashlib.sha256(other + node).digest()
+        else:
+            raise ValueError(f"invalid path side: {side!r}")
+    return node.hex()
+
+
+# ---------- Archive tree ----------
+
+def node_id(level: int, index: int) -> str:
+    return f"node-L{level:02d}-{index:06d}"
+
+
+def _levels_for(count: int, fanout: int) -> int:
+    levels = 1
+    width = -(-count // fanout)
+    while width > 1:
+        width = -(-width // fanout)
+        levels += 1
+    return levels
+
+
+class RelicArchive:
+    """
+    Incrementally maintained relic-of-relics hierarchy under
+    <relic_dir>/archive/.
+
+    Usage: add() every relic (in relic_index order, new or unchanged),
+    then commit(). Only nodes whose children changed are rewritten.
+    An archive built with a different fanout or epochs_per_relic is
+    discarded and rebuilt from the relics added in this session.
+    """
+
+    def __init__(
+        self,
+        relic_dir: Path,
+        epochs_per_relic: int,
+        fanout: int = DEFAULT_FANOUT,
+    ) -> None:
+        if fanout < 2:
+            raise ValueError("fanout must be >= 2")
+        self.relic_dir = Path(relic_dir)
+        self.dir = self.relic_dir / ARCHIVE_DIR
+        self.fanout = fanout
+        self.epochs_per_relic = epochs_per_relic
+        self.count = 0
+
+        self._nodes: Dict[Tuple[int, int], Dict] = {}
+        self._dirty: set = set()
+
+        meta = load_archive_root(self.relic_dir)
+        if meta is not None and (
+            meta["fanout"] == fanout and meta["epochs_per_relic"] == epochs_per_relic
+        ):
+            self.count = meta["relic_count"]
+        elif self.dir.exists():
+            for stale in self.dir.glob("node-L*.json"):
+                stale.unlink()
+
+    def _node_path(self, level: int, index: int) -> Path:
+        return self.dir / f"{node_id(level, index)}.json"
+
+    def _node(self, level: int, index: int) -> Dict:
+        key = (level, index)
+        node = self._nodes.get(key)
+        if node is None:
+            path = self._node_path(level, index)
+            if path.exists():
+                with path.open("r", encoding="utf-8") as f:
+                    node = json.load(f)
+            else:
+                node = {"children": []}
+            self._nodes[key] = node
+        return node
+
+    def _set_child(self, level: int, index: int, slot: int, child: Dict) -> None:
+        node = self._node(level, index)
+        children = node["children"]
+        if slot < len(children):
+            if children[slot] == child:
+                return
+            children[slot] = child
+        elif slot == len(children):
+            children.append(child)
+        else:
+            raise ValueError(
+                f"{node_id(level, index)}: child slot {slot} added before slot {len(children)}"
+            )
+        self._dirty.add((level, index))
+
+    def add(self, relic_obj: Dict) -> None:
+        """
+        Register one relic (new or unchanged) at its relic_index.
+        """
+        position = relic_obj["relic_index"] - 1
+        child = {
+            "id": relic_obj["relic_id"],
+            "merkle_root": relic_obj["aggregate"]["relic_merkle_root"],
+            "epoch_start": relic_obj["epoch_start"],
+            "epoch_end": relic_obj["epoch_end"],
+        }
+        self._set_child(1, position // self.fanout, position % self.fanout, child)
+        self.count = max(self.count, position + 1)
+
+    def commit(self) -> Optional[str]:
+        """
+        Rewrite dirty nodes bottom-up and the archive root; returns the
+        archive root (None if no relics were ever added).
+        """
+        if self.count == 0:
+            return None
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        levels = _levels_for(self.count, self.fanout)
+
+        for level in range(1, levels + 1):
+            dirty = sorted(idx for lvl, idx in self._dirty if lvl == level)
+            for index in dirty:
+                node = self._node(level, index)
+                children = node["children"]
+                node.update(
+                    {
+                        "stage": 8,
+                        "node_id": node_id(level, index),
+                        "level": level,
+                        "index": index,
+                        "epoch_start": children[0]["epoch_start"],
+                        "epoch_end": children[-1]["epoch_end"],
+                        "merkle_root": merkle_layers_from_hex(
+                            [c["merkle_root"] for c in children]
+                        )[-1][0].hex(),
+                    }
+                )
+                with self._node_path(level, index).open("w", encoding="utf-8") as f:
+                    json.dump(node, f, indent=2, sort_keys=True)
+
+            if level < levels:
+                # Refresh each affected parent in slot order. Parents created
+                # by tree growth also pick up their older, unchanged children.
+                width = -(-self.count // self.fanout ** level)
+                for parent in sorted({index // self.fanout for index in dirty}):
+                    known = len(self._node(level + 1, parent)["children"])
+                    first = parent * self.fanout
+                    for child_index in range(first, min(first + self.fanout, width)):
+                        slot = child_index - first
+                        if slot < known and (level, child_index) not in self._dirty:
+                            continue
+                        child = self._node(level, child_index)
+                        self._set_child(
+                            level + 1,
+                            parent,
+                            slot,
+                            {
+                                "id": child["node_id"],
+                                "merkle_root": child["merkle_root"],
+                                "epoch_start": child["epoch_start"],
+                                "epoch_end": child["epoch_end"],
+                            },
+                        )
+
+        top = self._node(levels, 0)
+        meta = {
+            "stage": 8,
+            "fanout": self.fanout,
+            "epochs_per_relic": self.epochs_per_relic,
+            "relic_count": self.count,
+            "levels": levels,
+            "top_node": node_id(levels, 0),
+            "epoch_start": top["epoch_start"],
+            "epoch_end": top["epoch_end"],
+            "archive_root": top["merkle_root"],
+        }
+        with (self.dir / ARCHIVE_ROOT_NAME).open("w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2, sort_keys=True)
+
+        self._dirty.clear()
+        return meta["archive_root"]
+
+
+def load_archive_root(relic_dir: Path) -> Optional[Dict]:
+    path = Path(relic_dir) / ARCHIVE_DIR / ARCHIVE_ROOT_NAME
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ---------- Proofs ----------
+
+def _covering_child(children: List[Dict], epoch_index: int) -> Tuple[int, Dict]:
+    for pos, child in enumerate(children):
+        if child["epoch_start"] <= epoch_index <= child["epoch_end"]:
+            return pos, child
+    raise ValueError(f"epoch {epoch_index} is not covered by the archive")
+
+
+def prove_epoch(relic_dir: Path, epoch_index: int, merkle_root: str) -> Dict:
+    """
+    Inclusion proof for one lane epoch (identified by its merkle_root).
+
+    Reads archive_root.json, one node per level and one relic JSON.
+    Each step folds the previous root through a sibling path; the last
+    step must land on archive_root.
+    """
+    relic_dir = Path(relic_dir)
+    meta = load_archive_root(relic_dir)
+    if meta is None:
+        raise FileNotFoundError(f"No relic archive in {relic_dir / ARCHIVE_DIR}")
+
+    # Descend from the top node to the relic covering epoch_index.
+    upper_steps: List[Dict] = []
+    level = meta["levels"]
+    node_path = relic_dir / ARCHIVE_DIR / f"{meta['top_node']}.json"
+    while True:
+        with node_path.open("r", encoding="utf-8") as f:
+            node = json.load(f)
+        pos, child = _covering_child(node["children"], epoch_index)
+        upper_steps.append(
+            {
+                "object": node["node_id"],
+                "path": merkle_path_from_hex([c["merkle_root"] for c in node["children"]], pos),
+                "root": node["merkle_root"],
+            }
+        )
+        if level == 1:
+            break
+        level -= 1
+        node_path = relic_dir / ARCHIVE_DIR / f"{child['id']}.json"
+
+    with (relic_dir / f"{child['id']}.json").open("r", encoding="utf-8") as f:
+        relic = json.load(f)
+
+    entries = relic["epoch_bundles"]
+    bundle_pos = next(
+        (i for i, e in enumerate(entries) if e["epoch_index"] == epoch_index), None
+    )
+    if bundle_pos is None:
+        raise ValueError(f"{relic['relic_id']}: no bundle for epoch {epoch_index}")
+    entry = entries[bundle_pos]
+
+    lane_roots = [r for r in entry["lane_merkle_roots"] if r]
+    if merkle_root not in lane_roots:
+        raise ValueError(
+            f"{relic['relic_id']}: epoch {epoch_index} has no lane with merkle_root {merkle_root}"
+        )
+
+    steps = [
+        {
+            "object": f"{relic['relic_id']}#{entry['bundle_id']}",
+            "path": merkle_path_from_hex(lane_roots, lane_roots.index(merkle_root)),
+            "root": entry["bundle_merkle_root"],
+        },
+        {
+            "object": relic["relic_id"],
+            "path": merkle_path_from_hex(
+                [e["bundle_merkle_root"] for e in entries], bundle_pos
+            ),
+            "root": relic["aggregate"]["relic_merkle_root"],
+        },
+    ]
+    steps.extend(reversed(upper_steps))
+
+    return {
+        "stage": 8,
+        "epoch_index": epoch_index,
+        "merkle_root": merkle_root,
+        "steps": steps,
+        "archive_root": meta["archive_root"],
+    }
+
+
+def verify_epoch_proof(proof: Dict, archive_root: Optional[str] = None) -> bool:
+    """
+    Recompute every step of a proof. archive_root, if given, is the
+    trusted root the proof must end on.
+    """
+    node = proof["merkle_root"]
+    for step in proof["steps"]:
+        node = fold_merkle_path(node, step["path"])
+        if node != step["root"]:
+            return False
+    expected = proof["archive_root"] if archive_root is None else archive_root
+    return node == expected == proof["archive_root"]
+
+
+# ---------- CLI ----------
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="HashHelix Stage 8 — Relic archive proofs (epoch → archive root)."
+    )
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    prove = sub.add_parser("prove", help="Emit an inclusion proof for one epoch JSON.")
+    prove.add_argument("--relic-dir", default="relics/stage8_runtime")
+    prove.add_argument("--epoch-file", required=True, help="epoch_laneXX_epYYYY.json")
+    prove.add_argument("--out", default=None, help="Write proof JSON here (default: stdout).")
+
+    verify = sub.add_parser("verify", help="Check a proof JSON.")
+    verify.add_argument("proof", help="Proof JSON from 'prove'.")
+    verify.add_argument("--archive-root", default=None, help="Trusted archive root (hex).")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.cmd == "prove":
+        with Path(args.epoch_file).open("r", encoding="utf-8") as f:
+            epoch = json.load(f)
+        proof = prove_epoch(Path(args.relic_dir), epoch["epoch_index"], epoch["merkle_root"])
+        text = json.dumps(proof, indent=2, sort_keys=True)
+        if args.out:
+            Path(args.out).write_text(text + "\n", encoding="utf-8")
+        else:
+            print(text)
+        return
+
+    with Path(args.proof).open("r", encoding="utf-8") as f:
+        proof = json.load(f)
+    if not verify_epoch_proof(proof, args.archive_root):
+        print("[FAIL] Proof does not reach the archive root", file=sys.stderr)
+        raise SystemExit(1)
+    print(f"[OK] Epoch {proof['epoch_index']} included under {proof['archive_root']}")
+
+
+if __name__ == "__main__":
+    main()
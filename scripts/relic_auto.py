@@ -9,6 +9,13 @@ Takes epoch bundle JSON files (output of epoch_auto.py) and produces:
 - Each relic aggregates multiple epoch bundles
 - Deterministic Merkle and chiral commitments
 
+Bundles are streamed in epoch order with only one relic window in
+memory; relics already on disk with identical content are not rewritten.
+Every relic is also folded into a relic-of-relics archive (relic_archive.py)
+so single epochs can be proven against one archive root. With --workers N,
+relic windows are built in a process pool; output is identical to a
+serial run.
+
 Stage 8 constraints:
 - Deterministic and reproducible
 - No randomness, no timestamps
@@ -18,7 +25,12 @@ Stage 8 constraints:
 import argparse
 import hashlib
 import json
-from pathlib import Path from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from relic_archive import DEFAULT_FANOUT, RelicArchive
 
 
 # ---------- Hash / Merkle helpers ----------
@@ -66,16 +78,14 @@ def merkle_root_from_hex(values: List[str]) -> str:
 
 # ---------- Core relic construction ----------
 
-def load_epoch_bundles(epoch_dir: Path) -> Dict[int, Dict]:
+def iter_epoch_bundle_paths(epoch_dir: Path) -> List[Tuple[int, Path]]:
     """
-    Load all epoch_bundle_epXXXX.json files in epoch_dir.
-
-    Returns:
-        dict: epoch_index -> bundle_obj
+    (epoch_index, path) for every epoch_bundle_epXXXX.json, sorted by
+    epoch index. Only file names are held in memory.
     """
-    bundles: Dict[int, Dict] = {}
+    paths: List[Tuple[int, Path]] = []
 
-    for path in sorted(epoch_dir.glob("epoch_bundle_ep*.json")):
+    for path in epoch_dir.glob("epoch_bundle_ep*.json"):
         name = path.stem  # e.g. epoch_bundle_ep0001
         # extract XXXX
         parts = name.split("_ep")
@@ -84,113 +94,242 @@ def load_epoch_bundles(epoch_dir: Path) -> Dict[int, Dict]:
         idx_str = parts[1]
         if not idx_str.isdigit():
             continue
-        epoch_index = int(idx_str)
+        paths.append((int(idx_str), path))
+
+    if not paths:
+        raise ValueError(f"No epoch_bundle_epXXXX.json files found in {epoch_dir}")
 
+    paths.sort()
+    return paths
+
+
+def iter_epoch_bundles(epoch_dir: Path) -> Iterator[Tuple[int, Dict]]:
+    """
+    Yield (epoch_index, bundle_obj) in epoch order, loading one file at a time.
+    """
+    for epoch_index, path in iter_epoch_bundle_paths(epoch_dir):
         with path.open("r", encoding="utf-8") as f:
-            obj = json.load(f)
-        bundles[epoch_index] = obj
+            yield epoch_index, json.load(f)
 
-    if not bundles:
-        raise ValueError(f"No epoch_bundle_epXXXX.json files found in {epoch_dir}")
 
-    return bundles
+def load_epoch_bundles(epoch_dir: Path) -> Dict[int, Dict]:
+    """
+    Load all epoch_bundle_epXXXX.json files in epoch_dir.
+
+    Returns:
+        dict: epoch_index -> bundle_obj
+    """
+    return dict(iter_epoch_bundles(epoch_dir))
+
+
+def iter_relic_windows(
+    bundles: Iterable[Tuple[int, Dict]],
+    epochs_per_relic: int,
+    max_relics: int,
+) -> Iterator[Tuple[int, List[Tuple[int, Dict]]]]:
+    """
+    Group (epoch_index, bundle) pairs into full relic windows.
+
+    Only one window is held at a time; a trailing partial window is
+    dropped, and nothing past max_relics (if > 0) is read.
+    """
+    it = iter(bundles)
+    relic_index = 0
+    while max_relics <= 0 or relic_index < max_relics:
+        window = list(islice(it, epochs_per_relic))
+        if len(window) < epochs_per_relic:
+            return
+        relic_index += 1
+        yield relic_index, window
+
+
+def build_relic(relic_index: int, window: List[Tuple[int, Dict]]) -> Dict:
+    """
+    Build one relic object from a window of (epoch_index, bundle) pairs.
+    """
+    epoch_start = window[0][0]
+    epoch_end = window[-1][0]
+
+    bundle_ids: List[str] = []
+    bundle_merkle_roots: List[str] = []
+    epoch_entries: List[Dict] = []
+
+    lane_count = None
+
+    for epoch_idx, bundle in window:
+        bundle_id = bundle.get("bundle_id", f"epoch-bundle-ep{epoch_idx:04d}")
+        bundle_ids.append(bundle_id)
+
+        # lane count and lane merkle roots
+        lanes = bundle.get("lanes", [])
+        if lane_count is None:
+            lane_count = len(lanes)
+
+        lane_merkle_roots = [lane.get("merkle_root", "") for lane in lanes]
+        # Merkle root over all lane merkle_roots for this epoch (stable)
+        bundle_merkle = merkle_root_from_hex(
+            [r for r in lane_merkle_roots if r]
+        )
+        bundle_merkle_roots.append(bundle_merkle)
+
+        epoch_entries.append(
+            {
+                "epoch_index": epoch_idx,
+                "bundle_id": bundle_id,
+                "lane_count": len(lanes),
+                "lane_merkle_roots": lane_merkle_roots,
+                "bundle_merkle_root": bundle_merkle,
+            }
+        )
+
+    # Aggregate merkle across epoch-level bundle roots
+    relic_merkle_root = merkle_root_from_hex(bundle_merkle_roots)
+
+    # Chiral commitments: forward vs reverse order of bundle IDs
+    chiral_forward = sha256_hex_of_strings(bundle_ids)
+    chiral_reverse = sha256_hex_of_strings(list(reversed(bundle_ids)))
+
+    relic_id = f"relic-ep{epoch_start:04d}-ep{epoch_end:04d}"
+
+    return {
+        "schema": "https://hashhelix.dev/schemas/relic.schema.json",
+        "stage": 8,
+        "relic_id": relic_id,
+        "relic_index": relic_index,
+        "epoch_start": epoch_start,
+        "epoch_end": epoch_end,
+        "epoch_count": len(window),
+        "lane_count": lane_count if lane_count is not None else 0,
+        "epoch_bundles": epoch_entries,
+        "aggregate": {
+            "relic_merkle_root": relic_merkle_root,
+            "chiral_commitment": {
+                "forward": chiral_forward,
+                "reverse": chiral_reverse,
+            },
+            "bundle_ids": bundle_ids,
+        },
+    }
+
+
+def write_relic(relic_obj: Dict, out_dir: Path, skip_existing: bool = True) -> bool:
+    """
+    Write relic JSON; returns False if an identical relic was already on disk.
+    """
+    out_path = out_dir / f"{relic_obj['relic_id']}.json"
+    if skip_existing and out_path.exists():
+        try:
+            with out_path.open("r", encoding="utf-8") as f:
+                existing = json.load(f)
+        except ValueError:
+            existing = None  # truncated / corrupt → rewrite
+        if existing == relic_obj:
+            return False
+
+    with out_path.open("w", encoding="utf-8") as f:
+        json.dump(relic_obj, f, indent=2, sort_keys=True)
+    return True
 
 
 def build_relics(
-    bundles: Dict[int, Dict],
+    bundles: Union[Dict[int, Dict], Iterable[Tuple[int, Dict]]],
     epochs_per_relic: int,
     max_relics: int,
     out_dir: Path,
-) -> None:
+    skip_existing: bool = True,
+    archive: Optional[RelicArchive] = None,
+) -> Tuple[int, int]:
     """
     Group epoch bundles into N-epoch relics and emit relic JSON files.
+
+    bundles may be a dict (epoch_index -> bundle) or an epoch-ordered
+    stream such as iter_epoch_bundles; a stream is consumed one relic
+    window at a time. If an archive is given, every relic (written or
+    unchanged) is added to it; the caller commits.
+
+    Returns:
+        (relics written, relics skipped as already up to date)
     """
-    sorted_epochs = sorted(bundles.keys())
-    total_epochs = len(sorted_epochs)
-
-    if total_epochs < epochs_per_relic:
-        # Not enough epochs to make even one relic
-        return
-
-    # Compute number of relics possible
-    num_relics = total_epochs // epochs_per_relic
-    if max_relics > 0:
-        num_relics = min(num_relics, max_relics)
-
-    for relic_index in range(1, num_relics + 1):
-        start_pos = (relic_index - 1) * epochs_per_relic
-        end_pos = start_pos + epochs_per_relic
-        epoch_slice = sorted_epochs[start_pos:end_pos]
-
-        epoch_start = epoch_slice[0]
-        epoch_end = epoch_slice[-1]
-
-        bundle_ids: List[str] = []
-        bundle_merkle_roots: List[str] = []
-        epoch_entries: List[Dict] = []
-
-        lane_count = None
-
-        for epoch_idx in epoch_slice:
-            bundle = bundles[epoch_idx]
-
-            bundle_id = bundle.get("bundle_id", f"epoch-bundle-ep{epoch_idx:04d}")
-            bundle_ids.append(bundle_id)
-
-            # lane count and lane merkle roots
-            lanes = bundle.get("lanes", [])
-            if lane_count is None:
-                lane_count = len(lanes)
-
-            lane_merkle_roots = [lane.get("merkle_root", "") for lane in lanes]
-            # Merkle root over all lane merkle_roots for this epoch (stable)
-            bundle_merkle = merkle_root_from_hex(
-                [r for r in lane_merkle_roots if r]
-            )
-            bundle_merkle_roots.append(bundle_merkle)
-
-            epoch_entries.append(
-                {
-                    "epoch_index": epoch_idx,
-                    "bundle_id": bundle_id,
-                    "lane_count": len(lanes),
-                    "lane_merkle_roots": lane_merkle_roots,
-                    "bundle_merkle_root": bundle_merkle,
-                }
-            )
-
-        # Aggregate merkle across epoch-level bundle roots
-        relic_merkle_root = merkle_root_from_hex(bundle_merkle_roots)
-
-        # Chiral commitments: forward vs reverse order of bundle IDs
-        chiral_forward = sha256_hex_of_strings(bundle_ids)
-        chiral_reverse = sha256_hex_of_strings(list(reversed(bundle_ids)))
-
-        relic_id = f"relic-ep{epoch_start:04d}-ep{epoch_end:04d}"
-
-        relic_obj = {
-            "schema": "https://hashhelix.dev/schemas/relic.schema.json",
-            "stage": 8,
-            "relic_id": relic_id,
-            "relic_index": relic_index,
-            "epoch_start": epoch_start,
-            "epoch_end": epoch_end,
-            "epoch_count": len(epoch_slice),
-            "lane_count": lane_count if lane_count is not None else 0,
-            "epoch_bundles": epoch_entries,
-            "aggregate": {
-                "relic_merkle_root": relic_merkle_root,
-                "chiral_commitment": {
-                    "forward": chiral_forward,
-                    "reverse": chiral_reverse,
-                },
-                "bundle_ids": bundle_ids,
-            },
-        }
+    if isinstance(bundles, dict):
+        bundles = sorted(bundles.items())
+
+    written = skipped = 0
+    for relic_index, window in iter_relic_windows(bundles, epochs_per_relic, max_relics):
+        relic_obj = build_relic(relic_index, window)
+        if archive is not None:
+            archive.add(relic_obj)
+        if write_relic(relic_obj, out_dir, skip_existing):
+            written += 1
+        else:
+            skipped += 1
+    return written, skipped
 
-        out_path = out_dir / f"{relic_id}.json"
-        with out_path.open("w", encoding="utf-8") as f:
-            json.dump(relic_obj, f, indent=2, sort_keys=True)
+
+# ---------- Parallel relic construction ----------
+
+# (relic_index, [(epoch_index, bundle_path), ...], out_dir, skip_existing)
+RelicJob = Tuple[int, List[Tuple[int, str]], str, bool]
+
+
+def run_relic_job(job: RelicJob) -> Tuple[Dict, bool]:
+    """
+    Worker: load one window of bundles, build and write its relic.
+
+    Returns the fields RelicArchive.add needs, and whether the relic
+    was written.
+    """
+    relic_index, window_paths, out_dir, skip_existing = job
+    window: List[Tuple[int, Dict]] = []
+    for epoch_index, path in window_paths:
+        with open(path, "r", encoding="utf-8") as f:
+            window.append((epoch_index, json.load(f)))
+
+    relic_obj = build_relic(relic_index, window)
+    written = write_relic(relic_obj, Path(out_dir), skip_existing)
+    summary = {
+        "relic_index": relic_obj["relic_index"],
+        "relic_id": relic_obj["relic_id"],
+        "epoch_start": relic_obj["epoch_start"],
+        "epoch_end": relic_obj["epoch_end"],
+        "aggregate": {
+            "relic_merkle_root": relic_obj["aggregate"]["relic_merkle_root"],
+        },
+    }
+    return summary, written
+
+
+def build_relics_parallel(
+    epoch_dir: Path,
+    epochs_per_relic: int,
+    max_relics: int,
+    out_dir: Path,
+    workers: int,
+    skip_existing: bool = True,
+    archive: Optional[RelicArchive] = None,
+) -> Tuple[int, int]:
+    """
+    Same result as build_relics over iter_epoch_bundles, with relic
+    windows spread over a process pool. Only bundle paths cross the
+    process boundary; results come back (and reach the archive) in
+    relic_index order.
+    """
+    paths = [(idx, str(path)) for idx, path in iter_epoch_bundle_paths(epoch_dir)]
+    jobs: List[RelicJob] = [
+        (relic_index, window, str(out_dir), skip_existing)
+        for relic_index, window in iter_relic_windows(paths, epochs_per_relic, max_relics)
+    ]
+    chunksize = max(1, len(jobs) // (workers * 8))
+
+    written = skipped = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for summary, was_written in pool.map(run_relic_job, jobs, chunksize=chunksize):
+            if archive is not None:
+                archive.add(summary)
+            if was_written:
+                written += 1
+            else:
+                skipped += 1
+    return written, skipped
 
 
 # ---------- CLI ----------
@@ -223,6 +362,28 @@ def parse_args() -> argparse.Namespace:
         default=0,
         help="Maximum relics to generate (0 = all possible).",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rewrite relics even if an identical relic JSON already exists.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for relic windows (default: 1 = serial streaming).",
+    )
+    parser.add_argument(
+        "--archive-fanout",
+        type=int,
+        default=DEFAULT_FANOUT,
+        help=f"Children per relic-archive node (default: {DEFAULT_FANOUT}).",
+    )
+    parser.add_argument(
+        "--no-archive",
+        action="store_true",
+        help="Do not update the relic-of-relics archive (out-dir/archive/).",
+    )
     return parser.parse_args()
 
 
@@ -238,14 +399,38 @@ def main() -> None:
 
     if args.epochs_per_relic <= 0:
         raise ValueError("epochs-per-relic must be > 0")
-
-    bundles = load_epoch_bundles(epoch_dir)
-    build_relics(
-        bundles=bundles,
-        epochs_per_relic=args.epochs_per_relic,
-        max_relics=args.max_relics,
-        out_dir=out_dir,
-    )
+    if args.workers < 1:
+        raise ValueError("workers must be >= 1")
+
+    archive = None
+    if not args.no_archive:
+        archive = RelicArchive(out_dir, args.epochs_per_relic, args.archive_fanout)
+
+    if args.workers > 1:
+        written, skipped = build_relics_parallel(
+            epoch_dir=epoch_dir,
+            epochs_per_relic=args.epochs_per_relic,
+            max_relics=args.max_relics,
+            out_dir=out_dir,
+            workers=args.workers,
+            skip_existing=not args.force,
+            archive=archive,
+        )
+    else:
+        written, skipped = build_relics(
+            bundles=iter_epoch_bundles(epoch_dir),
+            epochs_per_relic=args.epochs_per_relic,
+            max_relics=args.max_relics,
+            out_dir=out_dir,
+            skip_existing=not args.force,
+            archive=archive,
+        )
+    print(f"[OK] Relics: {written} written, {skipped} unchanged")
+
+    if archive is not None:
+        archive_root = archive.commit()
+        if archive_root is not None:
+            print(f"[OK] Archive root ({archive.count} relics): {archive_root}")
 
 
 if __name__ == "__main__":
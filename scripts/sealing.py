@@ -11,9 +11,13 @@
 
 import json
 import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from digest_cache import default_cache, file_stat
 
 
 # -----------------------------
@@ -21,6 +25,14 @@ from typing import Any, Dict, List
 # -----------------------------
 
 
+_CANONICAL_KW = {"sort_keys": True, "separators": (",", ":")}
+_encode_key = json.encoder.encode_basestring_ascii
+
+# Containers this many levels deep are walked; anything below is one json.dumps.
+CANONICAL_STREAM_DEPTH = 2
+CANONICAL_CHUNK_SIZE = 1 << 16
+
+
 def canonical_serialize(obj: Dict[str, Any]) -> bytes:
     """
     Canonical JSON serialization:
@@ -28,17 +40,163 @@ def canonical_serialize(obj: Dict[str, Any]) -> bytes:
     - sorted keys
     - no extra whitespace
     """
-    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return json.dumps(obj, **_CANONICAL_KW).encode("utf-8")
+
+
+def iter_canonical(obj: Any, depth: int = CANONICAL_STREAM_DEPTH) -> Iterator[str]:
+    """
+    Stream the exact text of canonical_serialize(obj) in pieces.
+
+    The top `depth` levels of dicts / lists are walked here; each value
+    below that (e.g. one lane artifact in a bundle) goes through the C
+    encoder on its own, so peak memory is one subtree, not the document.
+    """
+    if depth <= 0:
+        yield json.dumps(obj, **_CANONICAL_KW)
+    elif isinstance(obj, dict):
+        if not all(type(k) is str for k in obj):
+            # non-string keys: leave key coercion and ordering to json
+            yield json.dumps(obj, **_CANONICAL_KW)
+            return
+        sep = "{"
+        for key in sorted(obj):
+            yield sep + _encode_key(key) + ":"
+            yield from iter_canonical(obj[key], depth - 1)
+            sep = ","
+        yield "}" if sep == "," else "{}"
+    elif isinstance(obj, (list, tuple)):
+        sep = "["
+        for item in obj:
+            yield sep
+            yield from iter_canonical(item, depth - 1)
+            sep = ","
+        yield "]" if sep == "," else "[]"
+    else:
+        yield json.dumps(obj, **_CANONICAL_KW)
+
+
+def _canonical_chunks(obj: Any) -> Iterator[bytes]:
+    """
+    iter_canonical coalesced into UTF-8 chunks of ~CANONICAL_CHUNK_SIZE.
+    """
+    buf: List[str] = []
+    size = 0
+    for piece in iter_canonical(obj):
+        buf.append(piece)
+        size += len(piece)
+        if size >= CANONICAL_CHUNK_SIZE:
+            yield "".join(buf).encode("utf-8")
+            buf.clear()
+            size = 0
+    if buf:
+        yield "".join(buf).encode("utf-8")
+
+
+def canonical_digest(obj: Any) -> Tuple[str, int]:
+    """
+    (sha256 hex, byte size) of canonical_serialize(obj), streamed.
+    """
+    h = hashlib.sha256()
+    size = 0
+    for chunk in _canonical_chunks(obj):
+        h.update(chunk)
+        size += len(chunk)
+    return h.hexdigest(), size
+
+
+def canonical_sha256(obj: Any) -> str:
+    """
+    sha256_hex(canonical_serialize(obj)) without building the full bytes.
+    """
+    return canonical_digest(obj)[0]
+
+
+def write_canonical(obj: Any, f: BinaryIO, hasher: Any = None) -> int:
+    """
+    Write canonical_serialize(obj) to a binary file object; returns bytes
+    written. A hashlib object passed as hasher is fed the same bytes.
+    """
+    written = 0
+    for chunk in _canonical_chunks(obj):
+        f.write(chunk)
+        if hasher is not None:
+            hasher.update(chunk)
+        written += len(chunk)
+    return written
 
 
 def sha256_hex(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+# -----------------------------
+# lanes_root (Merkle over artifact digests)
+# -----------------------------
+#
+# Leaves are the raw 32-byte artifact digests in lane_artifacts order,
+# pairs are SHA256(left || right), the odd node of a layer is duplicated
+# (same rules as the Stage 8 relic roots).
+
+
+def _lanes_layers(digests: List[str]) -> List[List[bytes]]:
+    if not digests:
+        return [[hashlib.sha256(b"").digest()]]
+    layer = [bytes.fromhex(d) for d in digests]
+    layers = [layer]
+    while len(layer) > 1:
+        layer = [
+            hashlib.sha256(layer[i] + (layer[i + 1] if i + 1 < len(layer) else layer[i])).digest()
+            for i in range(0, len(layer), 2)
+        ]
+        layers.append(layer)
+    return layers
+
+
+def lanes_root(digests: List[str]) -> str:
+    return _lanes_layers(digests)[-1][0].hex()
+
+
+def lane_proof(digests: List[str], index: int) -> List[List[str]]:
+    """
+    Sibling path for digests[index]: [side, sibling_hex] per layer, side
+    "R" meaning the sibling is hashed on the right.
+    """
+    if not 0 <= index < len(digests):
+        raise ValueError(f"lane index {index} outside 0..{len(digests) - 1}")
+    path: List[List[str]] = []
+    for layer in _lanes_layers(digests)[:-1]:
+        if index % 2 == 0:
+            sibling = layer[index + 1] if index + 1 < len(layer) else layer[index]
+            path.append(["R", sibling.hex()])
+        else:
+            path.append(["L", layer[index - 1].hex()])
+        index //= 2
+    return path
+
+
+def fold_lane_proof(digest: str, path: List[List[str]]) -> str:
+    node = bytes.fromhex(digest)
+    for side, sibling in path:
+        if side == "R":
+            node = hashlib.sha256(node + bytes.fromhex(sibling)).digest()
+        else:
+            node = hashlib.sha256(bytes.fromhex(sibling) + node).digest()
+    return node.hex()
+
+
+def artifact_digests(lane_artifacts: List[Dict[str, Any]]) -> List[str]:
+    try:
+        return [a["digest"] for a in lane_artifacts]
+    except (KeyError, TypeError):
+        raise ValueError("every lane artifact needs a digest to compute lanes_root")
+
+
 # -----------------------------
 # Lane artifact (engine-only)
 # -----------------------------
 
+LANE_ARTIFACT_VERSION = "6.0-engine"
+
 
 def build_lane_artifact(
     *,
@@ -55,11 +213,29 @@ def build_lane_artifact(
     - chiral commitments
     - metadata (engine-safe only)
     """
+    body = lane_artifact_body(
+        lane_id=lane_id,
+        height=height,
+        chiral_plus=chiral_plus,
+        chiral_minus=chiral_minus,
+        metadata=metadata,
+    )
+    return _wrap_lane_artifact(body, canonical_sha256(body))
+
+
+def lane_artifact_body(
+    *,
+    lane_id: int,
+    height: int,
+    chiral_plus: str,
+    chiral_minus: str,
+    metadata: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
     if metadata is None:
         metadata = {}
 
-    body: Dict[str, Any] = {
-        "version": "6.0-engine",
+    return {
+        "version": LANE_ARTIFACT_VERSION,
         "laneId": lane_id,
         "height": height,
         "chiral": {
@@ -69,9 +245,8 @@ def build_lane_artifact(
         "metadata": metadata,
     }
 
-    serialized = canonical_serialize(body)
-    digest = sha256_hex(serialized)
 
+def _wrap_lane_artifact(body: Dict[str, Any], digest: str) -> Dict[str, Any]:
     return {
         "artifactKind": "laneArtifact",
         "artifactVersion": "6.0",
@@ -101,6 +276,10 @@ def build_engine_bundle(
     NOTE: bundle_hash is computed over the bundle *without* the `seal`
     field, then the seal is attached. This keeps the seal from
     self-referential hashing.
+
+    seal.lanes_root commits to the artifact digests alone, so a single
+    lane artifact can be checked with a Merkle path (see
+    read_indexed_lane) instead of rehashing the whole bundle.
     """
     if created_at is None:
         created_at = (
@@ -122,15 +301,14 @@ def build_engine_bundle(
     if engine_commit is not None:
         bundle_core["engine_commit"] = engine_commit
 
-    # Canonicalize the core (no seal) and hash it
-    canonical = canonical_serialize(bundle_core)
-    bundle_hash = sha256_hex(canonical)
+    # Canonicalize the core (no seal) and hash it, streaming per lane artifact
+    bundle_hash = canonical_sha256(bundle_core)
 
     seal: Dict[str, Any] = {
         "hash_function": "sha256",
         "canonicalization": "RFC8785",
         "bundle_hash": bundle_hash,
-        # "lanes_root" can be added later if/when you define that aggregate.
+        "lanes_root": lanes_root(artifact_digests(lane_artifacts)),
     }
 
     bundle: Dict[str, Any] = dict(bundle_core)
@@ -138,6 +316,346 @@ def build_engine_bundle(
     return bundle
 
 
+# -----------------------------
+# Indexed bundle layout
+# -----------------------------
+#
+# The bundle file is written in canonical form (so its bytes are exactly
+# canonical_serialize(bundle)) next to a small index:
+#
+#   lane01.hhl.json        canonical bundle
+#   lane01.hhl.index.json  per-lane byte ranges + digests, seal byte range
+#
+# A reader seeks to one artifact and the seal, recomputes the artifact
+# digest and folds its Merkle path (rebuilt from the index digests) up
+# to seal.lanes_root. The index is untrusted: a wrong digest, offset or
+# laneId fails against the seal and artifact read from the bundle itself.
+
+BUNDLE_INDEX_FORMAT = "hhl.bundle.index"
+BUNDLE_INDEX_VERSION = 1
+
+
+def bundle_index_path(bundle_path: Path) -> Path:
+    name = bundle_path.name
+    stem = name[: -len(".json")] if name.endswith(".json") else name
+    return bundle_path.with_name(stem + ".index.json")
+
+
+def write_indexed_bundle(bundle: Dict[str, Any], out_path: Path) -> Path:
+    """
+    Write a sealed bundle canonically plus its index; returns the index path.
+    Artifacts are encoded one at a time, like canonical_sha256.
+    """
+    seal = bundle.get("seal")
+    if not isinstance(seal, dict) or "lanes_root" not in seal:
+        raise ValueError("bundle seal has no lanes_root; build it with build_engine_bundle")
+
+    lanes: List[Dict[str, Any]] = []
+    seal_range: List[int] = []
+    offset = 0
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("wb") as f:
+
+        def emit(text: str) -> int:
+            nonlocal offset
+            data = text.encode("utf-8")
+            f.write(data)
+            start = offset
+            offset += len(data)
+            return start
+
+        sep = "{"
+        for key in sorted(bundle):
+            emit(sep + _encode_key(key) + ":")
+            sep = ","
+            value = bundle[key]
+            if key == "lane_artifacts":
+                item_sep = "["
+                for artifact in value:
+                    emit(item_sep)
+                    item_sep = ","
+                    start = emit(json.dumps(artifact, **_CANONICAL_KW))
+                    lanes.append({
+                        "laneId": artifact.get("body", {}).get("laneId"),
+                        "digest": artifact["digest"],
+                        "offset": start,
+                        "length": offset - start,
+                    })
+                emit("]" if item_sep == "," else "[]")
+            else:
+                start = emit(json.dumps(value, **_CANONICAL_KW))
+                if key == "seal":
+                    seal_range = [start, offset - start]
+        emit("}")
+
+    index = {
+        "format": BUNDLE_INDEX_FORMAT,
+        "version": BUNDLE_INDEX_VERSION,
+        "bundle": out_path.name,
+        "bundle_id": bundle.get("bundle_id"),
+        "bundle_size": offset,
+        "seal_offset": seal_range[0],
+        "seal_length": seal_range[1],
+        "lanes": lanes,
+    }
+    index_path = bundle_index_path(out_path)
+    with index_path.open("w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    return index_path
+
+
+def load_bundle_index(bundle_path: Path) -> Dict[str, Any]:
+    index_path = bundle_index_path(bundle_path)
+    if not index_path.exists():
+        raise FileNotFoundError(f"Missing bundle index: {index_path}")
+    with index_path.open("r", encoding="utf-8") as f:
+        index = json.load(f)
+    if index.get("format") != BUNDLE_INDEX_FORMAT:
+        raise ValueError(f"{index_path}: not an {BUNDLE_INDEX_FORMAT} file")
+    if index.get("version") != BUNDLE_INDEX_VERSION:
+        raise ValueError(f"{index_path}: unsupported index version {index.get('version')}")
+    if bundle_path.stat().st_size != index["bundle_size"]:
+        raise ValueError(f"{index_path}: stale index for {bundle_path}")
+    return index
+
+
+def _read_range(f, offset: int, length: int) -> Any:
+    f.seek(offset)
+    return json.loads(f.read(length))
+
+
+def read_indexed_lane(bundle_path: Path, lane_id: int) -> Dict[str, Any]:
+    """
+    Load and verify one lane artifact from an indexed bundle:
+    - digest == canonical_sha256(body)
+    - body.laneId == lane_id
+    - Merkle path from the digest folds to the bundle's seal.lanes_root
+
+    Returns {"artifact", "proof", "lanes_root", "lane_index"}; raises
+    ValueError when any check fails.
+    """
+    index = load_bundle_index(bundle_path)
+    lanes = index["lanes"]
+    positions = [i for i, lane in enumerate(lanes) if lane["laneId"] == lane_id]
+    if not positions:
+        raise ValueError(f"{bundle_path}: no lane artifact with laneId {lane_id}")
+    pos = positions[0]
+    entry = lanes[pos]
+
+    with bundle_path.open("rb") as f:
+        seal = _read_range(f, index["seal_offset"], index["seal_length"])
+        artifact = _read_range(f, entry["offset"], entry["length"])
+
+    if not isinstance(seal, dict) or "lanes_root" not in seal:
+        raise ValueError(f"{bundle_path}: index does not point at a seal with lanes_root")
+    if not isinstance(artifact, dict) or "body" not in artifact:
+        raise ValueError(f"{bundle_path}: index does not point at a lane artifact")
+    digest = canonical_sha256(artifact["body"])
+    if digest != artifact.get("digest") or digest != entry["digest"]:
+        raise ValueError(f"{bundle_path}: lane {lane_id} digest mismatch")
+    # laneId in the index only locates the artifact; the sealed body decides
+    if artifact["body"].get("laneId") != lane_id:
+        raise ValueError(f"{bundle_path}: index entry for lane {lane_id} points at another lane's artifact")
+
+    proof = lane_proof([lane["digest"] for lane in lanes], pos)
+    if fold_lane_proof(digest, proof) != seal["lanes_root"]:
+        raise ValueError(f"{bundle_path}: lane {lane_id} does not fold to seal.lanes_root")
+
+    return {
+        "artifact": artifact,
+        "proof": proof,
+        "lanes_root": seal["lanes_root"],
+        "lane_index": pos,
+    }
+
+
+# -----------------------------
+# Batch sealing
+# -----------------------------
+#
+# A lane result is one JSON object per lane:
+#   {"laneId": 1, "height": 10000, "h_plus": "<hex>", "h_minus": "<hex>",
+#    "metadata": {...}}          (metadata optional)
+# read either from a directory (one *.json per lane) or from a JSONL
+# manifest (one lane result per line).
+
+
+LANE_ARTIFACT_CACHE_KIND = "lane_artifact/" + LANE_ARTIFACT_VERSION
+
+
+def lane_result_paths(source: Path) -> List[Path]:
+    return sorted(source.glob("*.json"))
+
+
+def load_lane_results(source: Path) -> List[Dict[str, Any]]:
+    if not source.exists():
+        raise FileNotFoundError(f"Missing lane results: {source}")
+    results: List[Dict[str, Any]] = []
+    if source.is_dir():
+        for path in lane_result_paths(source):
+            with path.open("r", encoding="utf-8") as f:
+                results.append(json.load(f))
+    else:
+        with source.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    results.append(json.loads(line))
+    return results
+
+
+def _lane_result_body(result: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        return lane_artifact_body(
+            lane_id=result["laneId"],
+            height=result["height"],
+            chiral_plus=result["h_plus"],
+            chiral_minus=result["h_minus"],
+            metadata=result.get("metadata"),
+        )
+    except KeyError as e:
+        raise ValueError(f"lane result {result.get('laneId')!r} missing field {e}")
+
+
+def _seal_lane_result(result: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    """
+    (artifact, canonical body size) for one lane result.
+    """
+    body = _lane_result_body(result)
+    digest, size = canonical_digest(body)
+    return _wrap_lane_artifact(body, digest), size
+
+
+def seal_lane_results(
+    results: List[Dict[str, Any]],
+    workers: int = 1,
+    digests: Optional[List[Optional[str]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Build and digest one artifact per lane result, in a process pool when
+    workers > 1. Artifacts come back ordered by laneId whatever the input
+    order; duplicate laneIds are rejected.
+
+    digests[i], when given, is a trusted digest for results[i] (e.g. from
+    the digest cache): that artifact is assembled without rehashing.
+    """
+    sealed = _seal_lane_results(results, workers, digests)
+    return _sort_lane_artifacts([artifact for artifact, _ in sealed])
+
+
+def _sort_lane_artifacts(artifacts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    artifacts.sort(key=lambda a: a["body"]["laneId"])
+    for prev, cur in zip(artifacts, artifacts[1:]):
+        if prev["body"]["laneId"] == cur["body"]["laneId"]:
+            raise ValueError(f"duplicate laneId {cur['body']['laneId']} in lane results")
+    return artifacts
+
+
+def _seal_lane_results(
+    results: List[Dict[str, Any]],
+    workers: int,
+    digests: Optional[List[Optional[str]]],
+) -> List[Tuple[Dict[str, Any], Optional[int]]]:
+    """
+    (artifact, body size or None when the digest was supplied), in input order.
+    """
+    sealed: List[Any] = [None] * len(results)
+    todo: List[int] = []
+    for i, result in enumerate(results):
+        if digests is not None and digests[i] is not None:
+            sealed[i] = (_wrap_lane_artifact(_lane_result_body(result), digests[i]), None)
+        else:
+            todo.append(i)
+
+    pending = [results[i] for i in todo]
+    if workers > 1 and len(pending) > 1:
+        chunksize = max(1, len(pending) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done = list(pool.map(_seal_lane_result, pending, chunksize=chunksize))
+    else:
+        done = [_seal_lane_result(r) for r in pending]
+    for i, item in zip(todo, done):
+        sealed[i] = item
+    return sealed
+
+
+def _load_lane_result_files(source: Path, cache: Any) -> Tuple[List[Path], List[Any], List[Dict[str, Any]], List[Optional[str]]]:
+    """
+    (paths, stats, results, cached digests) for a directory of lane
+    results; stats are taken before reading, see DigestCache.put.
+    """
+    paths = lane_result_paths(source)
+    stats = [file_stat(p) for p in paths]
+    results: List[Dict[str, Any]] = []
+    for path in paths:
+        with path.open("r", encoding="utf-8") as f:
+            results.append(json.load(f))
+    digests: List[Optional[str]] = []
+    for path, st in zip(paths, stats):
+        hit = cache.get(path, LANE_ARTIFACT_CACHE_KIND, st)
+        digests.append(hit[0] if hit else None)
+    return paths, stats, results, digests
+
+
+def seal_batch(
+    source: Path,
+    out_path: Path,
+    *,
+    bundle_id: str,
+    workers: int = 1,
+    created_at: Optional[str] = None,
+    engine_version: str = "v1.6",
+    use_cache: bool = True,
+) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Lane results → artifacts → sealed bundle → indexed bundle on disk.
+
+    Returns (seal, timings) where timings holds seconds per stage.
+    Pass created_at to make the output byte-for-byte reproducible.
+    For a directory source, artifact digests of lane result files that
+    are unchanged since the last run come from the digest cache.
+    """
+    timings: Dict[str, float] = {}
+    cache = default_cache() if use_cache and source.is_dir() else None
+
+    t0 = time.perf_counter()
+    digests: Optional[List[Optional[str]]] = None
+    if cache is not None:
+        paths, stats, results, digests = _load_lane_result_files(source, cache)
+    else:
+        results = load_lane_results(source)
+    if not results:
+        raise ValueError(f"No lane results in {source}")
+    t1 = time.perf_counter()
+    timings["load_sec"] = t1 - t0
+
+    sealed = _seal_lane_results(results, workers, digests)
+    if cache is not None:
+        with cache.transaction():
+            for path, st, (artifact, size) in zip(paths, stats, sealed):
+                if size is not None:
+                    cache.put(path, artifact["digest"], size, LANE_ARTIFACT_CACHE_KIND, st)
+    artifacts = _sort_lane_artifacts([artifact for artifact, _ in sealed])
+    t2 = time.perf_counter()
+    timings["artifacts_sec"] = t2 - t1
+
+    bundle = build_engine_bundle(
+        lane_artifacts=artifacts,
+        bundle_id=bundle_id,
+        engine_version=engine_version,
+        created_at=created_at,
+    )
+    t3 = time.perf_counter()
+    timings["bundle_sec"] = t3 - t2
+
+    write_indexed_bundle(bundle, out_path)
+    t4 = time.perf_counter()
+    timings["write_sec"] = t4 - t3
+    timings["total_sec"] = t4 - t0
+
+    return bundle["seal"], timings
+
+
 def write_sample_bundle() -> None:
     """
     Load the existing Stage 6 sample lane artifact and wrap it
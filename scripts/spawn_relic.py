@@ -27,6 +27,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Dict, Any
 
+from epoch_combine import verified_epoch_bundle_hash
+
 
 def sha256_hex(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
@@ -44,7 +46,14 @@ def load_epoch_bundles(patterns: List[str]) -> List[Dict[str, Any]]:
     bundles = []
     for p in sorted(files):
         with p.open("r", encoding="utf-8") as f:
-            bundles.append(json.load(f))
+            bundle = json.load(f)
+        # The relic commits to each bundle's integrity hash: check it
+        # first (unchanged files are answered from the digest cache).
+        try:
+            verified_epoch_bundle_hash(p, bundle)
+        except ValueError as e:
+            raise SystemExit(str(e))
+        bundles.append(bundle)
     return bundles
 
 
@@ -8,10 +8,16 @@ Pipeline:
   epoch_auto.py    → WARM epochs + bundles
   relic_auto.py    → COLD relics
 
+With --stream, lanes and epochs are produced in one fused pass
+(epoch_auto.py --stream); --no-traces skips writing lane traces and
+verifies epochs against regenerated lane values instead.
+
 Checks:
-  - Lane length / coverage
-  - Epoch JSON vs lane traces (Merkle + seq hash)
-  - Relic aggregate + chiral commitments
+  - Lane length / coverage (O(1) from laneXX.meta.json sidecars)
+  - Optional deep audit: streaming rehash vs recorded sequence_hash
+  - Epoch JSON vs lane traces (Merkle + seq hash + stats, fused kernel)
+  - Relic aggregate + chiral commitments (optionally in a process pool;
+    all failures reported in relic order, first one summarised)
   - Optional corruption test (in-memory, no disk damage)
 
 All deterministic, no randomness, no timestamps.
@@ -22,8 +28,21 @@ import hashlib
 import json
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+from lane_codec import (
+    TRACE_FORMATS,
+    iter_trace_values,
+    lane_trace_path,
+    read_trace_meta,
+    trace_length,
+    trace_meta_path,
+    trace_sequence_hash,
+)
+from epoch_auto import epoch_digest
+from lane_runtime import iter_lane_values
 
 
 # ---------- Shared hashing helpers ----------
@@ -32,31 +51,6 @@ def sha256_bytes(data: bytes) -> bytes:
     return hashlib.sha256(data).digest()
 
 
-def merkle_root_from_ints(values: List[int]) -> str:
-    if not values:
-        return hashlib.sha256(b"").hexdigest()
-    layer = [sha256_bytes(str(v).encode("utf-8")) for v in values]
-    while len(layer) > 1:
-        next_layer: List[bytes] = []
-        for i in range(0, len(layer), 2):
-            left = layer[i]
-            if i + 1 < len(layer):
-                right = layer[i + 1]
-            else:
-                right = left
-            next_layer.append(sha256_bytes(left + right))
-        layer = next_layer
-    return layer[0].hex()
-
-
-def sequence_hash_from_ints(values: List[int]) -> str:
-    h = hashlib.sha256()
-    for v in values:
-        h.update(str(v).encode("utf-8"))
-        h.update(b"\n")
-    return h.hexdigest()
-
-
 def merkle_root_from_hex(values: List[str]) -> str:
     if not values:
         return hashlib.sha256(b"").hexdigest()
@@ -90,25 +84,32 @@ def run_cmd(args: List[str]) -> None:
 
 
 def load_lane_values(path: Path) -> List[int]:
-    vals: List[int] = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            vals.append(int(line))
-    return vals
+    return list(iter_trace_values(path))
 
 
 # ---------- Verification ----------
 
 def verify_lane_lengths(lane_dir: Path, lanes: int, steps: int) -> None:
+    """
+    Step count per lane. Uses the sidecar (plus a size check against the
+    trace) when present, otherwise counts the trace.
+    """
     print("[CHECK] Lane lengths")
     for lane_id in range(1, lanes + 1):
-        lane_path = lane_dir / f"lane{lane_id:02d}.txt"
+        lane_path = lane_trace_path(lane_dir, lane_id)
         if not lane_path.exists():
             raise AssertionError(f"Missing lane file: {lane_path}")
-        count = sum(1 for _ in lane_path.open("r", encoding="utf-8"))
+        meta = read_trace_meta(lane_path)
+        if meta is not None:
+            size = lane_path.stat().st_size
+            if size != meta["size_bytes"]:
+                raise AssertionError(
+                    f"Lane {lane_id}: {lane_path} is {size} bytes, "
+                    f"sidecar records {meta['size_bytes']}"
+                )
+            count = meta["steps"]
+        else:
+            count = trace_length(lane_path)
         if count != steps:
             raise AssertionError(
                 f"Lane {lane_id}: expected {steps} steps, found {count}"
@@ -116,16 +117,51 @@ def verify_lane_lengths(lane_dir: Path, lanes: int, steps: int) -> None:
     print("[OK] Lane lengths verified")
 
 
+def audit_lane_traces(lane_dir: Path, lanes: int) -> None:
+    """
+    Deep audit: stream every trace and compare against the sequence_hash
+    recorded in its sidecar at write time.
+    """
+    print("[CHECK] Lane trace sequence hashes (deep audit)")
+    for lane_id in range(1, lanes + 1):
+        lane_path = lane_trace_path(lane_dir, lane_id)
+        meta = read_trace_meta(lane_path)
+        if meta is None:
+            raise AssertionError(
+                f"Lane {lane_id}: no sidecar {trace_meta_path(lane_path)}"
+            )
+        s2 = trace_sequence_hash(lane_path)
+        if s2 != meta["sequence_hash"]:
+            raise AssertionError(
+                f"{lane_path}: sequence_hash mismatch\n"
+                f"  stored : {meta['sequence_hash']}\n"
+                f"  recomputed: {s2}"
+            )
+    print("[OK] Lane traces match recorded sequence hashes")
+
+
 def verify_epochs_against_lanes(
-    lane_dir: Path,
+    lane_dir: Optional[Path],
     epoch_dir: Path,
     lanes: int,
     epoch_length: int,
+    steps: int = 0,
+    seed: int = 1,
+    seed_stride: int = 0,
 ) -> None:
+    """
+    Recompute every epoch from its lane. If lane_dir is None (no traces
+    were written), lane values are regenerated from the recurrence with
+    the seeds the run used (lane k: seed + (k-1)*seed_stride).
+    """
     print("[CHECK] Epochs vs lane traces")
     for lane_id in range(1, lanes + 1):
-        lane_path = lane_dir / f"lane{lane_id:02d}.txt"
-        lane_values = load_lane_values(lane_path)
+        if lane_dir is None:
+            lane_seed = seed + (lane_id - 1) * seed_stride
+            lane_values = list(iter_lane_values(seed=lane_seed, steps=steps))
+        else:
+            lane_path = lane_trace_path(lane_dir, lane_id)
+            lane_values = load_lane_values(lane_path)
 
         epoch_paths = sorted(
             epoch_dir.glob(f"epoch_lane{lane_id:02d}_ep*.json")
@@ -160,7 +196,7 @@ def verify_epochs_against_lanes(
                     f"{ep_path}: segment length mismatch ({len(segment)})"
                 )
 
-            m2 = merkle_root_from_ints(segment)
+            m2, s2, stats2 = epoch_digest(segment)
             if m2 != merkle:
                 raise AssertionError(
                     f"{ep_path}: merkle mismatch\n"
@@ -168,7 +204,6 @@ def verify_epochs_against_lanes(
                     f"  recomputed: {m2}"
                 )
 
-            s2 = sequence_hash_from_ints(segment)
             if s2 != seq_hash:
                 raise AssertionError(
                     f"{ep_path}: sequence_hash mismatch\n"
@@ -176,30 +211,72 @@ def verify_epochs_against_lanes(
                     f"  recomputed: {s2}"
                 )
 
+            if stats2 != obj["stats"]:
+                raise AssertionError(
+                    f"{ep_path}: stats mismatch\n"
+                    f"  stored : {obj['stats']}\n"
+                    f"  recomputed: {stats2}"
+                )
+
     print("[OK] Epochs consistent with lane traces")
 
 
-def verify_relics(relic_dir: Path) -> None:
+def verify_relics(relic_dir: Path, workers: int = 1) -> None:
+    """
+    Check every relic (in file-name order) and report all failures in that
+    order. With workers > 1 the relics are checked in a process pool.
+    """
     print("[CHECK] Relic aggregates + chiral commitments")
 
     relic_paths = sorted(relic_dir.glob("relic-ep*.json"))
     if not relic_paths:
         raise AssertionError(f"No relics found in {relic_dir}")
 
-    for path in relic_paths:
-        with path.open("r", encoding="utf-8") as f:
-            relic = json.load(f)
-        _verify_single_relic(relic, label=str(path))
+    labels = [str(path) for path in relic_paths]
+    if workers > 1:
+        chunksize = max(1, len(labels) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_check_relic_file, labels, chunksize=chunksize))
+    else:
+        results = [_check_relic_file(label) for label in labels]
+
+    failures = [
+        (label, result) for label, result in zip(labels, results) if result is not None
+    ]
+    for label, (field, _) in failures:
+        print(f"[FAIL] {label}: {field}")
+    if failures:
+        label, (field, message) = failures[0]
+        raise AssertionError(
+            f"{len(failures)} of {len(labels)} relics failed; "
+            f"first: {label} ({field})\n{message}"
+        )
+
+    print(f"[OK] All relics verified ({len(labels)})")
 
-    print("[OK] All relics verified")
+
+def _check_relic_file(label: str) -> Optional[Tuple[str, str]]:
+    with open(label, "r", encoding="utf-8") as f:
+        relic = json.load(f)
+    return _check_relic(relic, label)
 
 
 def _verify_single_relic(relic: Dict, label: str = "<in-memory>") -> None:
+    result = _check_relic(relic, label)
+    if result is not None:
+        raise AssertionError(result[1])
+
+
+def _check_relic(relic: Dict, label: str) -> Optional[Tuple[str, str]]:
+    """
+    Returns None if the relic is consistent, else (field, message) for
+    the first mismatching field.
+    """
     epoch_entries = relic.get("epoch_bundles", [])
     bundle_ids: List[str] = []
     bundle_merkle_roots: List[str] = []
 
-    for entry in epoch_entries:
+    for k, entry in enumerate(epoch_entries):
         bundle_id = entry["bundle_id"]
         lane_merkle_roots = entry["lane_merkle_roots"]
         bundle_merkle_root = entry["bundle_merkle_root"]
@@ -207,10 +284,11 @@ def _verify_single_relic(relic: Dict, label: str = "<in-memory>") -> None:
         # recompute bundle_merkle_root from lane_merkle_roots
         expected_bundle = merkle_root_from_hex(lane_merkle_roots)
         if expected_bundle != bundle_merkle_root:
-            raise AssertionError(
+            return (
+                f"epoch_bundles[{k}].bundle_merkle_root",
                 f"{label}: bundle_merkle_root mismatch for {bundle_id}\n"
                 f"  stored : {bundle_merkle_root}\n"
-                f"  recomputed: {expected_bundle}"
+                f"  recomputed: {expected_bundle}",
             )
 
         bundle_ids.append(bundle_id)
@@ -223,10 +301,11 @@ def _verify_single_relic(relic: Dict, label: str = "<in-memory>") -> None:
         .get("relic_merkle_root")
     )
     if expected_relic_merkle != stored_relic_merkle:
-        raise AssertionError(
+        return (
+            "aggregate.relic_merkle_root",
             f"{label}: relic_merkle_root mismatch\n"
             f"  stored : {stored_relic_merkle}\n"
-            f"  recomputed: {expected_relic_merkle}"
+            f"  recomputed: {expected_relic_merkle}",
         )
 
     # chiral commitments
@@ -239,17 +318,20 @@ def _verify_single_relic(relic: Dict, label: str = "<in-memory>") -> None:
     expected_reverse = sha256_hex_of_strings(list(reversed(bundle_ids)))
 
     if forward != expected_forward:
-        raise AssertionError(
+        return (
+            "aggregate.chiral_commitment.forward",
             f"{label}: chiral forward mismatch\n"
             f"  stored : {forward}\n"
-            f"  recomputed: {expected_forward}"
+            f"  recomputed: {expected_forward}",
         )
     if reverse != expected_reverse:
-        raise AssertionError(
+        return (
+            "aggregate.chiral_commitment.reverse",
             f"{label}: chiral reverse mismatch\n"
             f"  stored : {reverse}\n"
-            f"  recomputed: {expected_reverse}"
+            f"  recomputed: {expected_reverse}",
         )
+    return None
 
 
 def corruption_test_one_relic(relic_dir: Path) -> None:
@@ -301,23 +383,47 @@ def run_pipeline(args: argparse.Namespace) -> None:
     epoch_dir.mkdir(parents=True, exist_ok=True)
     relic_dir.mkdir(parents=True, exist_ok=True)
 
-    # 1) Lanes
-    run_cmd([
-        "python", "scripts/lane_runtime.py",
-        "--steps", str(args.steps),
-        "--lanes", str(args.lanes),
-        "--mode", args.mode,
-        "--out-dir", str(lane_dir),
-    ])
-
-    # 2) Epochs
-    run_cmd([
-        "python", "scripts/epoch_auto.py",
-        "--lane-dir", str(lane_dir),
-        "--out-dir", str(epoch_dir),
-        "--epoch-length", str(args.epoch_length),
-        "--lanes", str(args.lanes),
-    ])
+    write_traces = not (args.stream and args.no_traces)
+
+    if args.stream:
+        # 1+2) Lanes → epochs in one fused pass
+        cmd = [
+            "python", "scripts/epoch_auto.py",
+            "--stream",
+            "--steps", str(args.steps),
+            "--lanes", str(args.lanes),
+            "--out-dir", str(epoch_dir),
+            "--epoch-length", str(args.epoch_length),
+            "--seed", str(args.seed),
+            "--seed-stride", str(args.seed_stride),
+        ]
+        if write_traces:
+            cmd += [
+                "--trace-dir", str(lane_dir),
+                "--trace-format", args.trace_format,
+            ]
+        run_cmd(cmd)
+    else:
+        # 1) Lanes
+        run_cmd([
+            "python", "scripts/lane_runtime.py",
+            "--steps", str(args.steps),
+            "--lanes", str(args.lanes),
+            "--mode", args.mode,
+            "--seed", str(args.seed),
+            "--seed-stride", str(args.seed_stride),
+            "--out-dir", str(lane_dir),
+            "--trace-format", args.trace_format,
+        ])
+
+        # 2) Epochs
+        run_cmd([
+            "python", "scripts/epoch_auto.py",
+            "--lane-dir", str(lane_dir),
+            "--out-dir", str(epoch_dir),
+            "--epoch-length", str(args.epoch_length),
+            "--lanes", str(args.lanes),
+        ])
 
     # 3) Relics
     run_cmd([
@@ -325,12 +431,22 @@ def run_pipeline(args: argparse.Namespace) -> None:
         "--epoch-dir", str(epoch_dir),
         "--out-dir", str(relic_dir),
         "--epochs-per-relic", str(args.epochs_per_relic),
+        "--workers", str(args.workers),
     ])
 
     # 4) Verification
-    verify_lane_lengths(lane_dir, args.lanes, args.steps)
-    verify_epochs_against_lanes(lane_dir, epoch_dir, args.lanes, args.epoch_length)
-    verify_relics(relic_dir)
+    if write_traces:
+        verify_lane_lengths(lane_dir, args.lanes, args.steps)
+        if args.deep_audit:
+            audit_lane_traces(lane_dir, args.lanes)
+        verify_epochs_against_lanes(lane_dir, epoch_dir, args.lanes, args.epoch_length)
+    else:
+        print("[SKIP] Lane lengths (no traces written)")
+        verify_epochs_against_lanes(
+            None, epoch_dir, args.lanes, args.epoch_length,
+            steps=args.steps, seed=args.seed, seed_stride=args.seed_stride,
+        )
+    verify_relics(relic_dir, workers=args.workers)
 
     if args.corruption_test:
         corruption_test_one_relic(relic_dir)
@@ -354,6 +470,18 @@ def parse_args() -> argparse.Namespace:
         default=1_000_000,
         help="Steps per lane (default: 1,000,000).",
     )
+    p.add_argument(
+        "--seed",
+        type=int,
+        default=1,
+        help="Base seed a_1 for lane 1 (default: 1).",
+    )
+    p.add_argument(
+        "--seed-stride",
+        type=int,
+        default=0,
+        help="Per-lane seed increment; lane k uses seed + (k-1)*seed_stride (default: 0).",
+    )
     p.add_argument(
         "--mode",
         choices=["sequential", "parallel"],
@@ -377,6 +505,33 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Enable in-memory corruption detection test.",
     )
+    p.add_argument(
+        "--stream",
+        action="store_true",
+        help="Fuse lane generation and epoch production into one pass.",
+    )
+    p.add_argument(
+        "--no-traces",
+        action="store_true",
+        help="With --stream, do not write lane traces to disk.",
+    )
+    p.add_argument(
+        "--trace-format",
+        choices=TRACE_FORMATS,
+        default="text",
+        help="Lane trace format: text or hhlt (default: text).",
+    )
+    p.add_argument(
+        "--deep-audit",
+        action="store_true",
+        help="Rehash every lane trace against its recorded sequence_hash.",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for relic building and verification (default: 1).",
+    )
     return p.parse_args()
 
 
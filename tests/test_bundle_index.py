@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from sealing import (
+    build_engine_bundle,
+    build_lane_artifact,
+    bundle_index_path,
+    read_indexed_lane,
+    write_indexed_bundle,
+)
+
+
+def write_bundle(tmp_path, lane_ids=(3, 5, 7)):
+    artifacts = [
+        build_lane_artifact(lane_id=i, height=10 * i, chiral_plus="ab" * 32, chiral_minus="cd" * 32)
+        for i in lane_ids
+    ]
+    bundle = build_engine_bundle(lane_artifacts=artifacts, bundle_id="t", created_at="2026-01-01T00:00:00Z")
+    path = tmp_path / "t.hhl.json"
+    write_indexed_bundle(bundle, path)
+    return path
+
+
+def test_read_indexed_lane(tmp_path):
+    path = write_bundle(tmp_path)
+    got = read_indexed_lane(path, 5)
+    assert got["artifact"]["body"]["laneId"] == 5 and got["lane_index"] == 1
+    with pytest.raises(ValueError):
+        read_indexed_lane(path, 4)
+
+
+def test_swapped_lane_ids_in_index_rejected(tmp_path):
+    path = write_bundle(tmp_path)
+    index_path = bundle_index_path(path)
+    index = json.loads(index_path.read_text())
+    lanes = index["lanes"]
+    lanes[1]["laneId"], lanes[2]["laneId"] = lanes[2]["laneId"], lanes[1]["laneId"]
+    index_path.write_text(json.dumps(index))
+
+    for lane_id in (5, 7):
+        with pytest.raises(ValueError, match="another lane"):
+            read_indexed_lane(path, lane_id)
+    assert read_indexed_lane(path, 3)["artifact"]["body"]["laneId"] == 3
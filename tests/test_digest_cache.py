@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+import digest_cache
+from hh_bundle_inspect import inspect_file
+
+
+@pytest.fixture
+def fresh_default(monkeypatch):
+    monkeypatch.setattr(digest_cache, "_default", None)
+    monkeypatch.setattr(digest_cache, "_unusable", False)
+
+
+def test_unusable_location_falls_back_to_uncached(tmp_path, monkeypatch, capsys, fresh_default):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setenv(digest_cache.ENV_VAR, str(blocker / "c.db"))
+    assert digest_cache.default_cache() is None
+    assert digest_cache.default_cache() is None
+    assert capsys.readouterr().err.count("[WARN]") == 1
+
+
+def test_digest_only_does_not_depend_on_cache_state(tmp_path, monkeypatch, fresh_default):
+    monkeypatch.setenv(digest_cache.ENV_VAR, str(tmp_path / "c.db"))
+    src = tmp_path / "big.json"
+    src.write_text(json.dumps({"lane": 1, "epochs": [1, 2, 3]}, indent=2))
+
+    cold = inspect_file(src, digest_only=True)
+    full = inspect_file(src)
+    warm = inspect_file(src, digest_only=True)
+    uncached = inspect_file(src, digest_only=True, use_cache=False)
+
+    assert cold["stream_sha256"] == warm["stream_sha256"] == uncached["stream_sha256"]
+    assert cold["sha256"] is warm["sha256"] is None
+    assert full["stream_sha256"] == cold["stream_sha256"]
+    assert full["sha256"] != full["stream_sha256"] and full["canonical"] is False
@@ -0,0 +1,59 @@
+import os
+
+from epoch_auto import (
+    MANIFEST_NAME,
+    build_epoch_bundles,
+    generate_epochs_for_lane,
+    iter_trace_values,
+    produce_epochs_incremental,
+)
+
+EPOCH_LENGTH = 10
+
+
+def write_trace(path, values):
+    path.write_text("".join(f"{v}\n" for v in values))
+
+
+def full_run(lanes, out_dir):
+    out_dir.mkdir()
+    epoch_summaries = {}
+    for lane_id, lane_path in lanes:
+        values = iter_trace_values(lane_path)
+        try:
+            summaries = generate_epochs_for_lane(lane_id, values, EPOCH_LENGTH, 0, out_dir)
+        finally:
+            values.close()
+        for epoch_index, summary in summaries:
+            epoch_summaries.setdefault(epoch_index, []).append(summary)
+    build_epoch_bundles(epoch_summaries, out_dir)
+
+
+def outputs(out_dir):
+    return {p.name: p.read_bytes() for p in out_dir.iterdir() if p.name != MANIFEST_NAME}
+
+
+def test_edit_inside_recorded_prefix_rebuilds_lane(tmp_path):
+    lane_dir = tmp_path / "lanes"
+    lane_dir.mkdir()
+    lanes = [(1, lane_dir / "lane01.txt"), (2, lane_dir / "lane02.txt")]
+    write_trace(lanes[0][1], range(100))
+    write_trace(lanes[1][1], range(1000, 1100))
+
+    inc = tmp_path / "inc"
+    inc.mkdir()
+    produce_epochs_incremental(lanes, EPOCH_LENGTH, 0, inc)
+    assert produce_epochs_incremental(lanes, EPOCH_LENGTH, 0, inc) == {1: 0, 2: 0}
+
+    # same byte length, one value changed in epoch 5 (neither the first nor the last)
+    edited = list(range(100))
+    edited[44] = 45
+    write_trace(lanes[0][1], edited)
+    # an edit always moves mtime; pin it so coarse timestamps cannot hide it
+    st = lanes[0][1].stat()
+    os.utime(lanes[0][1], ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert produce_epochs_incremental(lanes, EPOCH_LENGTH, 0, inc) == {1: 10, 2: 0}
+
+    full = tmp_path / "full"
+    full_run(lanes, full)
+    assert outputs(inc) == outputs(full)
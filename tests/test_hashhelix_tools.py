@@ -0,0 +1,33 @@
+import json
+import shutil
+import subprocess
+import sys
+
+from conftest import ROOT
+
+TOOL = ROOT / "scripts" / "hashhelix_tools.py"
+
+
+def run(cwd, *args, stdin=None):
+    out = subprocess.run(
+        [sys.executable, str(TOOL), *args], cwd=cwd, input=stdin, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout)
+
+
+def test_cli_on_repo_meta_lane(tmp_path):
+    # the repo's own lanes.json and meta lane (chiral records, "helices": 5)
+    shutil.copy(ROOT / "lanes.json", tmp_path / "lanes.json")
+    (tmp_path / "data").mkdir()
+    shutil.copy(ROOT / "data" / "meta_ledger.jsonl", tmp_path / "data")
+
+    head = run(tmp_path, "head", "--lane", "meta")
+    assert head["n"] == 5 and {"h_plus", "h_minus"} <= head.keys()
+
+    one = run(tmp_path, "append", "--lane", "meta", "--data", "hello")
+    bulk = run(tmp_path, "bulk-append", "--lane", "meta", stdin="a\nb\n\nc\n")
+    assert one["n"] == 6 and bulk["appended"] == 3 and bulk["n"] == 9
+
+    head = run(tmp_path, "head", "--lane", "meta")
+    assert head["h_plus"] == bulk["h_plus"] and head["h_minus"] == bulk["h_minus"]
+    assert run(tmp_path, "verify", "--lane", "meta")["verified"]
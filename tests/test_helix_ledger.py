@@ -0,0 +1,58 @@
+import json
+import shutil
+
+from conftest import ROOT
+from helix_ledger import LAYOUT_CHIRAL, LAYOUT_HELIX, HelixLedger
+
+META_LANE = ROOT / "data" / "meta_ledger.jsonl"
+
+
+def test_real_meta_lane_verifies():
+    ledger = HelixLedger(str(META_LANE), helices=5)
+    assert ledger.layout == LAYOUT_CHIRAL
+    assert ledger.verify()
+
+
+def test_meta_lane_append_keeps_chiral_layout(tmp_path):
+    lane = tmp_path / "meta_ledger.jsonl"
+    shutil.copy(META_LANE, lane)
+    ledger = HelixLedger(str(lane), helices=5)
+    n = ledger.n
+    rec = ledger.append("one")
+    assert ledger.append_many(["two", "x" * 400]) == 2
+    assert rec["n"] == n + 1 and {"h_plus", "h_minus", "prev_h_plus", "prev_h_minus"} <= rec.keys()
+
+    reopened = HelixLedger(str(lane), helices=5)
+    assert reopened.n == n + 3
+    assert reopened.head_hashes() == ledger.head_hashes()
+    assert reopened.verify()
+
+
+def test_meta_lane_tamper_detected(tmp_path):
+    lane = tmp_path / "meta_ledger.jsonl"
+    lines = META_LANE.read_text().splitlines()
+    rec = json.loads(lines[2])
+    rec["a_plus"] += 1
+    lines[2] = json.dumps(rec, separators=(",", ":"))
+    lane.write_text("\n".join(lines) + "\n")
+    assert not HelixLedger(str(lane), helices=5).verify()
+
+
+def test_helix_lane_from_init_record(tmp_path):
+    lane = tmp_path / "k5.jsonl"
+    lane.write_text(json.dumps({"lane": "k5", "n": 0, "h": "0" * 64}) + "\n")
+    ledger = HelixLedger(str(lane), helices=5)
+    ledger.append("a")
+    assert ledger.append_many(["b", "x" * 400]) == 2
+
+    reopened = HelixLedger(str(lane), helices=5)
+    assert reopened.layout == LAYOUT_HELIX and reopened.n == 3
+    assert reopened.head_hashes() == ledger.head_hashes()
+    assert reopened.verify()
+
+    lines = lane.read_text().splitlines()
+    rec = json.loads(lines[2])
+    rec["data"] = "B"
+    lines[2] = json.dumps(rec, separators=(",", ":"))
+    lane.write_text("\n".join(lines) + "\n")
+    assert not HelixLedger(str(lane), helices=5).verify()
@@ -0,0 +1,50 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from hh_block import BlockReader, BlockWriter
+from hh_compress import compress_blocks_file
+from hh_expand import expand_json_gz_file
+
+
+def test_round_trip(tmp_path):
+    raw = os.urandom(300_000)
+    path = tmp_path / "r.bin.hhz"
+    with BlockWriter(path, block_size=1 << 16, workers=4) as out:
+        out.write(raw)
+    reader = BlockReader(path)
+    assert reader.read(0, len(raw)) == raw
+    assert reader.read(70_000, 5) == raw[70_000:70_005]
+
+
+def test_exception_in_with_leaves_no_output(tmp_path):
+    path = tmp_path / "r.bin.hhz"
+    with pytest.raises(KeyboardInterrupt):
+        with BlockWriter(path, block_size=1 << 16, workers=4) as out:
+            out.write(os.urandom(200_000))
+            raise KeyboardInterrupt
+    assert not path.exists()
+
+
+def test_bad_json_creates_no_container(tmp_path):
+    src = tmp_path / "bad.json"
+    src.write_text('{"a": [1,2,')
+    with pytest.raises(json.JSONDecodeError):
+        compress_blocks_file(src)
+    assert not (tmp_path / "bad.json.hhz").exists()
+
+
+def test_expand_json_gz_canonicalizes_and_rejects_truncation(tmp_path):
+    src = tmp_path / "raw.json.gz"
+    src.write_bytes(gzip.compress(json.dumps({"b": 1, "a": [1, 2]}, indent=2).encode()))
+    expand_json_gz_file(src)
+    assert (tmp_path / "raw.json").read_text() == '{"a":[1,2],"b":1}'
+
+    whole = gzip.compress(json.dumps({"a": list(range(50_000))}).encode())
+    bad = tmp_path / "trunc.json.gz"
+    bad.write_bytes(whole[: len(whole) // 2])
+    with pytest.raises(EOFError):
+        expand_json_gz_file(bad)
+    assert not (tmp_path / "trunc.json").exists()